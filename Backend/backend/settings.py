@@ -258,6 +258,91 @@ DATABASES = {
     }
 }
 
+# ==========================================
+# CACHE CONFIGURATION
+# ==========================================
+# Redis partagé entre les workers gunicorn si REDIS_URL est défini,
+# sinon cache mémoire local (éviction LRU via MAX_ENTRIES)
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+# Durée de vie des scores de matching en cache (24 heures)
+SCORE_CACHE_TIMEOUT = 60 * 60 * 24
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'scores': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'scores',
+            'TIMEOUT': SCORE_CACHE_TIMEOUT,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'default',
+        },
+        'scores': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'matching-scores',
+            'TIMEOUT': SCORE_CACHE_TIMEOUT,
+            'OPTIONS': {
+                'MAX_ENTRIES': 50000,
+                'CULL_FREQUENCY': 4,
+            },
+        },
+    }
+
+# ==========================================
+# MATCHING INCRÉMENTAL
+# ==========================================
+# 'thread': file d'attente traitée en arrière-plan dans chaque processus
+# 'sync': recalcul immédiat après le commit (scripts, tests)
+# 'off': désactivé (régénération complète uniquement)
+MATCHING_QUEUE_MODE = os.environ.get('MATCHING_QUEUE_MODE', 'thread')
+
+# Catalogue de compétences compilé (pickle) rechargé au démarrage des workers;
+# vide: compilation en mémoire à chaque démarrage
+SKILL_CATALOG_PATH = os.environ.get('SKILL_CATALOG_PATH', '')
+
+# Reconstruction de l'index d'autocomplétion des compétences (secondes)
+SKILL_SUGGEST_REFRESH = int(os.environ.get('SKILL_SUGGEST_REFRESH', '300'))
+
+# Durée de vie des statistiques du tableau de bord en cache (secondes),
+# invalidées à chaque écriture d'un consultant ou d'un appel d'offre
+DASHBOARD_STATS_TTL = int(os.environ.get('DASHBOARD_STATS_TTL', '60'))
+
+# Durée de vie de l'analyse du matching en cache (secondes), invalidée à
+# chaque validation d'un matching
+MATCHING_ANALYTICS_TTL = int(os.environ.get('MATCHING_ANALYTICS_TTL', '300'))
+
+# ==========================================
+# EXTRACTION DES CV EN ARRIÈRE-PLAN
+# ==========================================
+# 'thread' (défaut): thread de fond dans le processus web
+# 'worker': tâches traitées par `python manage.py run_cv_jobs --workers N`,
+#           à démarrer avec le serveur (sinon les tâches restent en attente)
+# 'sync': extraction immédiate après le commit (scripts)
+CV_JOBS_MODE = os.environ.get('CV_JOBS_MODE', 'thread')
+CV_JOBS_MAX_ATTEMPTS = int(os.environ.get('CV_JOBS_MAX_ATTEMPTS', '3'))
+# Mode 'worker': délai (secondes) au-delà duquel une tâche encore en
+# attente est signalée (worker arrêté ou saturé)
+CV_JOBS_PENDING_WARNING = int(os.environ.get('CV_JOBS_PENDING_WARNING', '300'))
+# Délai (secondes) après lequel une tâche EN_COURS est considérée
+# abandonnée et remise en attente (run_cv_jobs, suivi du statut)
+CV_JOBS_STALE_AFTER = int(os.environ.get('CV_JOBS_STALE_AFTER', '600'))
+
+# OCR des CV scannés: pages traitées en parallèle (processus), résolution
+# de rendu et nombre maximal de pages par CV (0: sans limite)
+CV_OCR_WORKERS = int(os.environ.get('CV_OCR_WORKERS', str(min(4, os.cpu_count() or 1))))
+CV_OCR_DPI = int(os.environ.get('CV_OCR_DPI', '300'))
+CV_OCR_MAX_PAGES = int(os.environ.get('CV_OCR_MAX_PAGES', '10'))
+
 # ==========================================
 # PASSWORD VALIDATION
 # ==========================================
@@ -1,20 +1,20 @@
-import spacy
 import re
 import json
 import openai
 import Levenshtein
 from django.core.cache import cache
 from .competences_data import ALL_SKILLS
+from .model_registry import get_spacy_model
+from .skill_index import analyze_description
 
 
 class AIService:
     """Service d'intelligence artificielle pour l'analyse des offres et des consultants"""
 
     def __init__(self):
-        try:
-            self.nlp = spacy.load("fr_core_news_md")
-        except:
-            self.nlp = None
+        # Modèle partagé par toutes les instances du processus (chargé au premier usage)
+        self.nlp = get_spacy_model("fr_core_news_md")
+        if self.nlp is None:
             print("Modèle spaCy non disponible")
 
     def analyze_offer(self, appel_offre):
@@ -42,4 +42,18 @@ class AIService:
 
         return result
 
+    def basic_analyze_description(self, description):
+        """Analyse locale: compétences et domaine en un parcours de l'index des compétences"""
+        analysis = analyze_description(description)
+        entities = []
+        if self.nlp and description:
+            entities = [(ent.text, ent.label_) for ent in self.nlp(description).ents]
+
+        return {
+            'keywords': sorted(analysis.mentioned_skills),
+            'entities': entities,
+            'domaine_principal': analysis.domain[0],
+            'domain_scores': analysis.domain_scores
+        }
+
     # Autres méthodes d'analyse...
\ No newline at end of file
@@ -0,0 +1,83 @@
+# competence_import.py - Import groupé des compétences extraites d'un CV
+
+"""
+Enregistrement des compétences détectées dans un CV en un minimum de
+requêtes: noms existants lus une fois, insertion par bulk_create
+(ignore_conflicts sur la clé unique consultant/nom_competence) et une
+seule sauvegarde du consultant.
+
+bulk_create ne déclenche pas post_save: le recalcul du matching et
+l'autocomplétion sont notifiés ici (voir signals.py).
+
+Règles reprises de l'ancienne extraction asynchrone: noms nettoyés de la
+ponctuation de liste, niveau 1 pour une compétence extraite (non
+confirmée par le consultant). Le niveau d'expertise n'est pas déduit du
+nombre de compétences: Consultant.save le recalcule
+(calculate_expertise_level), compétences comprises.
+"""
+
+import logging
+
+from .matching_queue import enqueue_consultant
+from .models import Competence
+from .skill_suggest import register_skill_name
+
+logger = logging.getLogger(__name__)
+
+
+# Niveau des compétences détectées automatiquement
+EXTRACTED_LEVEL = 1
+# Espaces et ponctuation de liste retirés autour des noms extraits
+STRIPPED_CHARS = " \t\r\n:,.\u2022°"
+
+
+def clean_competence_name(name):
+    return name.strip(STRIPPED_CHARS).title()
+
+
+def import_competences(consultant, names, niveau=EXTRACTED_LEVEL, primary_domain=None):
+    """
+    Ajoute au consultant les compétences absentes (comparaison insensible
+    à la casse), met à jour domaine principal et champ skills; l'expertise
+    est recalculée par Consultant.save
+    """
+    existing_skills = list(
+        Competence.objects.filter(consultant=consultant).values_list('nom_competence', flat=True)
+    )
+    existing_lower = {skill.lower() for skill in existing_skills}
+
+    added_skills = []
+    for name in names:
+        competence_clean = clean_competence_name(name)
+        if not competence_clean or competence_clean.lower() in existing_lower:
+            continue
+        added_skills.append(competence_clean)
+        existing_skills.append(competence_clean)
+        existing_lower.add(competence_clean.lower())
+
+    if added_skills:
+        Competence.objects.bulk_create(
+            [Competence(consultant=consultant, nom_competence=name, niveau=niveau) for name in added_skills],
+            ignore_conflicts=True
+        )
+        for name in added_skills:
+            register_skill_name(name, consultant.domaine_principal)
+        enqueue_consultant(consultant.id)
+
+    update_fields = ['expertise', 'expertise_score', 'skills', 'updated_at']
+    if primary_domain and primary_domain != consultant.domaine_principal:
+        consultant.domaine_principal = primary_domain
+        update_fields.append('domaine_principal')
+        logger.info(f"Domaine principal mis à jour : {primary_domain}")
+    consultant.skills = ', '.join(existing_skills)
+    consultant.save(update_fields=update_fields)
+
+    logger.info(f"{len(added_skills)} compétences importées pour le consultant {consultant.id}")
+    return {
+        'skills': existing_skills,
+        'new_skills': added_skills,
+        'total_skills': len(existing_skills),
+        'primary_domain': primary_domain,
+        'expertise_level': consultant.expertise,
+        'extracted_count': len(names),
+    }
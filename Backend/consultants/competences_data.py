@@ -906,29 +906,20 @@ COMPETENCES_METADATA = {
 
 def get_all_skills_flat():
     """Retourne toutes les compétences dans une liste plate"""
-    all_skills_flat = []
-    for domain_skills in ALL_SKILLS.values():
-        all_skills_flat.extend(domain_skills)
-    return all_skills_flat
+    from .skill_catalog import get_skill_catalog
+    return [entry.name for entry in get_skill_catalog().entries]
 
 def get_skills_by_domain(domain_name):
     """Retourne les compétences d'un domaine spécifique"""
     return ALL_SKILLS.get(domain_name.upper(), [])
 
 def search_skills(query, domain=None):
-    """Recherche de compétences par mot-clé"""
-    query_lower = query.lower()
-    found_skills = []
-    
-    domains_to_search = [domain.upper()] if domain else ALL_SKILLS.keys()
-    
-    for domain_name in domains_to_search:
-        if domain_name in ALL_SKILLS:
-            for skill in ALL_SKILLS[domain_name]:
-                if query_lower in skill.lower():
-                    found_skills.append({'skill': skill, 'domain': domain_name})
-    
-    return found_skills
+    """Recherche de compétences par mot-clé (catalogue compilé, voir skill_catalog)"""
+    from .skill_catalog import get_skill_catalog
+    return [
+        {'skill': entry.name, 'domain': entry.domain}
+        for entry in get_skill_catalog().search(query, domain)
+    ]
 
 def get_domain_stats():
     """Statistiques par domaine"""
@@ -971,15 +962,9 @@ def validate_competences_data():
             validation_results['empty_domains'].append(domain)
             validation_results['validation_passed'] = False
     
-    # Vérifier doublons globaux (optionnel)
-    all_skills_flat = get_all_skills_flat()
-    seen_skills = set()
-    for skill in all_skills_flat:
-        skill_normalized = skill.lower().strip()
-        if skill_normalized in seen_skills:
-            validation_results['duplicates_found'].append(skill)
-        else:
-            seen_skills.add(skill_normalized)
+    # Vérifier doublons globaux (optionnel), relevés à la compilation du catalogue
+    from .skill_catalog import get_skill_catalog
+    validation_results['duplicates_found'] = list(get_skill_catalog().duplicates)
     
     return validation_results
 
@@ -0,0 +1,60 @@
+# cv_cache.py - Cache des extractions de CV par empreinte du contenu
+
+"""
+Un même CV est souvent retraité (extraction des compétences, tâches
+d'arrière-plan, standardisation Richat). Le texte extrait (PyMuPDF ou
+OCR), le domaine détecté et les compétences sont enregistrés dans
+CVExtractionCache sous l'empreinte SHA-256 du fichier.
+
+Les compétences dépendent du référentiel: si celui-ci change, elles sont
+recalculées à partir du texte en cache, sans rouvrir le fichier.
+"""
+
+import hashlib
+import logging
+
+from .models import CVExtractionCache
+from .skill_catalog import catalog_fingerprint
+
+logger = logging.getLogger(__name__)
+
+CV_CACHE_VERSION = 1
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as cv_file:
+        for chunk in iter(lambda: cv_file.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extractor_version():
+    return f"{CV_CACHE_VERSION}:{catalog_fingerprint()}"
+
+
+def get_cached_extraction(empreinte):
+    """Entrée du cache pour une empreinte, None si absente"""
+    try:
+        return CVExtractionCache.objects.filter(empreinte=empreinte).first()
+    except Exception as e:
+        logger.warning(f"Cache des extractions de CV indisponible: {str(e)}")
+        return None
+
+
+def store_extraction(empreinte, texte, ocr, domaine, competences):
+    try:
+        CVExtractionCache.objects.update_or_create(
+            empreinte=empreinte,
+            defaults={
+                'texte': texte,
+                'ocr': ocr,
+                'domaine': domaine or '',
+                'competences': list(competences),
+                'extracteur': extractor_version(),
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer l'extraction du CV {empreinte[:12]}: {str(e)}")
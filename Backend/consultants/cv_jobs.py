@@ -0,0 +1,283 @@
+# cv_jobs.py - Tâches d'extraction des compétences des CV
+
+"""
+L'extraction (PyMuPDF, OCR Tesseract, détection des compétences) peut
+prendre plusieurs dizaines de secondes: elle n'est plus exécutée dans la
+requête HTTP. Le dépôt d'un CV crée une tâche CVExtractionJob, traitée
+par les workers de la commande run_cv_jobs; le client suit l'avancement
+via l'endpoint de statut.
+
+settings.CV_JOBS_MODE:
+- 'thread' (défaut): thread de fond dans le processus web, aucun service
+  supplémentaire à déployer
+- 'worker': tâches traitées par `manage.py run_cv_jobs`, à démarrer avec
+  le serveur. Si aucun worker ne tourne, les tâches restent en attente:
+  un avertissement est journalisé (et renvoyé au client qui suit la tâche)
+  dès qu'une tâche attend plus de settings.CV_JOBS_PENDING_WARNING secondes.
+- 'sync': exécution immédiate après le commit (scripts)
+
+Hors mode 'worker', aucun worker ne reprend les tâches: les nouvelles
+tentatives sont enchaînées dans le même thread (run_with_retries) et une
+tâche abandonnée (processus web redémarré) est remise en attente puis
+relancée lorsque le client interroge son statut (recover_job).
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .competence_import import import_competences
+from .models import Consultant, CVExtractionJob
+
+logger = logging.getLogger(__name__)
+
+EN_ATTENTE = 'EN_ATTENTE'
+EN_COURS = 'EN_COURS'
+TERMINE = 'TERMINE'
+ECHEC = 'ECHEC'
+
+
+def get_jobs_mode():
+    return getattr(settings, 'CV_JOBS_MODE', 'thread')
+
+
+def get_max_attempts():
+    return getattr(settings, 'CV_JOBS_MAX_ATTEMPTS', 3)
+
+
+def get_pending_warning_delay():
+    return getattr(settings, 'CV_JOBS_PENDING_WARNING', 300)
+
+
+def get_stale_after():
+    return getattr(settings, 'CV_JOBS_STALE_AFTER', 600)
+
+
+# Modes thread/sync: délai (secondes) après lequel une tâche en attente
+# qu'aucun thread n'a prise est relancée
+THREAD_START_GRACE = 30
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ----------------------------------------------------------------------
+# Dépôt
+# ----------------------------------------------------------------------
+
+def enqueue_cv_extraction(consultant, cv_path=None):
+    """
+    Crée (ou réutilise, si le même fichier attend déjà) une tâche
+    d'extraction pour le CV du consultant
+    """
+    if cv_path is None:
+        cv_path = consultant.cv.path
+    job = CVExtractionJob.objects.filter(consultant=consultant, fichier=cv_path, statut=EN_ATTENTE).first()
+    if job is None:
+        job = CVExtractionJob.objects.create(consultant=consultant, fichier=cv_path)
+        logger.info(f"Tâche d'extraction {job.id} créée pour le consultant {consultant.id}")
+
+    mode = get_jobs_mode()
+    if mode == 'sync':
+        transaction.on_commit(lambda: run_with_retries(job.id))
+    elif mode == 'thread':
+        transaction.on_commit(lambda: _start_thread(job.id))
+    else:
+        check_pending_backlog()
+    return job
+
+
+def check_pending_backlog():
+    """
+    Mode 'worker': avertit si la plus ancienne tâche en attente dépasse
+    le délai d'alerte (workers run_cv_jobs arrêtés ou saturés).
+    Retourne l'âge en secondes de cette tâche, None si la file est vide.
+    """
+    oldest = CVExtractionJob.objects.filter(statut=EN_ATTENTE).order_by('created_at') \
+        .values_list('created_at', flat=True).first()
+    if oldest is None:
+        return None
+    age = (timezone.now() - oldest).total_seconds()
+    if age > get_pending_warning_delay():
+        logger.warning(
+            f"Tâche d'extraction en attente depuis {int(age)}s: vérifiez que `manage.py run_cv_jobs` est démarré"
+        )
+    return age
+
+
+def pending_warning(job):
+    """
+    Message d'alerte pour le client si la tâche attend ou tourne
+    anormalement longtemps (tous modes)
+    """
+    now = timezone.now()
+    if job.statut == EN_ATTENTE:
+        age = (now - job.created_at).total_seconds()
+        if age <= get_pending_warning_delay():
+            return None
+        logger.warning(f"Tâche d'extraction {job.id} en attente depuis {int(age)}s (mode {get_jobs_mode()})")
+        return "L'extraction n'a pas encore démarré: le service de traitement des CV semble indisponible"
+    if job.statut == EN_COURS and job.started_at:
+        age = (now - job.started_at).total_seconds()
+        if age <= get_stale_after():
+            return None
+        logger.warning(f"Tâche d'extraction {job.id} en cours depuis {int(age)}s: traitement interrompu ?")
+        return "L'extraction semble interrompue: elle sera relancée automatiquement"
+    return None
+
+
+def recover_job(job):
+    """
+    Modes thread et sync: remet en attente la tâche si elle est EN_COURS
+    depuis plus de settings.CV_JOBS_STALE_AFTER secondes (processus web
+    arrêté pendant l'extraction), puis relance dans un thread une tâche en
+    attente qu'aucun thread n'a prise. Retourne la tâche à jour.
+    """
+    if get_jobs_mode() == 'worker' or job.statut not in (EN_ATTENTE, EN_COURS):
+        return job
+    if job.statut == EN_COURS:
+        if not job.started_at or (timezone.now() - job.started_at).total_seconds() <= get_stale_after():
+            return job
+        requeue_stale_jobs(get_stale_after(), job_id=job.id)
+        job.refresh_from_db()
+    if job.statut == EN_ATTENTE:
+        waiting_since = job.started_at or job.created_at
+        if (timezone.now() - waiting_since).total_seconds() > THREAD_START_GRACE:
+            logger.warning(f"Tâche d'extraction {job.id} relancée (aucun thread actif)")
+            _start_thread(job.id)
+    return job
+
+
+def _start_thread(job_id):
+    def work():
+        try:
+            close_old_connections()
+            run_with_retries(job_id)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=work, name=f'cv-job-{job_id}', daemon=True).start()
+
+
+# ----------------------------------------------------------------------
+# Exécution
+# ----------------------------------------------------------------------
+
+def _claim(job_id, worker):
+    """Passe la tâche EN_COURS si elle est encore en attente (un seul worker l'obtient)"""
+    return CVExtractionJob.objects.filter(id=job_id, statut=EN_ATTENTE).update(
+        statut=EN_COURS,
+        worker=worker,
+        tentatives=F('tentatives') + 1,
+        started_at=timezone.now()
+    ) == 1
+
+
+def claim_next_job(worker=None):
+    """Prend la plus ancienne tâche en attente, None si la file est vide"""
+    worker = worker or worker_name()
+    while True:
+        job_id = CVExtractionJob.objects.filter(statut=EN_ATTENTE).order_by('created_at', 'id') \
+            .values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        if _claim(job_id, worker):
+            return CVExtractionJob.objects.get(id=job_id)
+
+
+def run_pending_job(job_id):
+    """Exécute une tâche précise si aucun worker ne l'a déjà prise"""
+    if not _claim(job_id, worker_name()):
+        return None
+    return run_job(CVExtractionJob.objects.get(id=job_id))
+
+
+def run_with_retries(job_id):
+    """
+    Exécute la tâche puis ses nouvelles tentatives jusqu'au succès ou à
+    l'échec définitif (modes thread et sync, sans worker pour la reprendre)
+    """
+    job = run_pending_job(job_id)
+    while job is not None and job.statut == EN_ATTENTE:
+        job = run_pending_job(job_id)
+    return job
+
+
+def run_job(job):
+    """
+    Exécute une tâche déjà prise (EN_COURS): extraction puis enregistrement
+    des compétences. En cas d'erreur, la tâche est remise en attente tant
+    que le nombre maximal de tentatives n'est pas atteint.
+    """
+    from .views import extract_competences_from_cv, extract_competences_from_raw_content
+
+    started = time.monotonic()
+    try:
+        consultant = Consultant.objects.get(id=job.consultant_id)
+        if not os.path.exists(job.fichier):
+            raise FileNotFoundError(f"Fichier CV introuvable: {job.fichier}")
+
+        competences, primary_domain = extract_competences_from_cv(job.fichier)
+        if not competences:
+            # Même repli que l'extraction dans la requête
+            competences = extract_competences_from_raw_content(job.fichier)[0]
+        resultat = import_competences(consultant, competences, primary_domain=primary_domain)
+        resultat['duree'] = round(time.monotonic() - started, 3)
+
+        job.statut = TERMINE
+        job.resultat = resultat
+        job.erreur = ''
+        logger.info(
+            f"Tâche d'extraction {job.id} terminée: {len(resultat['new_skills'])} nouvelles compétences "
+            f"en {resultat['duree']}s"
+        )
+    except Exception as e:
+        job.erreur = str(e)
+        job.statut = ECHEC if job.tentatives >= get_max_attempts() else EN_ATTENTE
+        logger.error(f"Erreur de la tâche d'extraction {job.id} (tentative {job.tentatives}): {str(e)}")
+
+    job.finished_at = timezone.now() if job.statut in (TERMINE, ECHEC) else None
+    job.save(update_fields=['statut', 'resultat', 'erreur', 'finished_at'])
+    return job
+
+
+def requeue_stale_jobs(timeout_seconds=None, job_id=None):
+    """
+    Remet en attente les tâches EN_COURS abandonnées (worker arrêté pendant
+    l'extraction), toutes ou seulement job_id
+    """
+    timeout_seconds = get_stale_after() if timeout_seconds is None else timeout_seconds
+    limit = timezone.now() - timedelta(seconds=timeout_seconds)
+    stale = CVExtractionJob.objects.filter(statut=EN_COURS, started_at__lt=limit)
+    if job_id is not None:
+        stale = stale.filter(id=job_id)
+    stale.filter(tentatives__gte=get_max_attempts()).update(
+        statut=ECHEC, erreur="Tâche interrompue (nombre maximal de tentatives atteint)", finished_at=timezone.now()
+    )
+    count = stale.update(statut=EN_ATTENTE)
+    if count:
+        logger.warning(f"{count} tâches d'extraction bloquées remises en attente")
+    return count
+
+
+def job_to_dict(job):
+    return {
+        'job_id': job.id,
+        'consultant_id': job.consultant_id,
+        'status': job.statut,
+        'attempts': job.tentatives,
+        'result': job.resultat or None,
+        'error': job.erreur or None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
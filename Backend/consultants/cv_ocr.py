@@ -0,0 +1,157 @@
+# cv_ocr.py - OCR des CV scannés, pages traitées en parallèle
+
+"""
+Chaque page est rendue (PyMuPDF), améliorée (PIL) puis reconnue
+(Tesseract) dans un pool de processus: la durée d'un CV de n pages est
+celle de ses pages les plus lentes et non plus leur somme, ce qui permet
+de relever la limite de 3 pages (settings.CV_OCR_MAX_PAGES, 10 par défaut).
+
+Les processus du pool sont lancés par forkserver (ou spawn), jamais par
+fork: un fork depuis un worker web multi-thread (runserver, gunicorn
+--threads) peut copier un verrou tenu par un autre thread et bloquer
+l'enfant indéfiniment.
+
+Le texte est rendu page par page dès qu'il est reconnu (iter_ocr_pages);
+ocr_pdf assemble le texte dans l'ordre des pages.
+
+Réglages (settings): CV_OCR_WORKERS, CV_OCR_DPI, CV_OCR_MAX_PAGES (0: sans limite).
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANG = 'fra+eng'
+
+_executor = None
+_executor_workers = 0
+_lock = threading.Lock()
+# Nombre maximal de pages OCRisées par CV
+DEFAULT_MAX_PAGES = 10
+
+
+def get_ocr_workers():
+    return max(1, getattr(settings, 'CV_OCR_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def get_ocr_dpi():
+    return getattr(settings, 'CV_OCR_DPI', 300)
+
+
+def get_ocr_max_pages():
+    return getattr(settings, 'CV_OCR_MAX_PAGES', DEFAULT_MAX_PAGES)
+
+
+def _ocr_page(file_path, page_number, dpi, lang, config, contrast, sharpness):
+    """Rendu, amélioration et reconnaissance d'une page (exécuté dans un worker)"""
+    import fitz
+    import pytesseract
+    from PIL import Image, ImageEnhance
+
+    with fitz.open(file_path) as doc:
+        pix = doc[page_number].get_pixmap(dpi=dpi)
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+    # Amélioration d'image pour OCR
+    img = img.convert("L")
+    img = ImageEnhance.Contrast(img).enhance(contrast)
+    img = ImageEnhance.Sharpness(img).enhance(sharpness)
+
+    if config:
+        return page_number, pytesseract.image_to_string(img, config=config)
+    return page_number, pytesseract.image_to_string(img, lang=lang)
+
+
+def _get_executor(workers):
+    """
+    Pool partagé du processus. Un processus démoniaque (worker d'un
+    multiprocessing.Pool, ex. run_cv_jobs) ne peut pas créer de processus:
+    on utilise alors des threads, Tesseract tournant de toute façon dans
+    un sous-processus.
+    """
+    global _executor, _executor_workers
+    with _lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            if multiprocessing.current_process().daemon:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cv-ocr')
+            else:
+                # Pas de fork depuis un processus multi-thread (voir en-tête)
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                )
+                _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _executor_workers = workers
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+atexit.register(_reset_executor)
+
+
+def iter_ocr_pages(file_path, dpi=None, workers=None, max_pages=None, lang=DEFAULT_LANG, config=None,
+                   contrast=2.0, sharpness=1.5):
+    """
+    Texte OCR des pages du PDF, rendu dès qu'une page est reconnue:
+    (numéro de page, texte), ordre d'achèvement
+    """
+    import fitz
+
+    dpi = dpi or get_ocr_dpi()
+    workers = workers or get_ocr_workers()
+    max_pages = get_ocr_max_pages() if max_pages is None else max_pages
+
+    with fitz.open(file_path) as doc:
+        page_count = len(doc)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    if not page_count:
+        return
+
+    arguments = (dpi, lang, config, contrast, sharpness)
+    if workers == 1 or page_count == 1:
+        for page_number in range(page_count):
+            yield _ocr_page(file_path, page_number, *arguments)
+        return
+
+    executor = _get_executor(workers)
+    try:
+        futures = [executor.submit(_ocr_page, file_path, page_number, *arguments) for page_number in range(page_count)]
+    except (BrokenProcessPool, RuntimeError) as e:
+        logger.warning(f"Pool OCR indisponible, traitement séquentiel: {str(e)}")
+        _reset_executor()
+        for page_number in range(page_count):
+            yield _ocr_page(file_path, page_number, *arguments)
+        return
+
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    except BrokenProcessPool:
+        _reset_executor()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def ocr_pdf(file_path, **options):
+    """Texte OCR complet du PDF, pages dans l'ordre"""
+    pages = dict(iter_ocr_pages(file_path, **options))
+    return "\n".join(pages[page_number] for page_number in sorted(pages)) + ("\n" if pages else "")
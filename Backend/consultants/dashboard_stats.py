@@ -0,0 +1,140 @@
+# dashboard_stats.py - Statistiques du tableau de bord admin
+
+"""
+Compteurs du tableau de bord et des appels d'offres calculés par une
+requête d'agrégation conditionnelle par table (Count(..., filter=Q(...)))
+au lieu d'un count() par indicateur.
+
+Les résultats sont mis en cache (cache par défaut, partagé entre workers
+avec Redis) pendant settings.DASHBOARD_STATS_TTL secondes et invalidés à
+chaque écriture d'un consultant, d'un appel d'offre ou d'un critère
+(voir signals.py). Les écritures groupées (bulk_create, update) ne
+déclenchent pas de signal: le TTL borne alors le décalage.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import AppelOffre, Consultant, CriteresEvaluation
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_KEY = 'stats:dashboard'
+APPELS_OFFRES_KEY = 'stats:appels_offres'
+
+
+def get_stats_ttl():
+    return getattr(settings, 'DASHBOARD_STATS_TTL', 60)
+
+
+def _cached(key, compute):
+    """
+    Statistiques en cache, recalculées si absentes ou calculées un autre
+    jour (actives/expirées dépendent de la date du jour)
+    """
+    today = timezone.now().date()
+    entry = cache.get(key)
+    if entry is not None and entry['date'] == today:
+        return entry['data']
+    data = compute(today)
+    cache.set(key, {'date': today, 'data': data}, get_stats_ttl())
+    return data
+
+
+def invalidate_stats():
+    cache.delete_many([DASHBOARD_KEY, APPELS_OFFRES_KEY])
+
+
+def _offer_counts(today):
+    """Compteurs des appels d'offres en une requête"""
+    return AppelOffre.objects.aggregate(
+        total=Count('id'),
+        actifs=Count('id', filter=Q(date_limite__gte=today) | Q(date_limite__isnull=True)),
+        expires=Count('id', filter=Q(date_limite__lt=today)),
+        enrichis=Count('id', filter=(
+            Q(description__isnull=False) & ~Q(description='')
+            & Q(critere_evaluation__isnull=False) & ~Q(critere_evaluation='')
+        )),
+        recents=Count('id', filter=Q(created_at__gte=today - timedelta(days=7))),
+    )
+
+
+def _compute_dashboard(today):
+    offers = _offer_counts(today)
+    derniers_consultants = Consultant.objects.only(
+        'prenom', 'nom', 'specialite', 'domaine_principal', 'created_at'
+    ).order_by('-created_at')[:3]
+    derniers_appels = AppelOffre.objects.only(
+        'titre', 'client', 'date_de_publication', 'created_at'
+    ).order_by('-date_de_publication', '-created_at')[:3]
+
+    return {
+        "consultants_count": Consultant.objects.count(),
+        "appels_total": offers['total'],
+        # Offres sans date limite considérées comme actives
+        "offres_actives": offers['actifs'],
+        "offres_expirees": offers['expires'],
+        "derniers_consultants": [
+            {
+                "nom": f"{c.prenom or ''} {c.nom or ''}".strip(),
+                "specialite": c.specialite or c.domaine_principal or "Non spécifié",
+                "date": c.created_at.strftime('%d/%m/%Y') if c.created_at else "Non défini"
+            } for c in derniers_consultants
+        ],
+        "derniers_appels": [
+            {
+                "title": a.titre or "Titre non défini",
+                "client": a.client or "Client non spécifié",
+                "date": a.date_de_publication.strftime('%d/%m/%Y') if a.date_de_publication else a.created_at.strftime('%d/%m/%Y') if a.created_at else "Non défini"
+            } for a in derniers_appels
+        ]
+    }
+
+
+def _compute_appels_offres(today):
+    offers = _offer_counts(today)
+    total_appels = offers['total']
+    # Appels ayant au moins un critère structuré: une requête sur la table des critères
+    appels_avec_criteres = CriteresEvaluation.objects.values('appel_offre_id').distinct().count()
+    week_ago = today - timedelta(days=7)
+
+    return {
+        'totals': {
+            'total_appels': total_appels,
+            'appels_actifs': offers['actifs'],
+            'appels_expires': offers['expires'],
+            'appels_enrichis': offers['enrichis'],
+            'appels_avec_criteres': appels_avec_criteres,
+            'appels_recents': offers['recents']
+        },
+        'percentages': {
+            'taux_enrichissement': (offers['enrichis'] / total_appels * 100) if total_appels > 0 else 0,
+            'taux_criteres_structures': (appels_avec_criteres / total_appels * 100) if total_appels > 0 else 0,
+            'taux_actifs': (offers['actifs'] / total_appels * 100) if total_appels > 0 else 0
+        },
+        'repartition_types': list(
+            AppelOffre.objects.order_by().values('type_d_appel_d_offre').annotate(count=Count('id')).order_by('-count')
+        ),
+        'top_clients': list(
+            AppelOffre.objects.order_by().values('client').annotate(count=Count('id')).order_by('-count')[:10]
+        ),
+        'periode_analyse': {
+            'date_analyse': today.isoformat(),
+            'periode_recente': f"{week_ago.isoformat()} - {today.isoformat()}"
+        }
+    }
+
+
+def get_dashboard_stats():
+    """Statistiques du tableau de bord admin (dashboard_stats)"""
+    return _cached(DASHBOARD_KEY, _compute_dashboard)
+
+
+def get_appels_offres_stats():
+    """Statistiques des appels d'offres scrapés (appels_offres_stats)"""
+    return _cached(APPELS_OFFRES_KEY, _compute_appels_offres)
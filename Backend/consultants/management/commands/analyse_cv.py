@@ -5,8 +5,8 @@ import re
 import os
 import fitz
 import logging
-from PIL import Image, ImageEnhance
 from consultants.models import Consultant, Competence
+from consultants.cv_ocr import iter_ocr_pages
 
 try:
     import pytesseract
@@ -65,7 +65,7 @@ class Command(BaseCommand):
     def process_pdf(self, path):
         """Traitement principal du PDF"""
         doc = fitz.open(path)
-        text = self.extract_text(doc)
+        text = self.extract_text(doc, path)
         
         if not text:
             self.stdout.write("Aucun texte détecté - Vérifier le format du PDF")
@@ -73,38 +73,29 @@ class Command(BaseCommand):
 
         return self.parse_cv_data(text)
 
-    def extract_text(self, doc):
+    def extract_text(self, doc, path):
         """Extraction du texte avec OCR amélioré"""
         text = "\n".join(page.get_text("text") for page in doc)
         
         if not text.strip() and OCR_AVAILABLE:
             self.stdout.write("Utilisation de l'OCR...")
-            text = self.ocr_processing(doc)
+            text = self.ocr_processing(path)
         
         return self.clean_text(text)
 
-    def ocr_processing(self, doc):
-        """Traitement OCR avancé"""
-        full_text = ""
-        for page in doc:
-            pix = page.get_pixmap(dpi=300)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            
-            # Prétraitement d'image
-            img = img.convert("L")
-            img = ImageEnhance.Contrast(img).enhance(3.0)
-            img = ImageEnhance.Sharpness(img).enhance(2.0)
-            
-            # Configuration Tesseract
-            config = (
-                "-l fra+ara+eng --oem 3 --psm 6 "
-                "-c tessedit_char_whitelist=abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@.-_àéèêëïîôùûçâäÀÉÈÊËÏÎÔÙÛÇÂÄ"
-            )
-            
-            text = pytesseract.image_to_string(img, config=config)
-            full_text += text + "\n"
-        
-        return full_text
+    def ocr_processing(self, path):
+        """Traitement OCR avancé (pages en parallèle, texte affiché dès qu'une page est reconnue)"""
+        # Configuration Tesseract
+        config = (
+            "-l fra+ara+eng --oem 3 --psm 6 "
+            "-c tessedit_char_whitelist=abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@.-_àéèêëïîôùûçâäÀÉÈÊËÏÎÔÙÛÇÂÄ"
+        )
+
+        pages = {}
+        for page_number, text in iter_ocr_pages(path, config=config, contrast=3.0, sharpness=2.0):
+            pages[page_number] = text
+            self.stdout.write(f"  Page {page_number + 1} reconnue ({len(text)} caractères)")
+        return "".join(pages[page_number] + "\n" for page_number in sorted(pages))
 
     def clean_text(self, text):
         """Nettoyage du texte pour l'analyse"""
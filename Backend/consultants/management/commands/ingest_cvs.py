@@ -0,0 +1,308 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+from datetime import timedelta
+import glob
+import io
+import json
+import multiprocessing
+import os
+import time
+
+from consultants.competence_import import clean_competence_name
+from consultants.cv_cache import extractor_version, file_sha256
+from consultants.models import Competence, Consultant, CVExtractionCache
+
+# Parseur des coordonnées (analyse_cv) et extraction des compétences, chargés
+# par le processus parent et hérités par les workers (fork)
+_parser = None
+_extract_competences = None
+_ocr_workers = None
+
+# Coordonnées mises à jour quand le consultant existe déjà (même email)
+CONTACT_FIELDS = ['nom', 'lastName', 'prenom', 'firstName', 'telephone', 'phone', 'ville', 'city', 'pays', 'country']
+
+
+def _extract_text(path):
+    """Texte du PDF (PyMuPDF), OCR si le PDF ne contient pas de texte"""
+    import fitz
+    from consultants.cv_ocr import ocr_pdf
+
+    with fitz.open(path) as doc:
+        text = "\n".join(page.get_text("text") for page in doc)
+    if len(text.strip()) >= 50:
+        return text, False
+    return ocr_pdf(path, workers=_ocr_workers), True
+
+
+def _ingest_file(task):
+    """
+    Extraction et analyse d'un CV dans un worker (sans accès base):
+    texte (ou texte en cache), coordonnées, compétences et domaine
+    """
+    path, digest, cached = task
+    timings = {'extraction': 0.0, 'analyse': 0.0}
+    result = {'path': path, 'sha256': digest, 'timings': timings}
+    try:
+        started = time.monotonic()
+        if cached is not None:
+            text, used_ocr = cached['texte'], cached['ocr']
+        else:
+            text, used_ocr = _extract_text(path)
+        timings['extraction'] = time.monotonic() - started
+
+        started = time.monotonic()
+        if cached is not None and cached['competences'] is not None:
+            competences, domain = cached['competences'], cached['domaine']
+        else:
+            competences, domain = _extract_competences(text)
+        data = _parser.parse_cv_data(_parser.clean_text(text))
+        timings['analyse'] = time.monotonic() - started
+
+        result.update(text=text, ocr=used_ocr, competences=competences, domain=domain, data=data)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+class Command(BaseCommand):
+    help = "Import de CV PDF en masse (dossier ou motif glob), pool de workers et reprise sur incident"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources', nargs='+',
+            help="Dossiers (parcourus récursivement) ou motifs glob de fichiers PDF"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Nombre de processus d'extraction (défaut: nombre de CPU, 1 = sans pool)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help="CV enregistrés par transaction (défaut: 50)"
+        )
+        parser.add_argument(
+            '--manifest', default=os.path.join(settings.BASE_DIR, 'logs', 'ingest_cvs_manifest.jsonl'),
+            help="Journal des fichiers traités (empreintes SHA-256), relu pour ignorer les CV déjà importés"
+        )
+        parser.add_argument(
+            '--reprocess', action='store_true',
+            help="Retraite les fichiers déjà présents dans le journal"
+        )
+
+    def handle(self, *args, **options):
+        global _parser, _extract_competences, _ocr_workers
+
+        started = time.monotonic()
+        stage_times = {'découverte': 0.0, 'extraction': 0.0, 'analyse': 0.0, 'écriture': 0.0}
+
+        # 1. Découverte des fichiers et empreintes
+        paths = self._discover(options['sources'])
+        if not paths:
+            raise CommandError("Aucun fichier PDF trouvé")
+        done = set() if options['reprocess'] else self._load_manifest(options['manifest'])
+        tasks = []
+        seen = set()
+        for path in paths:
+            digest = file_sha256(path)
+            if digest in done or digest in seen:
+                continue
+            seen.add(digest)
+            tasks.append((path, digest))
+        skipped = len(paths) - len(tasks)
+        cached = self._cached_extractions([digest for _, digest in tasks])
+        tasks = [(path, digest, cached.get(digest)) for path, digest in tasks]
+        stage_times['découverte'] = time.monotonic() - started
+        self.stdout.write(
+            f"{len(paths)} fichiers, {skipped} déjà traités ou en double, {len(tasks)} à importer "
+            f"({len(cached)} textes en cache)"
+        )
+        if not tasks:
+            return
+
+        from consultants.management.commands.analyse_cv import Command as AnalyseCvCommand
+        from consultants.views import extract_competences
+        from consultants.skill_index import get_context_matcher, get_cv_skill_catalog
+        _parser = AnalyseCvCommand(stdout=io.StringIO(), stderr=io.StringIO())
+        _extract_competences = extract_competences
+        # Automates du référentiel compilés avant le fork (partagés par les workers)
+        get_cv_skill_catalog()
+        get_context_matcher()
+
+        workers = max(1, min(options['workers'], len(tasks)))
+        pool = None
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # Les fichiers sont répartis entre les workers: OCR d'un CV sur un seul processus
+            _ocr_workers = 1
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(workers)
+            results = pool.imap_unordered(_ingest_file, tasks)
+        else:
+            workers = 1
+            _ocr_workers = None
+            results = map(_ingest_file, tasks)
+
+        # 2. Extraction en parallèle, écriture par lots
+        counters = {'créés': 0, 'mis à jour': 0, 'ignorés': 0, 'erreurs': 0, 'ocr': 0}
+        batch = []
+        try:
+            for result in results:
+                for stage in ('extraction', 'analyse'):
+                    stage_times[stage] += result['timings'][stage]
+                if 'error' in result:
+                    counters['erreurs'] += 1
+                    self.stdout.write(self.style.ERROR(f"{result['path']}: {result['error']}"))
+                    continue
+                counters['ocr'] += result['ocr']
+                batch.append(result)
+                if len(batch) >= options['batch_size']:
+                    stage_times['écriture'] += self._write_batch(batch, options['manifest'], counters)
+                    batch = []
+            if batch:
+                stage_times['écriture'] += self._write_batch(batch, options['manifest'], counters)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        elapsed = time.monotonic() - started
+        processed = len(tasks) - counters['erreurs']
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} CV traités en {elapsed:.1f}s avec {workers} worker(s): {processed / elapsed:.2f} fichiers/s "
+            f"(créés: {counters['créés']}, mis à jour: {counters['mis à jour']}, sans email: {counters['ignorés']}, "
+            f"OCR: {counters['ocr']}, erreurs: {counters['erreurs']})"
+        ))
+        self.stdout.write(
+            "Temps par étape: " + ", ".join(f"{stage} {duration:.1f}s" for stage, duration in stage_times.items())
+            + " (extraction et analyse: cumul des workers)"
+        )
+        if counters['créés'] or counters['mis à jour']:
+            self.stdout.write("Lancer rematch_all pour recalculer les matchings des consultants importés")
+
+    def _discover(self, sources):
+        paths = []
+        for source in sources:
+            if os.path.isdir(source):
+                matches = glob.glob(os.path.join(source, '**', '*'), recursive=True)
+            else:
+                matches = glob.glob(source, recursive=True)
+            paths.extend(path for path in matches if os.path.isfile(path) and path.lower().endswith('.pdf'))
+        return sorted(set(os.path.abspath(path) for path in paths))
+
+    def _load_manifest(self, manifest_path):
+        done = set()
+        if not os.path.exists(manifest_path):
+            return done
+        with open(manifest_path, encoding='utf-8') as manifest:
+            for line in manifest:
+                try:
+                    done.add(json.loads(line)['sha256'])
+                except (ValueError, KeyError):
+                    continue
+        return done
+
+    def _cached_extractions(self, digests):
+        """Textes déjà extraits (CVExtractionCache); compétences réutilisées si le référentiel est inchangé"""
+        version = extractor_version()
+        cached = {}
+        for start in range(0, len(digests), 500):
+            for row in CVExtractionCache.objects.filter(empreinte__in=digests[start:start + 500]):
+                cached[row.empreinte] = {
+                    'texte': row.texte,
+                    'ocr': row.ocr,
+                    'competences': row.competences if row.extracteur == version else None,
+                    'domaine': row.domaine,
+                }
+        return cached
+
+    def _write_batch(self, batch, manifest_path, counters):
+        """
+        Enregistre un lot en une transaction: consultants (création ou mise à
+        jour par email), compétences et cache des extractions; le journal
+        n'est complété qu'après le commit
+        """
+        started = time.monotonic()
+        entries = []
+        by_email = {}
+        for result in batch:
+            data = result['data']
+            if not data:
+                counters['ignorés'] += 1
+                entries.append({'sha256': result['sha256'], 'path': result['path'], 'statut': 'sans_email'})
+                continue
+            by_email[data['email']] = result
+            entries.append({'sha256': result['sha256'], 'path': result['path'], 'statut': 'importé', 'email': data['email']})
+
+        today = timezone.now().date()
+        with transaction.atomic():
+            existing = {c.email: c for c in Consultant.objects.filter(email__in=list(by_email))}
+            to_create, to_update = [], []
+            for email, result in by_email.items():
+                data = result['data']
+                fields = {
+                    'nom': data['nom'], 'lastName': data['nom'],
+                    'prenom': data['prenom'], 'firstName': data['prenom'],
+                    'telephone': data['telephone'][:20], 'phone': data['telephone'][:20],
+                    'ville': data['ville'], 'city': data['ville'],
+                    'pays': data['pays'], 'country': data['pays'],
+                }
+                consultant = existing.get(email)
+                if consultant is None:
+                    to_create.append(Consultant(
+                        email=email,
+                        domaine_principal=result['domain'] or 'DIGITAL',
+                        date_debut_dispo=today, startAvailability=today,
+                        date_fin_dispo=today + timedelta(days=365), endAvailability=today + timedelta(days=365),
+                        cvFilename=os.path.basename(result['path'])[:191],
+                        **fields
+                    ))
+                else:
+                    for field, value in fields.items():
+                        setattr(consultant, field, value)
+                    to_update.append(consultant)
+
+            Consultant.objects.bulk_create(to_create, batch_size=500)
+            if to_update:
+                Consultant.objects.bulk_update(to_update, CONTACT_FIELDS, batch_size=500)
+            counters['créés'] += len(to_create)
+            counters['mis à jour'] += len(to_update)
+
+            # Identifiants relus: bulk_create ne les renvoie pas sous MySQL
+            ids = dict(Consultant.objects.filter(email__in=list(by_email)).values_list('email', 'id'))
+            existing_skills = set(
+                (consultant_id, nom_competence.lower())
+                for consultant_id, nom_competence in Competence.objects.filter(
+                    consultant_id__in=ids.values()
+                ).values_list('consultant_id', 'nom_competence')
+            )
+            competences = []
+            for email, result in by_email.items():
+                for name in result['competences']:
+                    nom_competence = clean_competence_name(name)
+                    key = (ids[email], nom_competence.lower())
+                    if nom_competence and key not in existing_skills:
+                        existing_skills.add(key)
+                        competences.append(Competence(consultant_id=ids[email], nom_competence=nom_competence, niveau=2))
+            Competence.objects.bulk_create(competences, batch_size=500, ignore_conflicts=True)
+
+            version = extractor_version()
+            CVExtractionCache.objects.bulk_create([
+                CVExtractionCache(
+                    empreinte=result['sha256'], texte=result['text'], ocr=result['ocr'],
+                    domaine=result['domain'] or '', competences=list(result['competences']), extracteur=version
+                )
+                for result in batch
+            ], batch_size=500, ignore_conflicts=True)
+
+        directory = os.path.dirname(manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        processed_at = timezone.now().isoformat()
+        with open(manifest_path, 'a', encoding='utf-8') as manifest:
+            for entry in entries:
+                manifest.write(json.dumps(dict(entry, date=processed_at), ensure_ascii=False) + "\n")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Lot enregistré: {len(batch)} CV, {len(competences)} compétences ({elapsed:.2f}s)")
+        return elapsed
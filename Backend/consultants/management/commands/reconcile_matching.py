@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+import time
+
+from consultants.models import AppelOffre, Consultant, MatchingResult
+from consultants.matching_engine import MatchingEngine, reconcile_offer_matches
+
+
+class Command(BaseCommand):
+    help = "Vérifie la cohérence des matchings stockés et corrige les scores qui ont dérivé"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--offer', type=int, action='append', dest='offers',
+            help="ID d'appel d'offre à contrôler (répétable, par défaut tous ceux qui ont des matchings)"
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=5,
+            help="Écart de score (en points) au-delà duquel un matching est réécrit (défaut: 5)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        matchings = MatchingResult.objects.all()
+        if options['offers']:
+            matchings = matchings.filter(appel_offre_id__in=options['offers'])
+
+        appels = AppelOffre.objects.filter(id__in=matchings.values('appel_offre_id'))
+        if not appels.exists():
+            self.stdout.write(self.style.WARNING("Aucun matching à contrôler"))
+            return
+
+        # Un seul chargement du vivier pour tous les appels d'offres
+        engine = MatchingEngine.load(
+            Consultant.objects.filter(id__in=matchings.values('consultant_id'))
+        )
+
+        checked = 0
+        updated = 0
+        for appel_offre in appels.iterator():
+            try:
+                count = reconcile_offer_matches(appel_offre, engine, tolerance=options['tolerance'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"AO {appel_offre.id}: {str(e)}"))
+                continue
+
+            checked += 1
+            updated += count
+            if count:
+                self.stdout.write(f"AO {appel_offre.id}: {count} matchings mis à jour")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{checked} appels d'offres contrôlés, {updated} matchings mis à jour en {elapsed:.1f}s"
+        ))
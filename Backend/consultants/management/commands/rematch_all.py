@@ -0,0 +1,126 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+import multiprocessing
+import os
+import time
+
+from consultants.models import AppelOffre, CriteresEvaluation
+from consultants.matching_engine import (
+    MatchingEngine, OfferProfile, OfferScores, fetch_top_skills, get_open_offers, save_offer_scores
+)
+
+# Vivier chargé par le processus parent, hérité par les workers (fork)
+_engine = None
+
+
+def _score_offers(batch):
+    """
+    Scoring d'un lot d'appels d'offres dans un worker (sans accès base):
+    [(appel_offre, critères)] -> [(appel_offre, date_scores, skills_scores)]
+    """
+    results = []
+    for appel_offre, criteria in batch:
+        profile = OfferProfile(appel_offre, criteria)
+        date_scores = _engine.date_scores(appel_offre.date_limite)
+        skills_scores = _engine.skills_scores(appel_offre, profile)
+        results.append((appel_offre, date_scores, skills_scores))
+    return results
+
+
+class Command(BaseCommand):
+    help = "Recalcule les matchings de tous les appels d'offres ouverts (traitement de nuit)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Nombre de processus de scoring (défaut: nombre de CPU, 1 = sans pool)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=20,
+            help="Appels d'offres lus et envoyés aux workers par lot (défaut: 20)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Taille des lots d'upsert MatchingResult (défaut: 500)"
+        )
+
+    def handle(self, *args, **options):
+        global _engine
+
+        started = time.monotonic()
+        offer_ids = list(get_open_offers().order_by('id').values_list('id', flat=True))
+        if not offer_ids:
+            self.stdout.write(self.style.WARNING("Aucun appel d'offre ouvert"))
+            return
+
+        # Vivier et compétences principales chargés une seule fois pour tous les appels d'offres
+        _engine = MatchingEngine.load()
+        if not len(_engine.consultants):
+            self.stdout.write(self.style.WARNING("Aucun consultant disponible pour le matching"))
+            return
+        top_skills = fetch_top_skills(_engine.consultant_ids.tolist())
+        load_time = time.monotonic() - started
+        self.stdout.write(
+            f"{len(offer_ids)} appels d'offres ouverts, {len(_engine.consultants)} consultants "
+            f"(chargement {load_time:.1f}s)"
+        )
+
+        chunk_size = max(1, options['chunk_size'])
+        batches = self._iter_batches(offer_ids, chunk_size)
+        workers = max(1, options['workers'])
+        pool = None
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # Les workers n'utilisent pas la base: pas de connexion partagée après le fork
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(workers)
+            results = pool.imap(_score_offers, batches)
+        else:
+            workers = 1
+            results = map(_score_offers, batches)
+
+        offers_done = 0
+        errors = 0
+        write_time = 0.0
+        try:
+            for batch_results in results:
+                for appel_offre, date_scores, skills_scores in batch_results:
+                    write_started = time.monotonic()
+                    try:
+                        save_offer_scores(
+                            appel_offre,
+                            OfferScores(_engine, date_scores, skills_scores),
+                            top_skills,
+                            batch_size=options['batch_size']
+                        )
+                        offers_done += 1
+                    except Exception as e:
+                        errors += 1
+                        self.stdout.write(self.style.ERROR(f"AO {appel_offre.id}: {str(e)}"))
+                    write_time += time.monotonic() - write_started
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        elapsed = time.monotonic() - started
+        pairs = offers_done * len(_engine.consultants)
+        self.stdout.write(self.style.SUCCESS(
+            f"{offers_done} appels d'offres recalculés ({pairs} paires) en {elapsed:.1f}s "
+            f"avec {workers} worker(s): {offers_done / elapsed:.2f} AO/s, {pairs / elapsed:.0f} paires/s "
+            f"(écriture {write_time:.1f}s, erreurs: {errors})"
+        ))
+
+    def _iter_batches(self, offer_ids, chunk_size):
+        """
+        Lit les appels d'offres et leurs critères par lots (deux requêtes par lot)
+        """
+        for start in range(0, len(offer_ids), chunk_size):
+            ids = offer_ids[start:start + chunk_size]
+            offers = AppelOffre.objects.filter(id__in=ids).only('id', 'titre', 'description', 'date_limite')
+            criteria = {appel_offre_id: [] for appel_offre_id in ids}
+            for appel_offre_id, nom_critere, poids in CriteresEvaluation.objects.filter(
+                appel_offre_id__in=ids
+            ).values_list('appel_offre_id', 'nom_critere', 'poids'):
+                criteria[appel_offre_id].append((nom_critere, poids))
+
+            yield [(appel_offre, criteria[appel_offre.id]) for appel_offre in offers]
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+import multiprocessing
+import os
+import time
+
+from consultants.cv_jobs import claim_next_job, requeue_stale_jobs, run_job, worker_name
+
+
+def _worker_loop(poll_interval, once):
+    """
+    Boucle d'un worker: prend les tâches en attente une par une (les modèles
+    d'extraction restent chargés entre deux CV)
+    """
+    name = worker_name()
+    processed = 0
+    while True:
+        close_old_connections()
+        job = claim_next_job(name)
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+
+
+class Command(BaseCommand):
+    help = "Traite les tâches d'extraction des compétences des CV (pool de workers)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Nombre de processus d'extraction (défaut: nombre de CPU, 1 = sans pool)"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help="Attente en secondes quand la file est vide (défaut: 2)"
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=None,
+            help="Délai en secondes après lequel une tâche EN_COURS est remise en attente "
+                 "(défaut: settings.CV_JOBS_STALE_AFTER, 600)"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrête quand la file est vide (cron) au lieu d'attendre de nouvelles tâches"
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        requeue_stale_jobs(options['stale_after'])
+
+        workers = max(1, options['workers'])
+        poll_interval = max(0.1, options['poll_interval'])
+        once = options['once']
+
+        if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            self.stdout.write("Worker d'extraction démarré (1 processus)")
+            processed = _worker_loop(poll_interval, once)
+        else:
+            # Chaque worker ouvre sa propre connexion après le fork
+            connections.close_all()
+            self.stdout.write(f"Pool d'extraction démarré ({workers} processus)")
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                processed = sum(pool.starmap(_worker_loop, [(poll_interval, once)] * workers))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} CV traités en {elapsed:.1f}s"
+        ))
@@ -0,0 +1,295 @@
+# matching_analytics.py - Analyse de la performance du matching
+
+"""
+Comparaison des scores de matching avec les validations manuelles des
+administrateurs: taux de validation par domaine et par niveau d'expertise,
+compétences fréquentes chez les consultants validés, recommandations.
+
+- Les matchings validés par domaine / expertise sont matérialisés dans
+  MatchingValidationStat et mis à jour à chaque validation ou annulation
+  (record_validation, appelé par validate_match). Domaine, expertise et
+  score sont figés sur le matching au moment de la validation: un nouveau
+  calcul du score ou une modification du consultant ne faussent pas
+  l'annulation ni le recalcul des compteurs.
+- Les suppressions de matchings validés (appel d'offre ou consultant
+  supprimé, nettoyages groupés) ne passent pas par record_validation:
+  chaque analyse compare les compteurs au nombre et à la somme des scores
+  des matchings validés, et les recalcule en cas d'écart.
+- Les autres indicateurs sont calculés par requêtes groupées, en nombre
+  fixe quel que soit le nombre d'appels d'offres.
+- Le résultat est mis en cache settings.MATCHING_ANALYTICS_TTL secondes
+  et invalidé à chaque validation.
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import Competence, Consultant, MatchingResult, MatchingValidationStat
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_KEY = 'stats:matching_analytics'
+# Nombre minimal de matchings validés pour produire une analyse
+MIN_VALIDATED_MATCHINGS = 5
+TOP_SKILLS_PER_OFFER = 5
+TOP_SKILLS = 20
+
+
+def get_analytics_ttl():
+    return getattr(settings, 'MATCHING_ANALYTICS_TTL', 300)
+
+
+def invalidate_analytics():
+    cache.delete(ANALYTICS_KEY)
+
+
+# ----------------------------------------------------------------------
+# Compteurs de validations
+# ----------------------------------------------------------------------
+
+VALIDATION_FIELDS = ['validation_domaine', 'validation_expertise', 'validation_score']
+
+
+def _counted_values(match, consultant):
+    """Domaine, expertise et score comptés pour un matching validé"""
+    if match.validation_score is not None:
+        return match.validation_domaine, match.validation_expertise, match.validation_score
+    # Matching validé avant que ces valeurs ne soient figées: état courant
+    return consultant.domaine_principal or '', consultant.expertise or '', Decimal(str(match.score))
+
+
+def record_validation(match, consultant, validated):
+    """
+    Met à jour les compteurs après la validation (validated=True) ou
+    l'annulation de la validation d'un matching. La validation fige sur le
+    matching les valeurs comptées, l'annulation retire ces mêmes valeurs.
+    """
+    if validated:
+        domaine, expertise = consultant.domaine_principal or '', consultant.expertise or ''
+        validation_score = Decimal(str(match.score))
+        match.validation_domaine, match.validation_expertise = domaine, expertise
+        match.validation_score = validation_score
+    else:
+        domaine, expertise, validation_score = _counted_values(match, consultant)
+        match.validation_domaine, match.validation_expertise, match.validation_score = '', '', None
+    match.save(update_fields=VALIDATION_FIELDS)
+
+    delta = 1 if validated else -1
+    score = Decimal(str(validation_score)) * delta
+    for axe, valeur in (('domaine', domaine), ('expertise', expertise)):
+        updated = MatchingValidationStat.objects.filter(axe=axe, valeur=valeur).update(
+            valides=F('valides') + delta,
+            somme_scores=F('somme_scores') + score
+        )
+        if updated or not validated:
+            continue
+        try:
+            with transaction.atomic():
+                MatchingValidationStat.objects.create(axe=axe, valeur=valeur, valides=1, somme_scores=validation_score)
+        except IntegrityError:
+            # Ligne créée entre-temps par une validation concurrente
+            MatchingValidationStat.objects.filter(axe=axe, valeur=valeur).update(
+                valides=F('valides') + 1,
+                somme_scores=F('somme_scores') + score
+            )
+    transaction.on_commit(invalidate_analytics)
+
+
+def rebuild_validation_counters():
+    """
+    Recalcule tous les compteurs à partir des valeurs figées des matchings
+    validés (deux requêtes groupées)
+    """
+    validated = MatchingResult.objects.filter(is_validated=True).order_by()
+    counters = []
+    for axe, field in (('domaine', 'validation_domaine'), ('expertise', 'validation_expertise')):
+        for row in validated.values(field).annotate(valides=Count('id'), somme_scores=Sum('validation_score')):
+            counters.append(MatchingValidationStat(
+                axe=axe, valeur=row[field] or '', valides=row['valides'], somme_scores=row['somme_scores'] or 0
+            ))
+    with transaction.atomic():
+        MatchingValidationStat.objects.all().delete()
+        MatchingValidationStat.objects.bulk_create(counters)
+    transaction.on_commit(invalidate_analytics)
+    logger.info(f"Compteurs de validation du matching recalculés: {len(counters)} lignes")
+    return len(counters)
+
+
+# ----------------------------------------------------------------------
+# Analyse
+# ----------------------------------------------------------------------
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+
+def _performance(validated_counts, totals):
+    performance = {}
+    for valeur, total in totals.items():
+        if total > 0:
+            validated = validated_counts.get(valeur, 0)
+            performance[valeur] = {
+                'validated': validated,
+                'total': total,
+                'ratio': validated / total
+            }
+    return performance
+
+
+def skill_frequency(limit=TOP_SKILLS):
+    """
+    Compétences les plus fréquentes chez les consultants ayant au moins un
+    matching validé (une requête groupée)
+    """
+    validated_consultants = MatchingResult.objects.filter(is_validated=True).values('consultant_id')
+    return [
+        {'competence': row['nom'], 'consultants': row['consultants']}
+        for row in Competence.objects.filter(consultant_id__in=validated_consultants)
+        .annotate(nom=Lower('nom_competence'))
+        .values('nom')
+        .annotate(consultants=Count('consultant_id', distinct=True))
+        .order_by('-consultants', 'nom')[:limit]
+    ]
+
+
+def _read_counters():
+    counters = {'domaine': {}, 'expertise': {}}
+    for axe, valeur, valides, somme_scores in MatchingValidationStat.objects.values_list(
+        'axe', 'valeur', 'valides', 'somme_scores'
+    ):
+        counters[axe][valeur] = (valides, somme_scores)
+    return counters
+
+
+def _counters_match(counters, validated, validated_scores):
+    """Compteurs cohérents avec les matchings validés (aucune suppression manquée)"""
+    validated_scores = validated_scores or 0
+    for values in counters.values():
+        if sum(valides for valides, _ in values.values()) != validated:
+            return False
+        if sum(somme for _, somme in values.values()) != validated_scores:
+            return False
+    return True
+
+
+def compute_matching_analytics():
+    totals = MatchingResult.objects.aggregate(
+        total=Count('id'),
+        validated=Count('id', filter=Q(is_validated=True)),
+        validated_scores=Sum('validation_score', filter=Q(is_validated=True)),
+        avg_validated=Avg('score', filter=Q(is_validated=True)),
+        avg_non_validated=Avg('score', filter=Q(is_validated=False)),
+    )
+    if totals['validated'] < MIN_VALIDATED_MATCHINGS:
+        logger.info("Pas assez de matchings validés pour analyser la performance")
+        return {
+            'success': False,
+            'message': "Données insuffisantes pour l'analyse"
+        }
+    avg_validated_score = _to_float(totals['avg_validated'])
+    avg_non_validated_score = _to_float(totals['avg_non_validated'])
+
+    # Totaux par domaine et expertise (une requête), validés depuis les compteurs
+    domain_totals = defaultdict(int)
+    expertise_totals = defaultdict(int)
+    for row in MatchingResult.objects.order_by().values(
+        'consultant__domaine_principal', 'consultant__expertise'
+    ).annotate(total=Count('id')):
+        domain_totals[row['consultant__domaine_principal'] or ''] += row['total']
+        expertise_totals[row['consultant__expertise'] or ''] += row['total']
+    counters = _read_counters()
+    if not _counters_match(counters, totals['validated'], totals['validated_scores']):
+        logger.warning("Compteurs de validation du matching désynchronisés (matchings validés supprimés), recalcul")
+        rebuild_validation_counters()
+        counters = _read_counters()
+    performance_by_domain = _performance(
+        {valeur: valides for valeur, (valides, _) in counters['domaine'].items()}, domain_totals
+    )
+    performance_by_expertise = _performance(
+        {valeur: valides for valeur, (valides, _) in counters['expertise'].items()}, expertise_totals
+    )
+
+    # Appels d'offres ayant au moins un matching validé (une requête)
+    offers = MatchingResult.objects.order_by().values('appel_offre_id', 'appel_offre__titre').annotate(
+        validated_count=Count('id', filter=Q(is_validated=True)),
+        non_validated_count=Count('id', filter=Q(is_validated=False)),
+        avg_score_validated=Avg('score', filter=Q(is_validated=True)),
+    ).filter(validated_count__gt=0).order_by('appel_offre_id')
+
+    # Compétences des consultants validés, par appel d'offre (une requête)
+    skills_by_offer = defaultdict(list)
+    for row in Competence.objects.filter(consultant__matchings__is_validated=True).annotate(
+        nom=Lower('nom_competence')
+    ).values('consultant__matchings__appel_offre_id', 'nom').annotate(count=Count('id')).order_by('-count', 'nom'):
+        skills_by_offer[row['consultant__matchings__appel_offre_id']].append(row['nom'])
+
+    detailed_analysis = [
+        {
+            'appel_offre_id': offer['appel_offre_id'],
+            'appel_offre_name': offer['appel_offre__titre'],
+            'validated_count': offer['validated_count'],
+            'non_validated_count': offer['non_validated_count'],
+            'avg_score_validated': _to_float(offer['avg_score_validated']) or 0,
+            'top_skills': skills_by_offer[offer['appel_offre_id']][:TOP_SKILLS_PER_OFFER]
+        }
+        for offer in offers
+    ]
+
+    # Recommandations basées sur l'analyse
+    recommendations = []
+    if avg_validated_score and avg_non_validated_score:
+        if avg_validated_score - avg_non_validated_score < 10:
+            recommendations.append(
+                "L'écart entre les scores des matchings validés et non validés est faible. "
+                "Il est recommandé d'ajuster les pondérations de l'algorithme de matching."
+            )
+    domain_names = dict(Consultant.SPECIALITES_CHOICES)
+    for domain, perf in performance_by_domain.items():
+        if perf['ratio'] < 0.2 and perf['total'] > 10:
+            recommendations.append(
+                f"Faible taux de validation pour le domaine {domain_names.get(domain, domain)} ({perf['ratio']*100:.1f}%). "
+                "Les critères spécifiques à ce domaine pourraient nécessiter une révision."
+            )
+    for level, perf in performance_by_expertise.items():
+        if perf['ratio'] < 0.2 and perf['total'] > 10:
+            recommendations.append(
+                f"Faible taux de validation pour les consultants de niveau {level} ({perf['ratio']*100:.1f}%). "
+                "Ajustez potentiellement l'impact du niveau d'expertise dans le calcul du score."
+            )
+
+    logger.info(f"Analyse de performance du matching complétée: {len(recommendations)} recommandations générées")
+    return {
+        'success': True,
+        'stats': {
+            'total_matchings': totals['total'],
+            'validated_matchings': totals['validated'],
+            'validation_rate': totals['validated'] / totals['total'] if totals['total'] > 0 else 0,
+            'avg_validated_score': avg_validated_score,
+            'avg_non_validated_score': avg_non_validated_score
+        },
+        'performance_by_domain': performance_by_domain,
+        'performance_by_expertise': performance_by_expertise,
+        'detailed_analysis': detailed_analysis,
+        'skill_frequency': skill_frequency(),
+        'recommendations': recommendations,
+        'generated_at': timezone.now().isoformat()
+    }
+
+
+def get_matching_analytics(refresh=False):
+    """Analyse du matching en cache (refresh=True: recalcul immédiat)"""
+    if not refresh:
+        analytics = cache.get(ANALYTICS_KEY)
+        if analytics is not None:
+            return analytics
+    analytics = compute_matching_analytics()
+    cache.set(ANALYTICS_KEY, analytics, get_analytics_ttl())
+    return analytics
@@ -0,0 +1,727 @@
+# matching_engine.py - Moteur de matching vectorisé consultants / appels d'offres
+
+"""
+Moteur de matching par lots.
+
+Toutes les compétences et fenêtres de disponibilité des consultants éligibles
+sont chargées une seule fois dans des tableaux NumPy compacts (matrice creuse
+consultant x compétence + vecteurs de dates), puis l'ensemble du vivier est
+scoré contre un appel d'offre en une seule passe (pondération 30% date /
+70% compétences).
+"""
+
+import heapq
+import logging
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+
+from .models import AppelOffre, Consultant, Competence, MatchingResult
+from .offer_analysis import OfferAnalysis, get_offer_analysis
+from .skill_similarity import SkillSet
+
+logger = logging.getLogger(__name__)
+
+# Pondération du score final
+DATE_WEIGHT = 0.3
+SKILLS_WEIGHT = 0.7
+
+# Fenêtre de projet estimée autour de la date limite (en jours)
+PROJECT_START_OFFSET = 30
+PROJECT_END_OFFSET = 60
+DATE_BUFFER_DAYS = 15
+
+EXPERTISE_POINTS = {
+    'Senior': 15,
+    'Expert': 15,
+    'Intermédiaire': 10,
+}
+DEFAULT_EXPERTISE_POINTS = 5
+
+# Part maximale des compétences dans le score de compétences
+SKILLS_PART_MAX = 70
+
+# Taille des paquets de consultants scorés pour le top-K
+TOP_K_CHUNK_SIZE = 64
+
+
+def get_eligible_consultants():
+    """
+    Consultants pris en compte pour le matching (validés, actifs, avec disponibilités)
+    """
+    return Consultant.objects.filter(
+        is_validated=True,
+        statut='Actif'
+    ).exclude(
+        date_debut_dispo=None
+    ).exclude(
+        date_fin_dispo=None
+    )
+
+
+def _to_ordinal(value):
+    return value.toordinal() if value else 0
+
+
+def final_scores(date_scores, skills_scores):
+    """Score final: 30% date + 70% compétences, borné à [0, 100]"""
+    return np.clip((date_scores * DATE_WEIGHT) + (skills_scores * SKILLS_WEIGHT), 0, 100)
+
+
+class OfferScores:
+    """Scores d'un appel d'offre pour tout le vivier (alignés sur engine.consultants)"""
+
+    def __init__(self, engine, date_scores, skills_scores):
+        self.engine = engine
+        self.date_scores = date_scores
+        self.skills_scores = skills_scores
+        self.scores = final_scores(date_scores, skills_scores)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def ranking(self):
+        """Indices des consultants triés par score décroissant"""
+        return np.argsort(-self.scores, kind='stable')
+
+    def stats(self):
+        if not len(self.scores):
+            return {"min": 0, "max": 0, "total": 0, "count": 0, "avg": 0}
+        total = float(self.scores.sum())
+        return {
+            "min": float(self.scores.min()),
+            "max": float(self.scores.max()),
+            "total": total,
+            "count": len(self.scores),
+            "avg": total / len(self.scores),
+        }
+
+
+class OfferProfile:
+    """
+    Éléments d'un appel d'offre utilisés par le score de compétences
+    (analyse partagée, voir offer_analysis).
+
+    Les critères priment sur la description; les vecteurs de similarité
+    des mots-clés sont mémorisés par vocabulaire. Avec `criteria` fourni,
+    l'analyse est calculée sans accès base (workers de rematch_all).
+    """
+
+    def __init__(self, appel_offre, criteria=None):
+        if criteria is None:
+            self.analysis = get_offer_analysis(appel_offre)
+        else:
+            self.analysis = OfferAnalysis.from_offer(appel_offre, criteria)
+        self.has_description = self.analysis.has_description
+        self.criteria = self.analysis.criteria
+        self.total_weight = self.analysis.total_weight
+        if self.criteria:
+            self.level_base, self.level_slope = 0.7, 0.3
+        else:
+            self.level_base, self.level_slope = 0.6, 0.4
+        self._similarities = {}
+
+    def constant_skills_part(self):
+        """Part compétences identique pour tous les consultants, sinon None"""
+        if self.criteria:
+            return 0.0 if self.total_weight <= 0 else None
+        if not self.has_description:
+            return 25.0  # Score réduit sans description
+        if not self.analysis.mentioned_skills:
+            return 35.0  # Score neutre
+        return None
+
+    def keyword_similarities(self, skill_set):
+        """
+        [(poids, similarités avec le vocabulaire)] pour chaque mot-clé:
+        critère pondéré (poids / total x 70) ou compétence mentionnée
+        dans la description (70 / nombre de compétences, inclusion à 0.8)
+        """
+        key = id(skill_set)
+        if key not in self._similarities:
+            if self.criteria:
+                self._similarities[key] = [
+                    (poids / self.total_weight * SKILLS_PART_MAX, skill_set.similarities(nom_critere))
+                    for nom_critere, poids in self.criteria
+                ]
+            else:
+                mentioned_skills = self.analysis.mentioned_skills
+                self._similarities[key] = [
+                    (SKILLS_PART_MAX / len(mentioned_skills), skill_set.similarities(keyword, substring_score=0.8))
+                    for keyword in mentioned_skills
+                ]
+        return self._similarities[key]
+
+
+class MatchingEngine:
+    """
+    Instantané en mémoire du vivier de consultants.
+
+    - consultants: liste des instances Consultant (ordre des lignes)
+    - start_days / end_days: disponibilités en jours ordinaux
+    - skill_matrix: matrice CSR consultant x vocabulaire, valeur = niveau
+    - vocabulary: noms de compétences en minuscules (colonnes de skill_matrix)
+    """
+
+    def __init__(self, consultants, skill_rows):
+        self.consultants = list(consultants)
+        self.index_by_id = {c.id: i for i, c in enumerate(self.consultants)}
+        n = len(self.consultants)
+
+        self.consultant_ids = np.fromiter((c.id for c in self.consultants), dtype=np.int64, count=n)
+        self.start_days = np.fromiter(
+            (_to_ordinal(c.date_debut_dispo) for c in self.consultants), dtype=np.int64, count=n
+        )
+        self.end_days = np.fromiter(
+            (_to_ordinal(c.date_fin_dispo) for c in self.consultants), dtype=np.int64, count=n
+        )
+        self.has_dates = (self.start_days > 0) & (self.end_days > 0)
+        self.domains = np.array([c.domaine_principal or '' for c in self.consultants], dtype=object)
+        self.expertise_points = np.fromiter(
+            (EXPERTISE_POINTS.get(c.expertise, DEFAULT_EXPERTISE_POINTS) for c in self.consultants),
+            dtype=np.float64, count=n
+        )
+
+        self._build_skill_matrix(skill_rows)
+
+    @classmethod
+    def load(cls, consultants=None):
+        """
+        Charge le vivier en deux requêtes (consultants puis compétences)
+        """
+        if consultants is None:
+            consultants = get_eligible_consultants()
+        consultants = list(consultants)
+        ids = [c.id for c in consultants]
+        skill_rows = Competence.objects.filter(
+            consultant_id__in=ids
+        ).values_list('consultant_id', 'nom_competence', 'niveau') if ids else []
+
+        engine = cls(consultants, skill_rows)
+        logger.info(
+            f"Moteur de matching chargé: {len(engine.consultants)} consultants, "
+            f"{len(engine.vocabulary)} compétences distinctes, {engine.skill_matrix.nnz} liaisons"
+        )
+        return engine
+
+    def _build_skill_matrix(self, skill_rows):
+        self.vocabulary = []
+        self.vocabulary_index = {}
+        # Un nom (en minuscules) par consultant, comme le skills_dict d'origine
+        cells = {}
+        for consultant_id, nom_competence, niveau in skill_rows:
+            row = self.index_by_id.get(consultant_id)
+            if row is None or not nom_competence:
+                continue
+            name = nom_competence.lower()
+            col = self.vocabulary_index.get(name)
+            if col is None:
+                col = len(self.vocabulary)
+                self.vocabulary_index[name] = col
+                self.vocabulary.append(name)
+            cells[(row, col)] = niveau or 0
+
+        if cells:
+            rows, cols = zip(*cells.keys())
+            data = np.fromiter(cells.values(), dtype=np.float64, count=len(cells))
+        else:
+            rows, cols, data = (), (), np.zeros(0)
+
+        self.skill_matrix = csr_matrix(
+            (data, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+            shape=(len(self.consultants), len(self.vocabulary))
+        )
+        self.skill_matrix.sort_indices()
+        self.has_skills = np.diff(self.skill_matrix.indptr) > 0
+        self.skill_set = SkillSet(self.vocabulary)
+
+    # ------------------------------------------------------------------
+    # Scores
+    # ------------------------------------------------------------------
+
+    def score_offer(self, appel_offre, profile=None):
+        """
+        Score tout le vivier contre un appel d'offre en une passe
+        """
+        date_scores = self.date_scores(appel_offre.date_limite)
+        skills_scores = self.skills_scores(appel_offre, profile)
+        return OfferScores(self, date_scores, skills_scores)
+
+    def date_scores(self, date_limite):
+        """
+        Score de disponibilité de chaque consultant sur la période du projet
+        (date limite - PROJECT_START_OFFSET à date limite + PROJECT_END_OFFSET)
+        """
+        n = len(self.consultants)
+        if not date_limite:
+            return np.full(n, 50.0)
+
+        project_start = (date_limite - timedelta(days=PROJECT_START_OFFSET)).toordinal()
+        project_end = (date_limite + timedelta(days=PROJECT_END_OFFSET)).toordinal()
+        start, end = self.start_days, self.end_days
+
+        before = end < project_start
+        after = start > project_end
+        gap = np.where(before, project_start - end, start - project_end)
+        near_score = np.maximum(0, 25 * (1 - gap / DATE_BUFFER_DAYS))
+        no_overlap_score = np.where(gap <= DATE_BUFFER_DAYS, near_score, 0.0)
+
+        total_days = project_end - project_start + 1
+        overlap_days = np.minimum(end, project_end) - np.maximum(start, project_start) + 1
+        coverage = overlap_days / total_days * 100
+        partial_score = np.minimum(
+            100, np.where(coverage >= 80, 85 + (coverage - 80) / 2, coverage * 0.85)
+        )
+
+        full_cover = (start <= project_start) & (end >= project_end)
+        scores = np.select(
+            [before | after, full_cover],
+            [no_overlap_score, 100.0],
+            default=partial_score
+        )
+        return np.where(self.has_dates, scores, 0.0).astype(np.float64)
+
+    def skills_scores(self, appel_offre, profile=None):
+        """
+        Score de compétences de chaque consultant
+        (domaine 15 + expertise 15 + compétences 70, bonus et plancher)
+        """
+        if profile is None:
+            profile = OfferProfile(appel_offre)
+        constant_part = profile.constant_skills_part()
+        if constant_part is not None:
+            skills_part = np.full(len(self.consultants), constant_part)
+        else:
+            skills_part = self._keyword_scores(profile)
+        return self._adjust_skills_total(self._base_points(profile) + skills_part)
+
+    def _base_points(self, profile):
+        """Points de domaine et d'expertise (hors compétences)"""
+        detected_domain, domain_confidence = profile.analysis.domain
+        if domain_confidence > 0:
+            other_domain_points = min(12, 15 * (domain_confidence / 10))
+        else:
+            other_domain_points = 8
+        domain_points = np.where(self.domains == detected_domain, 15.0, float(other_domain_points))
+        return domain_points + self.expertise_points
+
+    def _adjust_skills_total(self, total):
+        """Bonus au-delà de 70, plancher à 15, 10 pour un consultant sans compétence"""
+        total = np.where(total > 70, np.minimum(100, total * 1.1), total)
+        total = np.maximum(total, 15)
+        return np.where(self.has_skills, total, 10.0)
+
+    def _keyword_scores(self, profile):
+        """
+        Part compétences (70 max): somme pondérée, sur les mots-clés de
+        l'appel d'offre, de la meilleure correspondance de chaque consultant
+        """
+        matched = np.zeros(len(self.consultants))
+        for weight, similarities in profile.keyword_similarities(self.skill_set):
+            matched += weight * self._best_match(similarities, profile.level_base, profile.level_slope)
+        return np.minimum(SKILLS_PART_MAX, matched)
+
+    def _best_match(self, similarities, base, slope):
+        """
+        Meilleure correspondance par consultant: max_j sim[j] * (base + slope * niveau / 5)
+        """
+        best = np.zeros(len(self.consultants))
+        matrix = self.skill_matrix
+        if not matrix.nnz or not similarities.any():
+            return best
+
+        weights = similarities[matrix.indices] * (base + slope * (matrix.data / 5))
+        starts = matrix.indptr[:-1][self.has_skills]
+        best[self.has_skills] = np.maximum.reduceat(weights, starts)
+        return np.maximum(best, 0)
+
+    # ------------------------------------------------------------------
+    # Top-K
+    # ------------------------------------------------------------------
+
+    def top_candidates(self, appel_offre, k):
+        """
+        Les k meilleurs consultants sans scorer tout le vivier.
+
+        Les scores de date, de domaine et d'expertise sont calculés pour tous
+        (opérations vectorielles peu coûteuses); seule la part compétences
+        est chère. Elle est nulle pour un consultant qui ne partage aucune
+        compétence (ni token, ni base, ni inclusion) avec les mots-clés de
+        l'appel d'offre: son score est alors exact sans calcul. Pour les
+        autres, un majorant de la part compétences permet d'écarter
+        ceux qui ne peuvent plus atteindre le k-ième score courant, par
+        exemple faute de disponibilité compatible avec la fenêtre du projet.
+        Les restants sont scorés par paquets, par majorant décroissant,
+        dans un tas de taille k.
+
+        Retourne [(ligne, score, date_score, skills_score)] par score décroissant
+        (même ordre que OfferScores.ranking()).
+        """
+        n = len(self.consultants)
+        if not n or k <= 0:
+            return []
+
+        profile = OfferProfile(appel_offre)
+        date_scores = self.date_scores(appel_offre.date_limite)
+
+        bounds = None
+        if profile.constant_skills_part() is None:
+            bounds = self._skills_part_bounds(profile)
+
+        if bounds is None or not bounds.any():
+            # Score exact pour tout le vivier sans calcul de similarité par consultant
+            skills_scores = self.skills_scores(appel_offre, profile)
+            scores = final_scores(date_scores, skills_scores)
+            return [
+                (row, float(scores[row]), float(date_scores[row]), float(skills_scores[row]))
+                for row in heapq.nlargest(min(k, n), range(n), key=lambda row: (scores[row], -row))
+            ]
+
+        related = bounds > 0
+        base_points = self._base_points(profile)
+        lower_skills = self._adjust_skills_total(base_points)
+        lower = final_scores(date_scores, lower_skills)
+        upper = final_scores(date_scores, self._adjust_skills_total(base_points + bounds))
+
+        # Consultants sans compétence liée: score exact (part compétences nulle)
+        exact_rows = np.flatnonzero(~related)
+        if len(exact_rows) > k:
+            exact_rows = exact_rows[np.argpartition(-lower[exact_rows], k - 1)[:k]]
+        heap = [(float(lower[row]), -int(row)) for row in exact_rows]
+        heapq.heapify(heap)
+        while len(heap) > k:
+            heapq.heappop(heap)
+        details = {int(row): float(lower_skills[row]) for row in exact_rows}
+
+        # Seuil initial: k-ième minorant (la part compétences ne peut que l'augmenter)
+        threshold = -np.inf
+        if n > k:
+            threshold = np.partition(lower, n - k)[n - k]
+        candidates = np.flatnonzero(related & (upper >= threshold))
+        candidates = candidates[np.argsort(-upper[candidates], kind='stable')]
+
+        scored = 0
+        for chunk_start in range(0, len(candidates), TOP_K_CHUNK_SIZE):
+            if len(heap) >= k and upper[candidates[chunk_start]] < heap[0][0]:
+                break
+            rows = candidates[chunk_start:chunk_start + TOP_K_CHUNK_SIZE]
+            chunk_skills = self._subset(rows).skills_scores(appel_offre, profile)
+            chunk_scores = final_scores(date_scores[rows], chunk_skills)
+            scored += len(rows)
+            for row, score, skills_score in zip(rows, chunk_scores, chunk_skills):
+                item = (float(score), -int(row))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+                else:
+                    continue
+                details[int(row)] = float(skills_score)
+
+        logger.info(
+            f"Top {k} pour l'AO {appel_offre.id}: {scored} consultants scorés sur {n} "
+            f"({int(related.sum())} avec compétences liées)"
+        )
+        return [
+            (-negative_row, score, float(date_scores[-negative_row]), details[-negative_row])
+            for score, negative_row in sorted(heap, reverse=True)
+        ]
+
+    def _skills_part_bounds(self, profile):
+        """
+        Majorant de la part compétences par consultant, en un parcours:
+        meilleure similarité (tous mots-clés confondus) de ses compétences,
+        pondérée par le niveau, multipliée par le poids total des mots-clés.
+        Il est nul si et seulement si la part compétences exacte est nulle.
+        """
+        bounds = np.zeros(len(self.consultants))
+        matrix = self.skill_matrix
+        keywords = [(weight, similarities) for weight, similarities in profile.keyword_similarities(self.skill_set) if weight > 0]
+        if not matrix.nnz or not keywords:
+            return bounds
+
+        column_best = np.max([similarities for _, similarities in keywords], axis=0)
+        best = np.zeros(len(self.consultants))
+        weights = column_best[matrix.indices] * (profile.level_base + profile.level_slope * (matrix.data / 5))
+        starts = matrix.indptr[:-1][self.has_skills]
+        best[self.has_skills] = np.maximum.reduceat(weights, starts)
+        total_weight = sum(weight for weight, _ in keywords)
+        return np.minimum(SKILLS_PART_MAX, np.maximum(best, 0) * total_weight)
+
+    def _subset(self, rows):
+        """Vue du moteur restreinte à quelques lignes (vocabulaire partagé)"""
+        subset = object.__new__(type(self))
+        subset.consultants = [self.consultants[row] for row in rows]
+        subset.index_by_id = {c.id: i for i, c in enumerate(subset.consultants)}
+        for name in ('consultant_ids', 'start_days', 'end_days', 'has_dates',
+                     'domains', 'expertise_points', 'has_skills'):
+            setattr(subset, name, getattr(self, name)[rows])
+        subset.vocabulary = self.vocabulary
+        subset.vocabulary_index = self.vocabulary_index
+        subset.skill_set = self.skill_set
+        subset.skill_matrix = self.skill_matrix[rows]
+        return subset
+
+
+# ----------------------------------------------------------------------
+# Moteur partagé (lectures)
+# ----------------------------------------------------------------------
+
+_shared_engine = None
+_shared_version = None
+_shared_lock = threading.Lock()
+
+
+def pool_version():
+    """
+    Version du vivier lue en base, identique pour tous les processus:
+    nombre et dernière modification des consultants, nombre et dernier
+    identifiant des compétences (une compétence modifiée avance
+    updated_at de son consultant, voir signals.py)
+    """
+    consultants = Consultant.objects.aggregate(count=Count('id'), last=Max('updated_at'))
+    competences = Competence.objects.aggregate(count=Count('id'), last=Max('id'))
+    return (consultants['count'], consultants['last'], competences['count'], competences['last'])
+
+
+def get_shared_engine():
+    """
+    Moteur chargé une fois par processus et réutilisé par les lectures
+    (top-K) tant que la version du vivier est inchangée: deux agrégats
+    au lieu du chargement de tous les consultants et compétences.
+    Le moteur n'est jamais modifié après chargement.
+    """
+    global _shared_engine, _shared_version
+    version = pool_version()
+    engine = _shared_engine
+    if engine is not None and _shared_version == version:
+        return engine
+    with _shared_lock:
+        if _shared_engine is None or _shared_version != version:
+            _shared_engine = MatchingEngine.load()
+            _shared_version = version
+        return _shared_engine
+
+
+def invalidate_shared_engine():
+    """Rechargement immédiat dans ce processus (signaux consultant / compétence)"""
+    global _shared_engine, _shared_version
+    with _shared_lock:
+        _shared_engine = None
+        _shared_version = None
+
+
+# ----------------------------------------------------------------------
+# Persistance
+# ----------------------------------------------------------------------
+
+def _to_decimal(value):
+    return Decimal(str(round(float(value), 2)))
+
+
+def _upsert_options():
+    options = {
+        'update_conflicts': True,
+        'update_fields': ['score', 'date_score', 'skills_score', 'top_skills'],
+    }
+    if connection.features.supports_update_conflicts_with_target:
+        # MySQL s'appuie sur ON DUPLICATE KEY et refuse unique_fields
+        options['unique_fields'] = ['appel_offre', 'consultant']
+    return options
+
+
+def save_offer_scores(appel_offre, offer_scores, top_skills=None, batch_size=500):
+    """
+    Enregistre tous les scores d'un appel d'offre en une transaction:
+    upsert sur la clé unique (appel_offre, consultant) puis une seule
+    relecture des identifiants. Le détail date/compétences et les
+    compétences principales sont stockés pour la lecture sans recalcul.
+
+    Les matchings déjà validés gardent leur statut; ceux des consultants
+    sortis du vivier sont supprimés.
+
+    Retourne {consultant_id: (match_id, is_validated)}
+    """
+    consultant_ids = [int(cid) for cid in offer_scores.engine.consultant_ids]
+    if top_skills is None:
+        top_skills = fetch_top_skills(consultant_ids)
+
+    rows = [
+        MatchingResult(
+            appel_offre=appel_offre,
+            consultant_id=consultant_id,
+            score=_to_decimal(offer_scores.scores[row]),
+            date_score=_to_decimal(offer_scores.date_scores[row]),
+            skills_score=_to_decimal(offer_scores.skills_scores[row]),
+            top_skills=top_skills.get(consultant_id, []),
+            is_validated=False
+        )
+        for row, consultant_id in enumerate(consultant_ids)
+    ]
+
+    with transaction.atomic():
+        MatchingResult.objects.filter(
+            appel_offre=appel_offre
+        ).exclude(
+            consultant_id__in=consultant_ids
+        ).delete()
+        MatchingResult.objects.bulk_create(rows, batch_size=batch_size, **_upsert_options())
+        saved = MatchingResult.objects.filter(
+            appel_offre=appel_offre
+        ).values_list('consultant_id', 'id', 'is_validated')
+
+        return {consultant_id: (match_id, is_validated) for consultant_id, match_id, is_validated in saved}
+
+
+def reconcile_offer_matches(appel_offre, engine, tolerance=5, batch_size=500):
+    """
+    Contrôle de cohérence des matchings stockés d'un appel d'offre
+    (anciennement fait à chaque GET): re-score les consultants déjà
+    matchés et réécrit les lignes dont le score a dérivé de plus de
+    `tolerance` points ou dont le détail n'a jamais été enregistré.
+
+    Retourne le nombre de matchings mis à jour.
+    """
+    matches = list(
+        MatchingResult.objects.filter(appel_offre=appel_offre).only(
+            'id', 'consultant_id', 'score', 'date_score', 'skills_score', 'top_skills'
+        )
+    )
+    if not matches:
+        return 0
+
+    offer_scores = engine.score_offer(appel_offre)
+    top_skills = fetch_top_skills([match.consultant_id for match in matches])
+
+    to_update = []
+    for match in matches:
+        row = engine.index_by_id.get(match.consultant_id)
+        if row is None:
+            continue
+
+        calculated_score = float(offer_scores.scores[row])
+        drifted = abs(calculated_score - float(match.score)) > tolerance
+        incomplete = match.date_score is None or match.skills_score is None
+        skills = top_skills.get(match.consultant_id, [])
+        if not (drifted or incomplete or match.top_skills != skills):
+            continue
+
+        if drifted or incomplete:
+            match.score = _to_decimal(calculated_score)
+            match.date_score = _to_decimal(offer_scores.date_scores[row])
+            match.skills_score = _to_decimal(offer_scores.skills_scores[row])
+        match.top_skills = skills
+        to_update.append(match)
+
+    if to_update:
+        MatchingResult.objects.bulk_update(
+            to_update, ['score', 'date_score', 'skills_score', 'top_skills'], batch_size=batch_size
+        )
+    return len(to_update)
+
+
+def fetch_top_skills(consultant_ids, limit=5):
+    """
+    Compétences principales (niveau décroissant) de plusieurs consultants en une requête
+
+    Retourne {consultant_id: [nom_competence, ...]}
+    """
+    top_skills = {consultant_id: [] for consultant_id in consultant_ids}
+    if not top_skills:
+        return top_skills
+
+    rows = Competence.objects.filter(
+        consultant_id__in=list(top_skills)
+    ).order_by('consultant_id', '-niveau', 'id').values_list('consultant_id', 'nom_competence')
+
+    for consultant_id, nom_competence in rows:
+        skills = top_skills[consultant_id]
+        if nom_competence and len(skills) < limit:
+            skills.append(nom_competence)
+    return top_skills
+
+
+# ----------------------------------------------------------------------
+# Recalcul incrémental
+# ----------------------------------------------------------------------
+
+def get_open_offers():
+    """
+    Appels d'offres non expirés (date limite future ou absente)
+    """
+    return AppelOffre.objects.filter(Q(date_limite__isnull=True) | Q(date_limite__gte=date.today()))
+
+
+def get_open_matched_offers():
+    """
+    Appels d'offres non expirés dont le matching a déjà été généré
+    """
+    return get_open_offers().filter(matchings__isnull=False).distinct()
+
+
+def rescore_offer(appel_offre_id, engine=None):
+    """
+    Recalcule la colonne d'un appel d'offre (tout le vivier) si son
+    matching a déjà été généré. Retourne le nombre de matchings écrits.
+    """
+    appel_offre = AppelOffre.objects.filter(pk=appel_offre_id).first()
+    if appel_offre is None or not MatchingResult.objects.filter(appel_offre_id=appel_offre_id).exists():
+        return 0
+
+    if engine is None:
+        engine = MatchingEngine.load()
+    if not len(engine.consultants):
+        return 0
+
+    saved = save_offer_scores(appel_offre, engine.score_offer(appel_offre))
+    logger.info(f"Matching de l'AO {appel_offre_id} recalculé: {len(saved)} consultants")
+    return len(saved)
+
+
+def rescore_consultant(consultant_id, batch_size=500):
+    """
+    Recalcule la ligne d'un consultant sur tous les appels d'offres ouverts.
+
+    Un consultant sorti du vivier (non validé, inactif, sans disponibilités)
+    perd ses matchings non validés; les matchings validés sont conservés.
+    Retourne le nombre de matchings écrits ou supprimés.
+    """
+    offers = list(get_open_matched_offers())
+    if not offers:
+        return 0
+
+    consultant = get_eligible_consultants().filter(pk=consultant_id).first()
+    if consultant is None:
+        deleted, _ = MatchingResult.objects.filter(
+            consultant_id=consultant_id,
+            appel_offre__in=offers,
+            is_validated=False
+        ).delete()
+        if deleted:
+            logger.info(f"Consultant {consultant_id} hors vivier: {deleted} matchings supprimés")
+        return deleted
+
+    engine = MatchingEngine.load([consultant])
+    top_skills = fetch_top_skills([consultant_id]).get(consultant_id, [])
+
+    rows = []
+    for appel_offre in offers:
+        offer_scores = engine.score_offer(appel_offre)
+        rows.append(MatchingResult(
+            appel_offre=appel_offre,
+            consultant_id=consultant_id,
+            score=_to_decimal(offer_scores.scores[0]),
+            date_score=_to_decimal(offer_scores.date_scores[0]),
+            skills_score=_to_decimal(offer_scores.skills_scores[0]),
+            top_skills=top_skills,
+            is_validated=False
+        ))
+
+    MatchingResult.objects.bulk_create(rows, batch_size=batch_size, **_upsert_options())
+    logger.info(f"Consultant {consultant_id} recalculé sur {len(rows)} appels d'offres")
+    return len(rows)
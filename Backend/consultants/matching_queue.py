@@ -0,0 +1,107 @@
+# matching_queue.py - File d'attente du recalcul incrémental du matching
+
+"""
+Les signaux (signals.py) y déposent des tâches après le commit de la
+transaction en cours:
+
+- ('consultant', id): recalcul de la ligne du consultant sur les appels
+  d'offres ouverts
+- ('offer', id): recalcul de la colonne de l'appel d'offre
+
+Une tâche déjà en attente n'est pas dupliquée (l'import d'un CV avec vingt
+compétences donne un seul recalcul). Le mode est fixé par
+settings.MATCHING_QUEUE_MODE: 'thread' (thread de fond par processus),
+'sync' (exécution immédiate) ou 'off'.
+"""
+
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+CONSULTANT = 'consultant'
+OFFER = 'offer'
+
+_queue = queue.Queue()
+_pending = set()
+_lock = threading.Lock()
+_worker = None
+
+
+def get_queue_mode():
+    return getattr(settings, 'MATCHING_QUEUE_MODE', 'thread')
+
+
+def enqueue_consultant(consultant_id):
+    _enqueue((CONSULTANT, consultant_id))
+
+
+def enqueue_offer(appel_offre_id):
+    _enqueue((OFFER, appel_offre_id))
+
+
+def _enqueue(job):
+    if job[1] is None:
+        return
+    mode = get_queue_mode()
+    if mode == 'off':
+        return
+    if mode == 'sync':
+        transaction.on_commit(lambda: run_job(job))
+    else:
+        transaction.on_commit(lambda: _submit(job))
+
+
+def _submit(job):
+    global _worker
+    with _lock:
+        if job in _pending:
+            return
+        _pending.add(job)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name='matching-queue', daemon=True)
+            _worker.start()
+    _queue.put(job)
+
+
+def _work():
+    while True:
+        job = _queue.get()
+        with _lock:
+            _pending.discard(job)
+        try:
+            close_old_connections()
+            run_job(job)
+        finally:
+            close_old_connections()
+            _queue.task_done()
+
+
+def run_job(job):
+    """Exécute une tâche de recalcul (les erreurs sont journalisées)"""
+    from .matching_engine import rescore_consultant, rescore_offer
+
+    kind, object_id = job
+    try:
+        if kind == CONSULTANT:
+            return rescore_consultant(object_id)
+        if kind == OFFER:
+            return rescore_offer(object_id)
+        logger.warning(f"Tâche de matching inconnue: {job}")
+    except Exception as e:
+        logger.error(f"Erreur lors du recalcul incrémental {kind} {object_id}: {str(e)}")
+    return 0
+
+
+def pending_jobs():
+    """Nombre de tâches en attente dans ce processus"""
+    return _queue.unfinished_tasks
+
+
+def wait_until_idle():
+    """Bloque jusqu'au traitement de toutes les tâches en attente (scripts, commandes)"""
+    _queue.join()
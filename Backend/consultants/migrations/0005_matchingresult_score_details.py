@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0004_alter_mission_options_alter_notification_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingresult',
+            name='date_score',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='matchingresult',
+            name='skills_score',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='matchingresult',
+            name='top_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0005_matchingresult_score_details'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppelOffreAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domaine', models.CharField(max_length=20)),
+                ('confiance', models.IntegerField(default=0, help_text='Score de détection du domaine')),
+                ('competences', models.JSONField(blank=True, default=list, help_text='Compétences extraites de la description')),
+                ('criteres', models.JSONField(blank=True, default=list, help_text='Critères [nom en minuscules, poids]')),
+                ('has_description', models.BooleanField(default=False)),
+                ('empreinte', models.CharField(help_text='Empreinte de la description et des critères analysés', max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('appel_offre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analysis', to='consultants.appeloffre')),
+            ],
+            options={
+                'verbose_name': "Analyse d'appel d'offre",
+                'verbose_name_plural': "Analyses d'appels d'offres",
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0006_appeloffreanalysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVExtractionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fichier', models.CharField(help_text='Chemin du CV à analyser', max_length=500)),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TERMINE', 'Terminé'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=20)),
+                ('tentatives', models.IntegerField(default=0)),
+                ('resultat', models.JSONField(blank=True, default=dict, help_text='Compétences ajoutées, domaine détecté, durée')),
+                ('erreur', models.TextField(blank=True, default='')),
+                ('worker', models.CharField(blank=True, default='', help_text='Worker ayant pris la tâche (hôte:pid)', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('consultant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cv_jobs', to='consultants.consultant')),
+            ],
+            options={
+                'verbose_name': 'Extraction de CV',
+                'verbose_name_plural': 'Extractions de CV',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['statut', 'created_at'], name='consultants_statut_4d7bcb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0007_cvextractionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVExtractionCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('empreinte', models.CharField(help_text='SHA-256 du contenu du fichier', max_length=64, unique=True)),
+                ('texte', models.TextField(blank=True, default='')),
+                ('ocr', models.BooleanField(default=False, help_text='Texte obtenu par OCR')),
+                ('domaine', models.CharField(blank=True, default='', max_length=20)),
+                ('competences', models.JSONField(blank=True, default=list)),
+                ('extracteur', models.CharField(help_text="Version de l'extraction des compétences (référentiel)", max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': "Cache d'extraction de CV",
+                'verbose_name_plural': 'Cache des extractions de CV',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0008_cvextractioncache'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultant',
+            index=models.Index(fields=['is_validated', 'created_at', 'id'], name='consultant_validated_keyset'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:37
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_validation_counters(apps, schema_editor):
+    """Compteurs initialisés à partir des matchings déjà validés"""
+    MatchingResult = apps.get_model('consultants', 'MatchingResult')
+    MatchingValidationStat = apps.get_model('consultants', 'MatchingValidationStat')
+    validated = MatchingResult.objects.filter(is_validated=True).order_by()
+    counters = []
+    for axe, field in (('domaine', 'consultant__domaine_principal'), ('expertise', 'consultant__expertise')):
+        for row in validated.values(field).annotate(valides=Count('id'), somme_scores=Sum('score')):
+            counters.append(MatchingValidationStat(
+                axe=axe, valeur=row[field] or '', valides=row['valides'], somme_scores=row['somme_scores'] or 0
+            ))
+    MatchingValidationStat.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0009_consultant_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingValidationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('axe', models.CharField(choices=[('domaine', 'Domaine principal'), ('expertise', "Niveau d'expertise")], max_length=20)),
+                ('valeur', models.CharField(max_length=50)),
+                ('valides', models.IntegerField(default=0, help_text='Matchings validés')),
+                ('somme_scores', models.DecimalField(decimal_places=2, default=0, help_text='Somme des scores des matchings validés (moyenne = somme / valides)', max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistique de validation du matching',
+                'verbose_name_plural': 'Statistiques de validation du matching',
+                'unique_together': {('axe', 'valeur')},
+            },
+        ),
+        migrations.RunPython(build_validation_counters, migrations.RunPython.noop),
+    ]
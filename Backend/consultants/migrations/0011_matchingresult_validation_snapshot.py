@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:10
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+
+
+def snapshot_validated_matchings(apps, schema_editor):
+    """
+    Valeurs de validation des matchings déjà validés reprises de l'état
+    actuel, puis compteurs recalculés à partir de ces valeurs
+    """
+    MatchingResult = apps.get_model('consultants', 'MatchingResult')
+    MatchingValidationStat = apps.get_model('consultants', 'MatchingValidationStat')
+    Consultant = apps.get_model('consultants', 'Consultant')
+
+    validated = MatchingResult.objects.filter(is_validated=True)
+    consultant = Consultant.objects.filter(pk=OuterRef('consultant_id'))
+    validated.update(
+        validation_score=F('score'),
+        validation_domaine=Subquery(consultant.values('domaine_principal')[:1]),
+        validation_expertise=Subquery(consultant.values('expertise')[:1])
+    )
+
+    counters = []
+    for axe, field in (('domaine', 'validation_domaine'), ('expertise', 'validation_expertise')):
+        for row in validated.order_by().values(field).annotate(valides=Count('id'), somme_scores=Sum('validation_score')):
+            counters.append(MatchingValidationStat(
+                axe=axe, valeur=row[field], valides=row['valides'], somme_scores=row['somme_scores'] or 0
+            ))
+    MatchingValidationStat.objects.all().delete()
+    MatchingValidationStat.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultants', '0010_matchingvalidationstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingresult',
+            name='validation_domaine',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='matchingresult',
+            name='validation_expertise',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='matchingresult',
+            name='validation_score',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.RunPython(snapshot_validated_matchings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# model_registry.py - Chargement paresseux des dépendances lourdes (NLP, OCR, PDF)
+
+"""
+spaCy, scikit-learn, PyMuPDF et Tesseract coûtent plusieurs secondes et
+des centaines de Mo à l'import: ils ne sont plus importés au chargement
+des vues mais au premier usage, une seule fois par processus.
+
+- get_module('fitz'): module importé à la demande
+- get_spacy_model('fr_core_news_md'): modèle chargé une fois, partagé;
+  None si spaCy ou le modèle est indisponible (l'échec est mémorisé)
+- load_timings(): durée de chargement de chaque dépendance chargée
+"""
+
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_loaded = {}
+_timings = {}
+_errors = {}
+_lock = threading.RLock()
+
+
+def _load(key, loader):
+    """Charge une dépendance une seule fois (les processus concurrents attendent le premier chargement)"""
+    if key in _loaded:
+        return _loaded[key]
+    with _lock:
+        if key in _loaded:
+            return _loaded[key]
+        started = time.monotonic()
+        try:
+            value = loader()
+        except Exception as e:
+            value = None
+            _errors[key] = str(e)
+            logger.error(f"Chargement impossible de {key}: {str(e)}")
+        _timings[key] = time.monotonic() - started
+        _loaded[key] = value
+        if value is not None:
+            logger.info(f"{key} chargé en {_timings[key]:.2f}s")
+        return value
+
+
+def get_module(name):
+    """Module importé au premier appel (None s'il n'est pas installé)"""
+    return _load(f"module:{name}", lambda: importlib.import_module(name))
+
+
+def get_spacy_model(name):
+    """Modèle spaCy partagé par le processus, None si indisponible"""
+    def load():
+        spacy = get_module('spacy')
+        if spacy is None:
+            raise ImportError("spaCy non installé")
+        return spacy.load(name)
+
+    return _load(f"spacy:{name}", load)
+
+
+def is_loaded(key):
+    return _loaded.get(key) is not None
+
+
+def load_timings():
+    """{dépendance: {'seconds', 'loaded', 'error'}} pour les dépendances déjà demandées"""
+    with _lock:
+        return {
+            key: {
+                'seconds': round(seconds, 3),
+                'loaded': _loaded.get(key) is not None,
+                'error': _errors.get(key),
+            }
+            for key, seconds in _timings.items()
+        }
@@ -118,6 +118,8 @@ class Consultant(models.Model):
             models.Index(fields=['is_validated']),
             models.Index(fields=['domaine_principal']),
             models.Index(fields=['expertise']),
+            # Pagination par curseur de la liste admin (validés, plus récents d'abord)
+            models.Index(fields=['is_validated', 'created_at', 'id'], name='consultant_validated_keyset'),
         ]
 
     def __str__(self):
@@ -515,6 +517,19 @@ class MatchingResult(models.Model):
     is_validated = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Détail du score et compétences principales, figés à la génération
+    # pour servir la lecture sans recalcul (voir reconcile_matching)
+    date_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    skills_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    top_skills = models.JSONField(default=list, blank=True)
+
+    # Domaine, expertise du consultant et score figés à la validation: les
+    # compteurs MatchingValidationStat restent exacts si le matching est
+    # recalculé ou le consultant modifié (voir matching_analytics.py)
+    validation_domaine = models.CharField(max_length=20, blank=True, default='')
+    validation_expertise = models.CharField(max_length=20, blank=True, default='')
+    validation_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+
     class Meta:
         unique_together = ('appel_offre', 'consultant')
         ordering = ['-score']
@@ -836,6 +851,114 @@ class CriteresEvaluation(models.Model):
         return f"{self.nom_critere} ({self.poids}%)"
 
 
+class AppelOffreAnalysis(models.Model):
+    """
+    Analyse d'un appel d'offre utilisée par le scoring (domaine détecté,
+    compétences extraites, critères normalisés), calculée une fois à
+    l'import ou à la modification de l'appel d'offre
+    """
+    appel_offre = models.OneToOneField(AppelOffre, on_delete=models.CASCADE, related_name="analysis")
+    domaine = models.CharField(max_length=20)
+    confiance = models.IntegerField(default=0, help_text="Score de détection du domaine")
+    competences = models.JSONField(default=list, blank=True, help_text="Compétences extraites de la description")
+    criteres = models.JSONField(default=list, blank=True, help_text="Critères [nom en minuscules, poids]")
+    has_description = models.BooleanField(default=False)
+    empreinte = models.CharField(max_length=64, help_text="Empreinte de la description et des critères analysés")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Analyse d'appel d'offre"
+        verbose_name_plural = "Analyses d'appels d'offres"
+
+    def __str__(self):
+        return f"Analyse AO {self.appel_offre_id} ({self.domaine})"
+
+
+class CVExtractionJob(models.Model):
+    """
+    Extraction des compétences d'un CV, exécutée hors requête HTTP par les
+    workers (commande run_cv_jobs)
+    """
+    STATUT_CHOICES = [
+        ('EN_ATTENTE', 'En attente'),
+        ('EN_COURS', 'En cours'),
+        ('TERMINE', 'Terminé'),
+        ('ECHEC', 'Échec'),
+    ]
+
+    consultant = models.ForeignKey(Consultant, on_delete=models.CASCADE, related_name="cv_jobs")
+    fichier = models.CharField(max_length=500, help_text="Chemin du CV à analyser")
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='EN_ATTENTE')
+    tentatives = models.IntegerField(default=0)
+    resultat = models.JSONField(default=dict, blank=True, help_text="Compétences ajoutées, domaine détecté, durée")
+    erreur = models.TextField(blank=True, default='')
+    worker = models.CharField(max_length=100, blank=True, default='', help_text="Worker ayant pris la tâche (hôte:pid)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Extraction de CV"
+        verbose_name_plural = "Extractions de CV"
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['statut', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Extraction CV {self.consultant_id} ({self.statut})"
+
+
+class CVExtractionCache(models.Model):
+    """
+    Texte et compétences extraits d'un fichier CV, indexés par l'empreinte
+    SHA-256 de son contenu: un CV inchangé n'est ni rouvert ni repassé à l'OCR
+    """
+    empreinte = models.CharField(max_length=64, unique=True, help_text="SHA-256 du contenu du fichier")
+    texte = models.TextField(blank=True, default='')
+    ocr = models.BooleanField(default=False, help_text="Texte obtenu par OCR")
+    domaine = models.CharField(max_length=20, blank=True, default='')
+    competences = models.JSONField(default=list, blank=True)
+    extracteur = models.CharField(max_length=64, help_text="Version de l'extraction des compétences (référentiel)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cache d'extraction de CV"
+        verbose_name_plural = "Cache des extractions de CV"
+
+    def __str__(self):
+        return f"CV {self.empreinte[:12]} ({len(self.competences)} compétences)"
+
+
+class MatchingValidationStat(models.Model):
+    """
+    Compteur de matchings validés par domaine ou niveau d'expertise du
+    consultant, tenu à jour à chaque validation (voir matching_analytics.py)
+    """
+    AXE_CHOICES = [
+        ('domaine', 'Domaine principal'),
+        ('expertise', "Niveau d'expertise"),
+    ]
+
+    axe = models.CharField(max_length=20, choices=AXE_CHOICES)
+    valeur = models.CharField(max_length=50)
+    valides = models.IntegerField(default=0, help_text="Matchings validés")
+    somme_scores = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0,
+        help_text="Somme des scores des matchings validés (moyenne = somme / valides)"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Statistique de validation du matching"
+        verbose_name_plural = "Statistiques de validation du matching"
+        unique_together = ('axe', 'valeur')
+
+    def __str__(self):
+        return f"{self.axe} {self.valeur}: {self.valides} validés"
+
+
 class Projet(models.Model):
     """Modèle pour les projets"""
     nom = models.CharField(max_length=191)
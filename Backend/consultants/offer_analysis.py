@@ -0,0 +1,140 @@
+# offer_analysis.py - Analyse des appels d'offres partagée par le scoring
+
+"""
+Le domaine détecté, les compétences extraites de la description et les
+critères d'évaluation sont identiques pour tous les consultants scorés
+contre un même appel d'offre. Ils sont calculés une fois, enregistrés dans
+AppelOffreAnalysis et mis en cache (alias 'scores').
+
+L'empreinte (hash de la description + hash des critères enregistrés) ne
+dépend que de l'état en base: une analyse périmée est détectée par tous
+les workers, quel que soit le cache. Empreinte et analyse sont calculées
+à partir de la même lecture des critères.
+"""
+
+import hashlib
+import logging
+
+from .models import AppelOffreAnalysis, CriteresEvaluation
+from .score_cache import get_score_cache, get_score_timeout
+from .skill_index import analyze_description
+
+logger = logging.getLogger(__name__)
+
+
+class OfferAnalysis:
+    """
+    Analyse d'un appel d'offre:
+    - domain: (domaine, score de détection)
+    - mentioned_skills: compétences et termes métier de la description (triés)
+    - criteria: [(nom du critère en minuscules, poids)]
+    """
+
+    def __init__(self, domain, confidence, skills, criteria, has_description):
+        self.domain = (domain, confidence)
+        self.mentioned_skills = list(skills)
+        self.criteria = [(nom_critere, float(poids)) for nom_critere, poids in criteria]
+        self.has_description = has_description
+
+    @property
+    def total_weight(self):
+        return float(sum(poids for _, poids in self.criteria))
+
+    @classmethod
+    def from_offer(cls, appel_offre, criteria):
+        """Calcul sans accès base (critères fournis: [(nom_critere, poids)])"""
+        description_analysis = analyze_description(appel_offre.description)
+        domain, confidence = description_analysis.domain
+        return cls(
+            domain, confidence,
+            sorted(description_analysis.mentioned_skills),
+            sorted((nom_critere.lower(), float(poids)) for nom_critere, poids in criteria),
+            bool(appel_offre.description)
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row.domaine, row.confiance, row.competences, row.criteres, row.has_description)
+
+    def to_row_fields(self):
+        domain, confidence = self.domain
+        return {
+            'domaine': domain,
+            'confiance': confidence,
+            'competences': self.mentioned_skills,
+            'criteres': [[nom_critere, poids] for nom_critere, poids in self.criteria],
+            'has_description': self.has_description,
+        }
+
+
+def _read_criteria(appel_offre_id):
+    return list(CriteresEvaluation.objects.filter(appel_offre_id=appel_offre_id).values_list('nom_critere', 'poids'))
+
+
+def offer_fingerprint(appel_offre, criteria=None):
+    """
+    Empreinte de la description et des critères (criteria: [(nom_critere, poids)],
+    lus en base si absents)
+    """
+    if criteria is None:
+        criteria = _read_criteria(appel_offre.id)
+    description_hash = hashlib.md5((appel_offre.description or '').encode('utf-8')).hexdigest()[:16]
+    normalized = sorted((nom_critere.lower(), str(poids)) for nom_critere, poids in criteria)
+    criteria_hash = hashlib.md5(repr(normalized).encode('utf-8')).hexdigest()[:12] if normalized else 'none'
+    return f"{description_hash}:{criteria_hash}"
+
+
+def _cache_key(appel_offre_id, fingerprint):
+    return f"offer_analysis:{appel_offre_id}:{fingerprint}"
+
+
+def refresh_offer_analysis(appel_offre, criteria=None):
+    """
+    Recalcule et enregistre l'analyse (import ou modification de l'appel d'offre)
+    """
+    if criteria is None:
+        criteria = _read_criteria(appel_offre.id)
+    fingerprint = offer_fingerprint(appel_offre, criteria)
+    analysis = OfferAnalysis.from_offer(appel_offre, criteria)
+
+    AppelOffreAnalysis.objects.update_or_create(
+        appel_offre_id=appel_offre.id,
+        defaults=dict(analysis.to_row_fields(), empreinte=fingerprint)
+    )
+    try:
+        get_score_cache().set(_cache_key(appel_offre.id, fingerprint), analysis, get_score_timeout())
+    except Exception as e:
+        logger.warning(f"Impossible de mettre en cache l'analyse de l'AO {appel_offre.id}: {str(e)}")
+
+    logger.info(
+        f"Analyse de l'AO {appel_offre.id}: domaine {analysis.domain[0]}, "
+        f"{len(analysis.mentioned_skills)} compétences, {len(analysis.criteria)} critères"
+    )
+    return analysis
+
+
+def get_offer_analysis(appel_offre):
+    """
+    Analyse à jour d'un appel d'offre: cache, puis base, puis recalcul
+    """
+    criteria = _read_criteria(appel_offre.id)
+    fingerprint = offer_fingerprint(appel_offre, criteria)
+    key = _cache_key(appel_offre.id, fingerprint)
+    try:
+        analysis = get_score_cache().get(key)
+    except Exception as e:
+        logger.warning(f"Cache des analyses indisponible: {str(e)}")
+        analysis = None
+    if analysis is not None:
+        return analysis
+
+    row = AppelOffreAnalysis.objects.filter(appel_offre_id=appel_offre.id, empreinte=fingerprint).first()
+    if row is None:
+        return refresh_offer_analysis(appel_offre, criteria)
+
+    analysis = OfferAnalysis.from_row(row)
+    try:
+        get_score_cache().set(key, analysis, get_score_timeout())
+    except Exception as e:
+        logger.warning(f"Impossible de mettre en cache l'analyse de l'AO {appel_offre.id}: {str(e)}")
+    return analysis
@@ -0,0 +1,53 @@
+# schema_registry.py - Colonnes existantes des tables, lues une fois par processus
+
+"""
+Les vues « sécurisées » vérifient quelles colonnes de consultants_consultant
+existent (base pas toujours migrée). La structure est lue une fois par
+table et par processus (introspection Django, compatible MySQL/SQLite),
+puis has_field répond sans requête. Le cache est vidé après chaque
+migrate (signal post_migrate, voir signals.py).
+"""
+
+import logging
+import threading
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_columns = {}
+_lock = threading.Lock()
+
+
+def _table_name(table):
+    return table if isinstance(table, str) else table._meta.db_table
+
+
+def get_table_columns(table):
+    """Noms des colonnes d'une table (ou d'un modèle), frozenset vide si illisible"""
+    table_name = _table_name(table)
+    columns = _columns.get(table_name)
+    if columns is not None:
+        return columns
+    with _lock:
+        columns = _columns.get(table_name)
+        if columns is None:
+            try:
+                with connection.cursor() as cursor:
+                    description = connection.introspection.get_table_description(cursor, table_name)
+                columns = frozenset(column.name for column in description)
+            except Exception as e:
+                # Non mis en cache: nouvelle tentative à la prochaine demande
+                logger.error(f"Erreur lors de la lecture de la structure de {table_name}: {e}")
+                return frozenset()
+            _columns[table_name] = columns
+        return columns
+
+
+def has_field(table, field_name):
+    return field_name in get_table_columns(table)
+
+
+def invalidate_schema_cache():
+    with _lock:
+        _columns.clear()
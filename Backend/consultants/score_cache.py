@@ -0,0 +1,38 @@
+# score_cache.py - Cache partagé des données dérivées du matching
+
+"""
+Cache adossé au framework de cache Django (alias 'scores', partagé entre
+workers avec Redis, LRU + TTL en local), utilisé pour les analyses
+d'appels d'offres (voir offer_analysis.py).
+
+Les scores eux-mêmes sont enregistrés dans MatchingResult par le moteur
+vectorisé (matching_engine.py) et ne sont plus mis en cache ici.
+
+Aucune invalidation ne repose sur un état propre au processus: les clés
+embarquent une empreinte dérivée de la base, valable pour tous les
+workers même avec le cache mémoire local.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_ALIAS = 'scores'
+
+
+def get_score_cache():
+    """Cache dédié (repli sur le cache par défaut s'il n'est pas configuré)"""
+    alias = SCORE_CACHE_ALIAS if SCORE_CACHE_ALIAS in settings.CACHES else 'default'
+    return caches[alias]
+
+
+def get_score_timeout():
+    return getattr(settings, 'SCORE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def clear_scores():
+    """Vidage complet (maintenance uniquement, les clés versionnées s'invalident seules)"""
+    get_score_cache().clear()
@@ -0,0 +1,151 @@
+# signals.py - Invalidation des données dérivées du matching
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .dashboard_stats import invalidate_stats
+from .matching_engine import invalidate_shared_engine
+from .matching_queue import enqueue_consultant, enqueue_offer
+from .models import AppelOffre, Consultant, Competence, CriteresEvaluation
+from .offer_analysis import refresh_offer_analysis
+from .schema_registry import invalidate_schema_cache
+from .skill_suggest import register_skill_name
+
+logger = logging.getLogger(__name__)
+
+# Champs dont dépend le score de matching
+CONSULTANT_MATCHING_FIELDS = (
+    'date_debut_dispo', 'date_fin_dispo', 'expertise', 'domaine_principal', 'is_validated', 'statut'
+)
+OFFER_MATCHING_FIELDS = ('description', 'date_limite')
+
+
+def _snapshot(sender, instance, fields, update_fields):
+    """
+    Valeurs en base des champs suivis avant la sauvegarde
+    (None à la création ou si aucun champ suivi n'est sauvegardé)
+    """
+    if instance.pk is None:
+        return None
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return None
+    return sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+def _has_changed(instance, fields):
+    previous = getattr(instance, '_matching_snapshot', None)
+    if previous is None:
+        return False
+    return any(previous[field] != getattr(instance, field) for field in fields)
+
+
+@receiver(post_save, sender=Competence)
+@receiver(post_delete, sender=Competence)
+def touch_consultant_on_competence_change(sender, instance, **kwargs):
+    """
+    Les compétences font partie du score: on avance updated_at du consultant
+    (sans passer par Consultant.save) pour invalider ses scores en cache.
+    """
+    try:
+        Consultant.objects.filter(pk=instance.consultant_id).update(updated_at=timezone.now())
+    except Exception as e:
+        logger.warning(f"Impossible de mettre à jour le consultant {instance.consultant_id}: {str(e)}")
+    enqueue_consultant(instance.consultant_id)
+
+
+@receiver(post_save, sender=Competence)
+def register_competence_suggestion(sender, instance, created=False, raw=False, **kwargs):
+    """Une compétence saisie devient proposée par l'autocomplétion sans attendre la reconstruction"""
+    if created and not raw:
+        register_skill_name(instance.nom_competence)
+
+
+@receiver(post_save, sender=CriteresEvaluation)
+@receiver(post_delete, sender=CriteresEvaluation)
+def refresh_offer_on_criteria_change(sender, instance, **kwargs):
+    """Critères modifiés: nouvelle analyse et recalcul de la colonne de matching"""
+    _schedule_analysis(instance.appel_offre_id)
+    enqueue_offer(instance.appel_offre_id)
+
+
+def _schedule_analysis(appel_offre_id):
+    """Analyse de l'appel d'offre recalculée après le commit"""
+    def refresh():
+        try:
+            appel_offre = AppelOffre.objects.filter(pk=appel_offre_id).only('id', 'description').first()
+            if appel_offre is not None:
+                refresh_offer_analysis(appel_offre)
+        except Exception as e:
+            logger.warning(f"Impossible d'analyser l'appel d'offre {appel_offre_id}: {str(e)}")
+
+    transaction.on_commit(refresh)
+
+
+@receiver(pre_save, sender=Consultant)
+def snapshot_consultant(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        instance._matching_snapshot = _snapshot(sender, instance, CONSULTANT_MATCHING_FIELDS, update_fields)
+
+
+@receiver(post_save, sender=Consultant)
+def rematch_consultant_on_change(sender, instance, created=False, raw=False, **kwargs):
+    """Disponibilités, expertise, domaine ou statut modifiés: recalcul de sa ligne"""
+    if raw or created:
+        return
+    if _has_changed(instance, CONSULTANT_MATCHING_FIELDS):
+        enqueue_consultant(instance.pk)
+
+
+@receiver(pre_save, sender=AppelOffre)
+def snapshot_offer(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        instance._matching_snapshot = _snapshot(sender, instance, OFFER_MATCHING_FIELDS, update_fields)
+
+
+@receiver(post_save, sender=AppelOffre)
+def rematch_offer_on_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Import ou description modifiée: nouvelle analyse de l'appel d'offre.
+    Description ou date limite modifiée: recalcul de sa colonne de matching.
+    """
+    if raw:
+        return
+    if created or _has_changed(instance, ('description',)):
+        _schedule_analysis(instance.pk)
+    if not created and _has_changed(instance, OFFER_MATCHING_FIELDS):
+        enqueue_offer(instance.pk)
+
+
+@receiver(post_save, sender=Consultant)
+@receiver(post_delete, sender=Consultant)
+@receiver(post_save, sender=Competence)
+@receiver(post_delete, sender=Competence)
+def reset_shared_engine(sender, raw=False, **kwargs):
+    """
+    Vivier modifié: moteur partagé rechargé à la prochaine lecture dans ce
+    processus (les autres le détectent par pool_version)
+    """
+    if not raw:
+        transaction.on_commit(invalidate_shared_engine)
+
+
+@receiver(post_save, sender=Consultant)
+@receiver(post_delete, sender=Consultant)
+@receiver(post_save, sender=AppelOffre)
+@receiver(post_delete, sender=AppelOffre)
+@receiver(post_save, sender=CriteresEvaluation)
+@receiver(post_delete, sender=CriteresEvaluation)
+def invalidate_dashboard_stats(sender, raw=False, **kwargs):
+    """Statistiques du tableau de bord recalculées à la prochaine demande (après le commit)"""
+    if not raw:
+        transaction.on_commit(invalidate_stats)
+
+
+@receiver(post_migrate)
+def reset_schema_cache_after_migrate(sender, **kwargs):
+    """La structure des tables a pu changer: relecture à la prochaine demande"""
+    invalidate_schema_cache()
@@ -0,0 +1,301 @@
+# skill_catalog.py - Référentiel de compétences compilé (tables de correspondance)
+
+"""
+Compilation unique de competences_data: noms normalisés, domaine et
+catégorie de chaque compétence, variantes d'écriture et index de préfixes
+(trie compact trié) pour l'autocomplétion.
+
+La catégorie est la rubrique (`# === ... ===`) sous laquelle la compétence
+est déclarée dans competences_data.py.
+
+Le catalogue compilé peut être sérialisé (pickle) vers
+settings.SKILL_CATALOG_PATH: les workers le rechargent au démarrage sans
+refaire la normalisation, tant que l'empreinte du référentiel est inchangée.
+"""
+
+import ast
+import hashlib
+import inspect
+import io
+import logging
+import os
+import pickle
+import re
+import tokenize
+from bisect import bisect_left
+from functools import lru_cache
+
+from django.conf import settings
+
+from . import competences_data
+from .competences_data import ALL_SKILLS
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT_VERSION = 2
+
+_SECTION_RE = re.compile(r'^#\s*===\s*(.+?)\s*===\s*$')
+
+
+def normalize_skill_name(name):
+    return name.lower().strip()
+
+
+def skill_variants(skill_lower):
+    """Variantes d'écriture d'une compétence (espaces, tirets, points...), ordre conservé"""
+    return (
+        skill_lower.replace(' ', ''),
+        skill_lower.replace(' ', '-'),
+        skill_lower.replace(' ', '.'),
+        skill_lower.replace('-', ' '),
+        skill_lower.replace('.', ' '),
+        skill_lower.replace('_', ' '),
+        skill_lower.replace('/', ' ')
+    )
+
+
+def catalog_fingerprint():
+    """Empreinte du référentiel source (invalide un artefact sérialisé périmé)"""
+    source = repr((CATALOG_FORMAT_VERSION, [(domain, list(skills)) for domain, skills in ALL_SKILLS.items()]))
+    return hashlib.md5(source.encode('utf-8')).hexdigest()
+
+
+def _source_categories():
+    """
+    {(nom de liste, compétence): rubrique} lu dans les commentaires de
+    competences_data.py ({} si le source n'est pas disponible)
+    """
+    try:
+        source = inspect.getsource(competences_data)
+    except (OSError, TypeError):
+        return {}
+
+    categories = {}
+    current_list = None
+    current_section = None
+    previous = []
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == tokenize.COMMENT:
+            match = _SECTION_RE.match(token.string)
+            if match:
+                current_section = match.group(1)
+        elif token.type == tokenize.OP and token.string == '[' and len(previous) >= 2 \
+                and previous[-1].string == '=' and previous[-2].type == tokenize.NAME and previous[-2].start[1] == 0:
+            current_list = previous[-2].string
+            current_section = None
+        elif token.type == tokenize.OP and token.string == ']' and token.start[1] == 0:
+            current_list = None
+        elif token.type == tokenize.STRING and current_list:
+            categories.setdefault((current_list, ast.literal_eval(token.string)), current_section)
+
+        if token.type not in (tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT):
+            previous = previous[-1:] + [token]
+    return categories
+
+
+_WORD_SEPARATOR_RE = re.compile(r'[\s\-_/.(]+')
+
+
+class PrefixIndex:
+    """
+    Trie compact sous forme de tableau trié: chaque nom normalisé est indexé
+    à partir du début et de chaque mot interne; les clés commençant par un
+    préfixe forment une plage contiguë (deux bisect).
+
+    Les positions renvoyées sont celles des noms dans la liste d'origine.
+    """
+
+    def __init__(self, names=()):
+        keys = []
+        for position, name in enumerate(names):
+            keys.extend((key, position) for key in self._keys(name))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.key_positions = [position for _, position in keys]
+
+    @staticmethod
+    def _keys(name):
+        starts = [0] + [match.end() for match in _WORD_SEPARATOR_RE.finditer(name) if match.end() < len(name)]
+        return [name[start:] for start in starts]
+
+    def add(self, name, position):
+        """Ajout incrémental d'un nom"""
+        for key in self._keys(name):
+            index = bisect_left(self.keys, key)
+            self.keys.insert(index, key)
+            self.key_positions.insert(index, position)
+
+    def positions(self, prefix):
+        """Positions (sans doublon) des noms dont un début de mot commence par le préfixe"""
+        low = bisect_left(self.keys, prefix)
+        high = bisect_left(self.keys, prefix + '\uffff', low)
+        return set(self.key_positions[low:high])
+
+
+class SuffixIndex(PrefixIndex):
+    """
+    PrefixIndex construit sur tous les suffixes de chaque nom: les noms
+    contenant une sous-chaîne sont ceux dont un suffixe commence par elle
+    """
+
+    @staticmethod
+    def _keys(name):
+        return [name[start:] for start in range(len(name))]
+
+
+class SkillEntry:
+    __slots__ = ('name', 'normalized', 'domain', 'category', 'variants')
+
+    def __init__(self, name, normalized, domain, category):
+        self.name = name
+        self.normalized = normalized
+        self.domain = domain
+        self.category = category
+        self.variants = skill_variants(normalized)
+
+    def to_dict(self):
+        return {'skill': self.name, 'domain': self.domain, 'category': self.category}
+
+
+class SkillCatalog:
+    """
+    Référentiel compilé:
+    - entries: toutes les compétences dans l'ordre de ALL_SKILLS
+    - by_name: nom normalisé -> première SkillEntry (nom canonique, domaine, catégorie)
+    - by_domain: domaine -> indices des entrées
+    - variants: variante d'écriture -> noms normalisés
+    - prefix_index: nom complet et début de chaque mot, pour l'autocomplétion
+    """
+
+    def __init__(self, all_skills, categories=None):
+        categories = categories or {}
+        list_names = {
+            id(value): name for name, value in vars(competences_data).items()
+            if isinstance(value, list) and name.isupper()
+        }
+
+        self.fingerprint = catalog_fingerprint()
+        self.entries = []
+        self.by_name = {}
+        self.by_domain = {}
+        self.duplicates = []
+        self.variants = {}
+
+        for domain, skills_list in all_skills.items():
+            list_name = list_names.get(id(skills_list))
+            positions = self.by_domain.setdefault(domain, [])
+            for skill in skills_list:
+                normalized = normalize_skill_name(skill)
+                entry = SkillEntry(skill, normalized, domain, categories.get((list_name, skill)))
+                position = len(self.entries)
+                self.entries.append(entry)
+                positions.append(position)
+
+                if normalized in self.by_name:
+                    self.duplicates.append(skill)
+                else:
+                    self.by_name[normalized] = entry
+                    for variant in entry.variants:
+                        if variant != normalized:
+                            self.variants.setdefault(variant, []).append(normalized)
+        self.prefix_index = PrefixIndex(entry.normalized for entry in self.entries)
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def lookup(self, name):
+        """SkillEntry d'un nom (ou d'une variante d'écriture), None si inconnu"""
+        normalized = normalize_skill_name(name)
+        entry = self.by_name.get(normalized)
+        if entry is None and normalized in self.variants:
+            entry = self.by_name[self.variants[normalized][0]]
+        return entry
+
+    def domain_entries(self, domain=None):
+        if domain is None:
+            return self.entries
+        return [self.entries[position] for position in self.by_domain.get(domain.upper(), [])]
+
+    def search(self, query, domain=None):
+        """Compétences dont le nom contient la requête (noms déjà normalisés)"""
+        query_lower = query.lower()
+        return [entry for entry in self.domain_entries(domain) if query_lower in entry.normalized]
+
+    def autocomplete(self, prefix, domain=None, limit=20):
+        """
+        Compétences dont le nom ou un mot du nom commence par le préfixe:
+        noms complets d'abord, puis débuts de mots, ordre du référentiel
+        """
+        prefix = normalize_skill_name(prefix)
+        if not prefix:
+            return []
+        domain = domain.upper() if domain else None
+
+        full_name, inner_word = [], []
+        seen = set()
+        for position in sorted(self.prefix_index.positions(prefix)):
+            entry = self.entries[position]
+            if entry.normalized in seen or (domain and entry.domain != domain):
+                continue
+            seen.add(entry.normalized)
+            (full_name if entry.normalized.startswith(prefix) else inner_word).append(entry)
+        return (full_name + inner_word)[:limit]
+
+    # ------------------------------------------------------------------
+    # Sérialisation
+    # ------------------------------------------------------------------
+
+    def dump(self, path):
+        directory = os.path.dirname(str(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as artifact:
+            pickle.dump(self, artifact, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Catalogue sérialisé, None s'il est absent, illisible ou périmé"""
+        try:
+            with open(path, 'rb') as artifact:
+                catalog = pickle.load(artifact)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Catalogue de compétences illisible ({path}): {str(e)}")
+            return None
+        if not isinstance(catalog, cls) or catalog.fingerprint != catalog_fingerprint():
+            logger.info(f"Catalogue de compétences périmé, recompilation: {path}")
+            return None
+        return catalog
+
+
+def compile_skill_catalog():
+    return SkillCatalog(ALL_SKILLS, _source_categories())
+
+
+@lru_cache(maxsize=None)
+def get_skill_catalog():
+    """
+    Catalogue partagé du processus: artefact sérialisé s'il est à jour,
+    sinon compilation (puis écriture de l'artefact si un chemin est configuré)
+    """
+    path = getattr(settings, 'SKILL_CATALOG_PATH', None)
+    if path:
+        catalog = SkillCatalog.load(path)
+        if catalog is not None:
+            return catalog
+
+    catalog = compile_skill_catalog()
+    logger.info(
+        f"Catalogue de compétences compilé: {len(catalog.entries)} compétences, "
+        f"{len(catalog.by_name)} noms distincts"
+    )
+    if path:
+        try:
+            catalog.dump(path)
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire le catalogue de compétences ({path}): {str(e)}")
+    return catalog
@@ -0,0 +1,341 @@
+# skill_index.py - Index inversé des compétences (automate Aho-Corasick)
+
+"""
+Recherche multi-motifs des compétences du référentiel (catalogue compilé,
+voir skill_catalog).
+
+L'automate est construit une seule fois par processus; un seul parcours
+linéaire du texte renvoie toutes les occurrences (y compris imbriquées),
+ce qui équivaut exactement aux anciens tests `skill in texte` répétés
+pour chaque compétence du référentiel.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import lru_cache
+
+from .skill_catalog import get_skill_catalog
+
+logger = logging.getLogger(__name__)
+
+# Mots-clés généraux par domaine (poids 2 dans la détection du domaine)
+DOMAIN_KEYWORDS = {
+    'DIGITAL': ['digital', 'numérique', 'informatique', 'web', 'mobile', 'logiciel', 'application', 'système', 'technologie', 'développement'],
+    'FINANCE': ['finance', 'financier', 'banque', 'bancaire', 'comptabilité', 'audit', 'budget', 'investissement', 'crédit'],
+    'ENERGIE': ['énergie', 'énergétique', 'électricité', 'solaire', 'éolien', 'pétrole', 'gaz', 'renouvelable', 'transition'],
+    'INDUSTRIE': ['industrie', 'industriel', 'usine', 'production', 'fabrication', 'manufacture', 'mécanique', 'mines']
+}
+DOMAIN_KEYWORD_WEIGHT = 2
+
+# Termes métier généraux ajoutés aux compétences extraites d'une description
+TECHNICAL_TERMS = [
+    'gestion', 'analyse', 'conseil', 'audit', 'formation', 'expertise',
+    'développement', 'conception', 'mise en œuvre', 'optimisation',
+    'stratégie', 'planification', 'coordination', 'supervision'
+]
+
+# Extraction des compétences d'un CV: mots à ignorer (faux positifs fréquents)
+MOTS_IGNORES = frozenset({
+    # Mots trop courts ou ambigus
+    'ar', 'or', 'ai', 'go', 'r', 'c', 's3', 'ux', 'ui', 'db', 'os', 'it', 'is', 'in', 'on',
+    'at', 'to', 'of', 'as', 'by', 'an', 'be', 'we', 'he', 'me', 'my', 'so', 'up', 'if',
+    # Acronymes Mauritaniens ou contextuels non-techniques
+    'ets', 'eu ets', 'ges', 'gsm', 'cad', 'bp mauritanie', 'or mauritanie', 'bp', 'mr',
+    # Mots français courants
+    'et', 'ou', 'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'dans', 'sur', 'avec',
+    'pour', 'par', 'sans', 'sous', 'vers', 'chez', 'entre', 'depuis', 'pendant',
+    # Prépositions et conjonctions anglaises
+    'and', 'but', 'for', 'nor', 'yet', 'the', 'a', 'an', 'this', 'that', 'these', 'those'
+})
+
+# Compétences techniques valides courtes (exceptions à garder)
+COMPETENCES_COURTES_VALIDES = frozenset({
+    'sql', 'php', 'css', 'xml', 'api', 'aws', 'gcp', 'iot', 'erp', 'crm', 'seo', 'sap',
+    'html', 'java', 'git', 'npm', 'vue', 'tdd', 'bdd', 'mvp', 'agile', 'scrum', 'ci/cd',
+    'rest', 'soap', 'json', 'ajax', 'cors', 'jwt', 'ssl', 'tls', 'ssh', 'ftp', 'http',
+    'tcp', 'udp', 'dns', 'dhcp', 'vpn', 'lan', 'wan', 'cdn', 'orm', 'mvc', 'spa'
+})
+
+# Mots-clés qui indiquent un contexte technique valide autour d'une compétence
+CONTEXT_KEYWORDS = [
+    # Développement et programmation
+    'développement', 'programmation', 'langage', 'framework', 'technologie',
+    'compétence', 'skill', 'experience', 'projet', 'utilisation', 'maîtrise',
+    'connaissance', 'expertise', 'formation', 'certification', 'outils',
+    'logiciel', 'software', 'development', 'programming', 'language',
+    'stack', 'tech', 'tools', 'environment', 'platform', 'api', 'database',
+
+    # Contexte professionnel
+    'projet', 'mission', 'travail', 'emploi', 'poste', 'responsabilité',
+    'réalisation', 'conception', 'développé', 'implémenté', 'utilisé',
+    'géré', 'administré', 'configuré', 'déployé', 'maintenu',
+
+    # Formation et certifications
+    'formation', 'cours', 'apprentissage', 'certification', 'diplôme',
+    'étude', 'université', 'école', 'institut', 'académie', 'bootcamp',
+
+    # Contexte technique spécifique
+    'web', 'mobile', 'cloud', 'data', 'analyse', 'système', 'réseau',
+    'sécurité', 'base', 'données', 'serveur', 'client', 'backend', 'frontend'
+]
+
+# Distance maximale (en caractères, sur la même ligne) entre une compétence et un mot-clé de contexte
+CONTEXT_RADIUS = 100
+
+# Compétences courtes acceptées sans contexte
+TECHNICAL_SHORT_SKILLS = frozenset({
+    'sql', 'php', 'css', 'html', 'java', 'python', 'react', 'angular', 'vue',
+    'git', 'docker', 'aws', 'azure', 'api', 'rest', 'json', 'xml'
+})
+
+# Catégories de motifs
+SKILL = 'skill'
+DOMAIN_KEYWORD = 'domain_keyword'
+TECHNICAL_TERM = 'technical_term'
+
+
+class SkillMatcher:
+    """
+    Automate Aho-Corasick sur des motifs en minuscules.
+
+    `patterns` associe chaque motif à une charge utile libre (liste de
+    tuples) renvoyée avec les occurrences.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self.payloads = [patterns[pattern] for pattern in self.patterns]
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        outputs = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    outputs.append([])
+                node = next_node
+            outputs[node].append(pattern_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in goto[node].items():
+                queue.append(next_node)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[next_node] = goto[state].get(char, 0)
+                outputs[next_node].extend(outputs[fail[next_node]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+
+    def iter_matches(self, text):
+        """
+        Toutes les occurrences en un parcours: (début, fin, pattern_id)
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        patterns = self.patterns
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in outputs[node]:
+                yield position - len(patterns[pattern_id]) + 1, position + 1, pattern_id
+
+    def matched_ids(self, text):
+        """Identifiants des motifs présents au moins une fois dans le texte"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+@lru_cache(maxsize=None)
+def get_description_matcher():
+    """
+    Automate partagé: compétences du référentiel, mots-clés de domaine et
+    termes métier. Chaque entrée de liste compte (les doublons d'un domaine
+    pèsent double, comme avec les anciennes boucles).
+    """
+    patterns = {}
+    for entry in get_skill_catalog().entries:
+        patterns.setdefault(entry.normalized, []).append((SKILL, entry.domain))
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            patterns.setdefault(keyword, []).append((DOMAIN_KEYWORD, domain))
+    for term in TECHNICAL_TERMS:
+        patterns.setdefault(term, []).append((TECHNICAL_TERM, None))
+
+    matcher = SkillMatcher(patterns)
+    logger.info(f"Index des compétences construit: {len(matcher.patterns)} motifs")
+    return matcher
+
+
+class DescriptionAnalysis:
+    """Résultat d'un parcours unique d'une description"""
+
+    def __init__(self, skills, technical_terms, domain_scores):
+        self.skills = skills
+        self.technical_terms = technical_terms
+        self.domain_scores = domain_scores
+
+    @property
+    def domain(self):
+        """(domaine, score) - le premier domaine en cas d'égalité"""
+        return max(self.domain_scores.items(), key=lambda item: item[1])
+
+    @property
+    def mentioned_skills(self):
+        return list(self.skills | self.technical_terms)
+
+
+def analyze_description(description):
+    """
+    Compétences trouvées et scores par domaine en un seul parcours du texte
+    """
+    domain_scores = {domain: 0 for domain in ('DIGITAL', 'FINANCE', 'ENERGIE', 'INDUSTRIE')}
+    skills = set()
+    technical_terms = set()
+    if not description:
+        return DescriptionAnalysis(skills, technical_terms, domain_scores)
+
+    matcher = get_description_matcher()
+    for pattern_id in matcher.matched_ids(description.lower()):
+        pattern = matcher.patterns[pattern_id]
+        for kind, domain in matcher.payloads[pattern_id]:
+            if kind == SKILL:
+                skills.add(pattern)
+                domain_scores[domain] = domain_scores.get(domain, 0) + 1
+            elif kind == DOMAIN_KEYWORD:
+                domain_scores[domain] = domain_scores.get(domain, 0) + DOMAIN_KEYWORD_WEIGHT
+            else:
+                technical_terms.add(pattern)
+
+    return DescriptionAnalysis(skills, technical_terms, domain_scores)
+
+
+# ----------------------------------------------------------------------
+# Extraction des compétences d'un CV
+# ----------------------------------------------------------------------
+
+class CatalogSkill:
+    """Compétence du référentiel retenue pour l'extraction, avec ses variantes précalculées"""
+    __slots__ = ('skill', 'lower', 'variants')
+
+    def __init__(self, skill, lower, variants):
+        self.skill = skill
+        self.lower = lower
+        self.variants = variants
+
+
+@lru_cache(maxsize=None)
+def get_cv_skill_catalog():
+    """
+    Référentiel compilé pour l'extraction: (compétences par domaine, automate).
+
+    Les règles de filtrage (mots ignorés, compétences courtes hors liste
+    blanche) sont appliquées une fois ici; l'automate contient chaque
+    compétence et toutes ses variantes.
+    """
+    skills_by_domain = {}
+    patterns = {}
+    catalog = get_skill_catalog()
+    for domain in catalog.by_domain:
+        domain_entries = catalog.domain_entries(domain)
+        entries = []
+        for entry in domain_entries:
+            skill_lower = entry.normalized
+            if skill_lower in MOTS_IGNORES:
+                continue
+            if len(skill_lower) <= 3 and skill_lower not in COMPETENCES_COURTES_VALIDES:
+                continue
+            variants = entry.variants if len(skill_lower) > 3 else ()
+            entries.append(CatalogSkill(entry.name, skill_lower, variants))
+            for pattern in (skill_lower,) + variants:
+                patterns.setdefault(pattern, [])
+        skills_by_domain[domain] = (len(domain_entries), entries)
+
+    matcher = SkillMatcher(patterns)
+    logger.info(f"Automate d'extraction des CV construit: {len(matcher.patterns)} motifs")
+    return skills_by_domain, matcher
+
+
+def find_skill_occurrences(text):
+    """
+    Toutes les occurrences des compétences et variantes du référentiel dans
+    un texte en minuscules, en un parcours: {motif: [positions de début]}
+    """
+    _, matcher = get_cv_skill_catalog()
+    patterns = matcher.patterns
+    occurrences = {}
+    for start, _, pattern_id in matcher.iter_matches(text):
+        occurrences.setdefault(patterns[pattern_id], []).append(start)
+    return occurrences
+
+
+@lru_cache(maxsize=None)
+def get_context_matcher():
+    """Automate des mots-clés de contexte technique"""
+    return SkillMatcher({keyword: [] for keyword in CONTEXT_KEYWORDS})
+
+
+class TechnicalContext:
+    """
+    Index des positions des mots-clés de contexte et des fins de ligne d'un
+    texte en minuscules, construit en un parcours.
+
+    La validation d'une occurrence devient une recherche d'intervalle: un
+    mot-clé entièrement compris dans les CONTEXT_RADIUS caractères avant
+    ou après l'occurrence, sur la même ligne.
+    """
+
+    def __init__(self, text):
+        self.text_length = len(text)
+        spans = sorted((start, end) for start, end, _ in get_context_matcher().iter_matches(text))
+        self.keyword_starts = [start for start, _ in spans]
+        self.keyword_ends = [end for _, end in spans]
+        self.newlines = [position for position, char in enumerate(text) if char == '\n']
+
+    def has_keyword_near(self, start, end, radius=CONTEXT_RADIUS):
+        """Un mot-clé de contexte dans la fenêtre de l'occurrence [start, end)"""
+        line = bisect_left(self.newlines, start)
+        line_start = self.newlines[line - 1] + 1 if line else 0
+        next_newline = bisect_left(self.newlines, end)
+        line_end = self.newlines[next_newline] if next_newline < len(self.newlines) else self.text_length
+
+        low = max(line_start, start - radius)
+        high = min(line_end, end + radius)
+        index = bisect_left(self.keyword_starts, low)
+        last = bisect_right(self.keyword_starts, high)
+        for position in range(index, last):
+            if self.keyword_ends[position] <= high:
+                return True
+        return False
+
+    def is_valid(self, skill, starts):
+        """
+        Compétence dans un contexte technique valide: mot-clé proche d'une
+        de ses occurrences (positions de début), ou compétence spécifique
+        (plus de 5 caractères) ou courte mais très technique
+        """
+        if len(skill) > 5 or skill in TECHNICAL_SHORT_SKILLS:
+            return True
+        length = len(skill)
+        return any(self.has_keyword_near(start, start + length) for start in starts)
@@ -0,0 +1,189 @@
+# skill_similarity.py - Similarité entre compétences (formes normalisées mémorisées)
+
+"""
+Chaque nom de compétence distinct est normalisé une seule fois (minuscules,
+base sans numéro de version, ensemble de tokens), internalisé et mis en
+cache. SkillSet indexe un ensemble de compétences par token, par base et par
+sous-chaîne pour scorer un mot-clé contre toutes les compétences d'un
+consultant (ou tout le vocabulaire du moteur de matching) en un appel.
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from .skill_catalog import SuffixIndex
+
+_VERSION_RE = re.compile(r'\s+\d+(\.\d+)*')
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# En deçà, la recherche des inclusions par parcours reste plus rapide que l'index
+SUBSTRING_INDEX_MIN_SKILLS = 64
+
+SUBSTRING_WEIGHT = 0.8
+SAME_BASE_SCORE = 0.9
+TOKEN_WEIGHT = 0.6
+
+
+class NormalizedSkill:
+    __slots__ = ('text', 'base', 'tokens')
+
+    def __init__(self, text, base, tokens):
+        self.text = text
+        self.base = base
+        self.tokens = tokens
+
+
+@lru_cache(maxsize=65536)
+def normalize_skill(skill):
+    """Forme normalisée d'un nom de compétence (calculée une fois par chaîne)"""
+    text = sys.intern(skill.lower())
+    base = sys.intern(_VERSION_RE.sub('', text))
+    tokens = frozenset(sys.intern(token) for token in _TOKEN_RE.findall(text))
+    return NormalizedSkill(text, base, tokens)
+
+
+def competence_similarity(comp1, comp2):
+    """
+    Similarité entre deux compétences (0 à 1):
+    identiques 1.0, inclusion 0.8 x ratio de longueur, même base hors
+    version 0.9, sinon 0.6 x Jaccard des tokens
+    """
+    skill1 = normalize_skill(comp1)
+    skill2 = normalize_skill(comp2)
+    text1, text2 = skill1.text, skill2.text
+
+    if text1 == text2:
+        return 1.0
+
+    if text1 in text2 or text2 in text1:
+        ratio = min(len(text1), len(text2)) / max(len(text1), len(text2))
+        return SUBSTRING_WEIGHT * ratio
+
+    if skill1.base == skill2.base:
+        return SAME_BASE_SCORE
+
+    if not skill1.tokens or not skill2.tokens:
+        return 0
+
+    common_tokens = skill1.tokens & skill2.tokens
+    if common_tokens:
+        return TOKEN_WEIGHT * len(common_tokens) / len(skill1.tokens | skill2.tokens)
+
+    return 0
+
+
+class SkillSet:
+    """
+    Ensemble de compétences indexé par token, par base et par sous-chaîne,
+    pour scorer un mot-clé contre toutes les compétences en une fois.
+    """
+
+    def __init__(self, skills):
+        self.skills = [normalize_skill(skill) for skill in skills]
+        self.texts = [skill.text for skill in self.skills]
+        self.lengths = np.fromiter((len(text) for text in self.texts), dtype=np.float64, count=len(self.texts))
+
+        self.token_index = {}
+        self.base_index = {}
+        for position, skill in enumerate(self.skills):
+            self.base_index.setdefault(skill.base, []).append(position)
+            for token in skill.tokens:
+                self.token_index.setdefault(token, []).append(position)
+
+        # Index des inclusions construit au premier besoin (grands ensembles)
+        self.text_index = None
+        self.suffix_index = None
+        self.text_lengths = None
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _build_substring_index(self):
+        # Construit hors de l'instance puis publié (suffix_index en dernier):
+        # l'ensemble peut être partagé entre threads (moteur de matching partagé)
+        text_index = {}
+        for position, text in enumerate(self.texts):
+            text_index.setdefault(text, []).append(position)
+        self.text_index = text_index
+        self.text_lengths = sorted(set(len(text) for text in text_index))
+        self.suffix_index = SuffixIndex(self.texts)
+
+    def _contained_positions(self, text):
+        """
+        Positions des compétences qui contiennent le mot-clé ou y sont
+        contenues (text in other or other in text)
+        """
+        if len(self.texts) < SUBSTRING_INDEX_MIN_SKILLS:
+            return [position for position, other in enumerate(self.texts) if text in other or other in text]
+        if not text:
+            return list(range(len(self.texts)))
+        if self.suffix_index is None:
+            self._build_substring_index()
+
+        # Compétences contenant le mot-clé: un de leurs suffixes commence par lui
+        positions = self.suffix_index.positions(text)
+        # Compétences contenues dans le mot-clé: sous-chaînes aux longueurs présentes
+        for length in self.text_lengths:
+            if length > len(text):
+                break
+            for start in range(len(text) - length + 1):
+                positions.update(self.text_index.get(text[start:start + length], ()))
+        return sorted(positions)
+
+    def similarities(self, keyword, substring_score=None):
+        """
+        Vecteur des similarités du mot-clé avec chaque compétence,
+        identique à competence_similarity appliqué élément par élément.
+
+        substring_score: score fixe pour les inclusions (au lieu de
+        0.8 x ratio).
+        """
+        scores = np.zeros(len(self.skills))
+        if not self.skills:
+            return scores
+        keyword = normalize_skill(keyword)
+        text = keyword.text
+
+        # Priorité croissante: tokens communs < même base < inclusion < égalité
+        if keyword.tokens:
+            candidates = set()
+            for token in keyword.tokens:
+                candidates.update(self.token_index.get(token, ()))
+            for position in candidates:
+                tokens = self.skills[position].tokens
+                scores[position] = TOKEN_WEIGHT * len(keyword.tokens & tokens) / len(keyword.tokens | tokens)
+
+        same_base = self.base_index.get(keyword.base)
+        if same_base:
+            scores[same_base] = SAME_BASE_SCORE
+
+        contained = self._contained_positions(text)
+        if contained:
+            if substring_score is None:
+                keyword_length = len(text)
+                lengths = self.lengths[contained]
+                longest = np.maximum(lengths, keyword_length)
+                scores[contained] = SUBSTRING_WEIGHT * np.divide(
+                    np.minimum(lengths, keyword_length), longest,
+                    out=np.zeros_like(longest), where=longest > 0
+                )
+            else:
+                scores[contained] = substring_score
+
+        exact = [position for position in (same_base or ()) if self.texts[position] == text]
+        if exact:
+            scores[exact] = 1.0
+        return scores
+
+    def best_match(self, keyword, levels, base, slope, substring_score=None):
+        """
+        Meilleure correspondance pondérée par le niveau:
+        max_j sim[j] * (base + slope * niveau_j / 5), 0 si aucune
+        """
+        if not self.skills:
+            return 0
+        scores = self.similarities(keyword, substring_score) * (base + slope * (np.asarray(levels) / 5))
+        return max(0.0, float(scores.max()))
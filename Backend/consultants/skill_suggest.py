@@ -0,0 +1,216 @@
+# skill_suggest.py - Autocomplétion des compétences (index de préfixes en mémoire)
+
+"""
+Index de suggestions du sélecteur de compétences: référentiel compilé
+(skill_catalog) + noms distincts de Competence.nom_competence en base.
+
+Classement: correspondance exacte, puis préfixe du nom complet, puis
+préfixe d'un mot interne; à égalité, les compétences les plus utilisées
+par les consultants, puis les plus courtes.
+
+L'index est reconstruit après settings.SKILL_SUGGEST_REFRESH secondes,
+dans un thread de fond: les requêtes continuent d'utiliser l'index
+précédent pendant la reconstruction. Les nouvelles compétences saisies y
+sont ajoutées entre-temps (signal), y compris pendant la reconstruction.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count
+
+from .models import Competence
+from .skill_catalog import PrefixIndex, get_skill_catalog, normalize_skill_name
+
+logger = logging.getLogger(__name__)
+
+CATALOG = 'catalogue'
+DATABASE = 'base'
+
+
+class Suggestion:
+    __slots__ = ('name', 'normalized', 'domains', 'source', 'usage_count')
+
+    def __init__(self, name, normalized, domains, source, usage_count=0):
+        self.name = name
+        self.normalized = normalized
+        self.domains = domains
+        self.source = source
+        self.usage_count = usage_count
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'domains': self.domains,
+            'source': self.source,
+            'usage_count': self.usage_count,
+        }
+
+
+class SkillSuggestIndex:
+    """
+    - suggestions: une entrée par nom normalisé
+    - prefix_index: positions des suggestions par début de mot
+    - rank: rang statique (utilisation décroissante, longueur, nom)
+    """
+
+    def __init__(self, catalog, usage_rows):
+        self.suggestions = []
+        self.by_normalized = {}
+
+        for entry in catalog.entries:
+            suggestion = self.by_normalized.get(entry.normalized)
+            if suggestion is None:
+                self._append(Suggestion(entry.name, entry.normalized, [entry.domain], CATALOG))
+            elif entry.domain not in suggestion.domains:
+                suggestion.domains.append(entry.domain)
+
+        # Noms saisis en base: utilisation et domaine le plus fréquent des consultants
+        database_domains = {}
+        database_names = {}
+        for nom_competence, domaine_principal, usage_count in usage_rows:
+            normalized = normalize_skill_name(nom_competence or '')
+            if not normalized:
+                continue
+            suggestion = self.by_normalized.get(normalized)
+            if suggestion is not None and suggestion.source == CATALOG:
+                suggestion.usage_count += usage_count
+                continue
+            database_names.setdefault(normalized, nom_competence.strip())
+            database_domains.setdefault(normalized, Counter())[domaine_principal] += usage_count
+
+        for normalized, domains in database_domains.items():
+            domain = domains.most_common(1)[0][0]
+            self._append(Suggestion(
+                database_names[normalized], normalized, [domain] if domain else [], DATABASE, sum(domains.values())
+            ))
+
+        self.prefix_index = PrefixIndex(suggestion.normalized for suggestion in self.suggestions)
+        order = sorted(
+            range(len(self.suggestions)),
+            key=lambda position: (
+                -self.suggestions[position].usage_count,
+                len(self.suggestions[position].normalized),
+                self.suggestions[position].normalized
+            )
+        )
+        self.rank = [0] * len(self.suggestions)
+        for rank, position in enumerate(order):
+            self.rank[position] = rank
+
+    def _append(self, suggestion):
+        self.by_normalized[suggestion.normalized] = suggestion
+        self.suggestions.append(suggestion)
+
+    def add(self, name, domain=None):
+        """Ajoute un nom saisi depuis la construction (rang: dernier)"""
+        normalized = normalize_skill_name(name or '')
+        if not normalized or normalized in self.by_normalized:
+            return
+        position = len(self.suggestions)
+        self._append(Suggestion(name.strip(), normalized, [domain] if domain else [], DATABASE, 1))
+        self.rank.append(position)
+        self.prefix_index.add(normalized, position)
+
+    def suggest(self, query, domain=None, limit=10):
+        prefix = normalize_skill_name(query or '')
+        if not prefix:
+            return []
+        domain = domain.upper() if domain else None
+
+        candidates = []
+        for position in self.prefix_index.positions(prefix):
+            suggestion = self.suggestions[position]
+            if domain and domain not in suggestion.domains:
+                continue
+            candidates.append((
+                suggestion.normalized != prefix,
+                not suggestion.normalized.startswith(prefix),
+                self.rank[position],
+                position
+            ))
+        return [self.suggestions[candidate[-1]] for candidate in heapq.nsmallest(limit, candidates)]
+
+
+_index = None
+_built_at = 0.0
+_lock = threading.Lock()
+_rebuilding = False
+# Noms enregistrés pendant une reconstruction, rejoués sur le nouvel index
+_registered_during_rebuild = []
+
+
+def get_refresh_interval():
+    return getattr(settings, 'SKILL_SUGGEST_REFRESH', 300)
+
+
+def build_skill_suggest_index():
+    usage_rows = Competence.objects.values_list(
+        'nom_competence', 'consultant__domaine_principal'
+    ).annotate(usage_count=Count('id')).order_by()
+    index = SkillSuggestIndex(get_skill_catalog(), usage_rows)
+    logger.info(f"Index de suggestions construit: {len(index.suggestions)} compétences")
+    return index
+
+
+def _rebuild():
+    global _index, _built_at, _rebuilding
+    try:
+        close_old_connections()
+        index = build_skill_suggest_index()
+        with _lock:
+            for name, domain in _registered_during_rebuild:
+                index.add(name, domain)
+            _index = index
+            _built_at = time.monotonic()
+    except Exception as e:
+        # Index précédent conservé, nouvelle tentative après l'intervalle
+        logger.error(f"Erreur lors de la reconstruction de l'index de suggestions: {str(e)}")
+        with _lock:
+            _built_at = time.monotonic()
+    finally:
+        with _lock:
+            _rebuilding = False
+            _registered_during_rebuild.clear()
+        close_old_connections()
+
+
+def _start_rebuild():
+    global _rebuilding
+    with _lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild, name='skill-suggest-rebuild', daemon=True).start()
+
+
+def get_skill_suggest_index():
+    """
+    Index partagé du processus: construit à la première demande, puis
+    reconstruit en arrière-plan quand il est périmé (l'index courant reste servi)
+    """
+    global _index, _built_at
+    index = _index
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = build_skill_suggest_index()
+                _built_at = time.monotonic()
+            return _index
+    if time.monotonic() - _built_at > get_refresh_interval():
+        _start_rebuild()
+    return index
+
+
+def register_skill_name(name, domain=None):
+    """Nouvelle compétence saisie: visible immédiatement si l'index est déjà construit"""
+    if _index is not None:
+        with _lock:
+            _index.add(name, domain)
+            if _rebuilding:
+                _registered_during_rebuild.append((name, domain))
@@ -37,12 +37,14 @@ urlpatterns = [
     
     # 🔥 ENDPOINTS CORRIGÉS POUR LE MATCHING
     path('matching/offer/<int:appel_offre_id>/', views.matching_for_offer_updated, name='matching-for-offer'),
+    path('matching/offer/<int:appel_offre_id>/top/', views.top_matching_for_offer, name='matching-top-for-offer'),
     path('admin/matching/<int:appel_offre_id>/', views.matching_for_offer_updated, name='admin-matching-detail'),
     path('matching/<int:appel_offre_id>/', views.matching_for_offer_updated, name='matching-detail'),
     path('matching/offer-updated/<int:appel_offre_id>/', views.matching_for_offer_updated, name='matching-for-offer-updated'),
     
     # Validation des matchings
     path('matching/validate/<int:match_id>/', views.validate_match, name='validate-match'),
+    path('matching/analytics/', views.matching_analytics, name='matching-analytics'),
     
     # Matches validés
     path('validated-matches/', views.validated_matches, name='validated-matches'),
@@ -114,6 +116,8 @@ urlpatterns = [
     
     # 🔥 EXTRACTION AUTOMATIQUE DES COMPÉTENCES (endpoint corrigé)
     path('consultant/<int:consultant_id>/extract-skills/', views.extract_consultant_competences, name='extract-consultant-competences'),
+    path('consultant/<int:consultant_id>/cv-jobs/', views.consultant_cv_jobs, name='consultant-cv-jobs'),
+    path('cv-jobs/<int:job_id>/', views.cv_job_status, name='cv-job-status'),
     
     # 🔥 ANALYSE D'EXPERTISE (nouveaux endpoints)
     path('consultant/<int:consultant_id>/expertise-analysis/', views.get_consultant_expertise_analysis, name='get-consultant-expertise-analysis'),
@@ -122,6 +126,7 @@ urlpatterns = [
     # Domaines et compétences (référentiels)
     path('domains/', views.get_all_domains, name='get-all-domains'),
     path('domains/<str:domain>/competences/', views.get_competences_by_domain, name='get-competences-by-domain'),
+    path('skills/suggest/', views.skill_suggestions, name='skill-suggestions'),
     
     # ==========================================
     # NOTIFICATIONS - 🔥 CORRIGÉ
@@ -203,6 +208,7 @@ urlpatterns = [
     
     # 🔥 ENDPOINTS DE DÉBOGAGE AMÉLIORÉS (uniquement en mode DEBUG)
     path('debug/consultant/<int:consultant_id>/missions/', views.debug_consultant_missions, name='debug-consultant-missions'),
+    path('debug/models/', views.debug_loaded_models, name='debug-loaded-models'),
     path('debug/matchings/', views.debug_matching_status, name='debug-matchings'),
     path('debug/matchings/consultant/<int:consultant_id>/', views.debug_matching_status, name='debug-matchings-consultant'),
     path('debug/skills-match/<int:consultant_id>/<int:appel_offre_id>/', views.debug_skills_match, name='debug-skills-match'),
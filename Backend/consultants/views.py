@@ -4,10 +4,13 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.core.files.storage import default_storage
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import BooleanField, Case, DateField, DurationField, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThan
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from django.middleware.csrf import get_token
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -17,6 +20,8 @@ from django.views.decorators.http import require_http_methods
 from django.http import FileResponse
 import mimetypes
 from functools import lru_cache
+import base64
+import binascii
 import hashlib
 import threading
 from django.core.mail import send_mail
@@ -25,16 +30,13 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from .models import Consultant, Competence, AppelOffre, User, CriteresEvaluation, MatchingResult, Notification
+from .models import CVExtractionJob
 from .models import DocumentGED, DocumentCategory, DocumentVersion, DocumentAccess, Document 
 from .serializers import ConsultantSerializer, CompetenceSerializer, AppelOffreSerializer, CriteresEvaluationSerializer
 from .serializers import DocumentGEDSerializer, DocumentCategorySerializer
 from .email_service import send_registration_email, send_validation_email
 from .competences_data import ALL_SKILLS,FINANCE_BANKING_SKILLS, ENERGY_TRANSITION_SKILLS, \
     INDUSTRY_MINING_SKILLS
-import fitz  # PyMuPDF
-from PIL import Image, ImageEnhance
-import pytesseract
-import spacy
 import os
 import re
 from dotenv import load_dotenv
@@ -49,12 +51,8 @@ logger = logging.getLogger(__name__)
 # Chargement des variables d'environnement
 load_dotenv()
 
-# Chargement du modèle NLP
-try:
-    nlp = spacy.load("en_core_web_sm")
-except Exception as e:
-    logger.error(f"Erreur lors du chargement du modèle spaCy: {e}")
-    nlp = None
+# spaCy, PyMuPDF, Tesseract et scikit-learn sont chargés au premier usage
+# (model_registry): les workers qui ne font pas de NLP restent légers
 
 
 @api_view(['POST'])
@@ -255,278 +253,6 @@ def admin_pending_consultants_fixed(request):
             "message": "Erreur lors de la récupération des consultants en attente"
         }, status=500)
         
-# Ajoutez cette fonction corrigée dans views.py pour remplacer matching_for_offer_updated
-
-@api_view(['GET', 'POST'])
-def matching_for_offer_updated(request, appel_offre_id):
-    """
-    Endpoint pour générer ou récupérer des matchings pour un appel d'offre scrapé
-    VERSION CORRIGÉE avec gestion d'erreur robuste
-    """
-    logger.info(f"Requête {request.method} reçue pour appel d'offre scrapé ID {appel_offre_id}")
-    
-    try:
-        appel_offre_id = int(appel_offre_id)
-    except ValueError:
-        return Response({
-            'success': False,
-            'error': f"ID d'appel d'offre invalide: {appel_offre_id}"
-        }, status=400)
-
-    # Vérifier que l'appel d'offre existe
-    try:
-        appel_offre = AppelOffre.objects.get(id=appel_offre_id)
-        logger.info(f"Appel d'offre trouvé: {appel_offre.titre}")
-    except AppelOffre.DoesNotExist:
-        logger.error(f"Appel d'offre avec ID {appel_offre_id} introuvable")
-        return Response({
-            'success': False,
-            'error': f"Appel d'offre avec ID {appel_offre_id} introuvable"
-        }, status=404)
-    except Exception as e:
-        logger.error(f"Erreur lors de la récupération de l'AO {appel_offre_id}: {str(e)}")
-        return Response({
-            'success': False,
-            'error': f"Erreur lors de la récupération de l'appel d'offre: {str(e)}"
-        }, status=500)
-
-    if request.method == 'GET':
-        try:
-            # Récupérer tous les matchings pour cet appel d'offre
-            matches = MatchingResult.objects.filter(
-                appel_offre_id=appel_offre_id
-            ).order_by('-score')
-
-            logger.info(f"{matches.count()} matchings trouvés pour l'AO scrapé {appel_offre_id}")
-
-            if not matches.exists():
-                return Response({
-                    'success': True,
-                    'matches': []
-                })
-
-            result = []
-            for match in matches:
-                consultant = match.consultant
-
-                try:
-                    # Recalculer les scores si nécessaire avec gestion d'erreur
-                    try:
-                        date_score = calculate_date_match_score_updated(consultant, match.appel_offre)
-                        skills_score = calculate_skills_match_score_updated(consultant, match.appel_offre)
-                        calculated_score = (date_score * 0.3) + (skills_score * 0.7)
-                        stored_score = float(match.score)
-                        
-                        # Vérifier la cohérence
-                        if abs(calculated_score - stored_score) > 5:
-                            match.score = Decimal(str(calculated_score))
-                            match.save(update_fields=['score'])
-                            stored_score = calculated_score
-                            
-                    except Exception as score_error:
-                        logger.warning(f"Erreur lors du recalcul des scores: {str(score_error)}")
-                        date_score = 0
-                        skills_score = 0
-                        stored_score = float(match.score)
-
-                    stored_score = max(0, min(100, float(stored_score)))
-
-                    # Récupérer les compétences de manière sécurisée
-                    try:
-                        top_skills = get_top_skills_updated(consultant)
-                    except Exception as skills_error:
-                        logger.warning(f"Erreur récupération compétences: {str(skills_error)}")
-                        top_skills = []
-
-                    result.append({
-                        'id': match.id,
-                        'consultant_id': consultant.id,
-                        'consultant_name': f"{consultant.prenom or ''} {consultant.nom or ''}".strip(),
-                        'consultant_expertise': consultant.expertise or "Débutant",
-                        'email': consultant.email or '',
-                        'domaine_principal': consultant.domaine_principal or 'DIGITAL',
-                        'specialite': consultant.specialite or "",
-                        'top_skills': top_skills,
-                        'date_match_score': round(date_score, 1),
-                        'skills_match_score': round(skills_score, 1),
-                        'score': stored_score,
-                        'is_validated': match.is_validated
-                    })
-
-                except Exception as match_error:
-                    logger.error(f"Erreur traitement match {match.id}: {str(match_error)}")
-                    continue
-
-            sorted_result = sorted(result, key=lambda x: x['score'], reverse=True)
-
-            return Response({
-                'success': True,
-                'matches': sorted_result
-            })
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des matchings: {str(e)}")
-            return Response({
-                'success': False,
-                'error': f"Erreur lors de la récupération des matchings: {str(e)}"
-            }, status=500)
-
-    elif request.method == 'POST':
-        try:
-            logger.info(f"Génération de nouveaux matchings pour l'AO scrapé {appel_offre_id}")
-            
-            # Vérifier qu'il y a des consultants disponibles
-            consultants = Consultant.objects.filter(
-                is_validated=True,
-                statut='Actif'
-            ).exclude(
-                date_debut_dispo=None
-            ).exclude(
-                date_fin_dispo=None
-            )
-            
-            if not consultants.exists():
-                logger.warning(f"Aucun consultant disponible pour le matching")
-                return Response({
-                    'success': False,
-                    'error': "Aucun consultant disponible pour le matching"
-                }, status=404)
-            
-            # Vider les anciens matchings
-            deleted_count, _ = MatchingResult.objects.filter(appel_offre=appel_offre).delete()
-            logger.info(f"{deleted_count} anciens matchings supprimés pour l'AO {appel_offre_id}")
-            
-            # Vider le cache
-            try:
-                clear_score_cache()
-            except Exception as cache_error:
-                logger.warning(f"Erreur nettoyage cache: {str(cache_error)}")
-            
-            results = []
-            score_stats = {"min": 100, "max": 0, "total": 0, "count": 0}
-            
-            # Calculer les scores pour chaque consultant
-            for consultant in consultants:
-                try:
-                    # Calculer les scores avec gestion d'erreur
-                    try:
-                        date_score = calculate_date_match_score_updated(consultant, appel_offre)
-                    except Exception as date_error:
-                        logger.warning(f"Erreur calcul date score pour consultant {consultant.id}: {str(date_error)}")
-                        date_score = 0
-                    
-                    try:
-                        skills_score = calculate_skills_match_score_updated(consultant, appel_offre)
-                    except Exception as skills_error:
-                        logger.warning(f"Erreur calcul skills score pour consultant {consultant.id}: {str(skills_error)}")
-                        skills_score = 0
-                    
-                    # Pondération: 30% date, 70% compétences
-                    final_score = (date_score * 0.3) + (skills_score * 0.7)
-                    final_score = min(100, max(0, final_score))
-                    
-                    # Mettre à jour les statistiques
-                    if score_stats["count"] == 0:
-                        score_stats["min"] = final_score
-                        score_stats["max"] = final_score
-                    else:
-                        score_stats["min"] = min(score_stats["min"], final_score)
-                        score_stats["max"] = max(score_stats["max"], final_score)
-                    
-                    score_stats["total"] += final_score
-                    score_stats["count"] += 1
-                    
-                    logger.debug(f"Score final pour {consultant.nom}: {final_score:.2f}%")
-                    
-                    # Enregistrer le résultat
-                    try:
-                        matching = MatchingResult.objects.create(
-                            consultant=consultant,
-                            appel_offre=appel_offre,
-                            score=Decimal(str(final_score)),
-                            is_validated=False
-                        )
-                        
-                        # Récupérer les compétences de manière sécurisée
-                        try:
-                            top_skills = get_top_skills_updated(consultant)
-                        except Exception:
-                            top_skills = []
-                        
-                        # Ajouter à la liste de résultats
-                        results.append({
-                            'id': matching.id,
-                            'consultant_id': consultant.id,
-                            'consultant_name': f"{consultant.prenom or ''} {consultant.nom or ''}".strip(),
-                            'consultant_expertise': consultant.expertise or "Débutant",
-                            'email': consultant.email or '',
-                            'domaine_principal': consultant.domaine_principal or 'DIGITAL',
-                            'specialite': consultant.specialite or "",
-                            'top_skills': top_skills,
-                            'date_match_score': float(date_score),
-                            'skills_match_score': float(skills_score),
-                            'score': float(final_score),
-                            'is_validated': False
-                        })
-                        
-                    except Exception as save_error:
-                        logger.error(f"Erreur sauvegarde matching pour consultant {consultant.id}: {str(save_error)}")
-                        continue
-                    
-                except Exception as e:
-                    logger.error(f"Erreur lors du calcul pour le consultant {consultant.id}: {str(e)}")
-                    continue
-            
-            # Calculer les statistiques finales
-            if results:
-                score_stats["avg"] = score_stats["total"] / score_stats["count"]
-                logger.info(f"Matchings générés: {len(results)}, score moyen: {score_stats['avg']:.2f}%")
-            else:
-                score_stats["avg"] = 0
-                logger.warning("Aucun matching généré")
-            
-            # Trier les résultats par score décroissant
-            sorted_results = sorted(results, key=lambda x: x['score'], reverse=True)
-            
-            return Response({
-                'success': True,
-                'matches': sorted_results,
-                'stats': score_stats,
-                'appel_offre_info': {
-                    'id': appel_offre.id,
-                    'titre': appel_offre.titre,
-                    'client': appel_offre.client,
-                    'has_description': bool(appel_offre.description),
-                    'has_criteria': CriteresEvaluation.objects.filter(appel_offre=appel_offre).exists()
-                }
-            })
-            
-        except Exception as e:
-            logger.error(f"Exception lors de la génération des matchings: {str(e)}")
-            return Response({
-                'success': False,
-                'error': f"Erreur lors de la génération des matchings: {str(e)}"
-            }, status=500)
-    else:
-        return Response({
-            'success': False,
-            'error': f"Méthode {request.method} non supportée"
-        }, status=405)
-
-
-# Fonction utilitaire pour nettoyer le cache
-def clear_score_cache():
-    """
-    Nettoie le cache des scores de matching
-    """
-    global _score_cache
-    try:
-        _score_cache.clear()
-        logger.info("Cache des scores nettoyé")
-    except Exception as e:
-        logger.warning(f"Erreur lors du nettoyage du cache: {str(e)}")
-
-
 # Fonction get_top_skills_updated sécurisée
 def get_top_skills_updated(consultant, limit=5):
     """
@@ -1093,6 +819,34 @@ def get_competences_by_domain(request, domain):
     return Response({"domain": domain, "competences": competences})
 
 
+@api_view(['GET'])
+def skill_suggestions(request):
+    """
+    Autocomplétion du sélecteur de compétences (référentiel + compétences
+    saisies en base): ?q=<préfixe>&domain=<domaine>&limit=<n>
+    """
+    query = request.query_params.get('q', '').strip()
+    domain = request.query_params.get('domain') or None
+    if domain and domain.upper() not in ALL_SKILLS:
+        return Response({'success': False, 'error': 'Domaine invalide'}, status=400)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        return Response({'success': False, 'error': 'Paramètre limit invalide'}, status=400)
+
+    try:
+        suggestions = get_skill_suggest_index().suggest(query, domain, limit)
+        return Response({
+            'success': True,
+            'query': query,
+            'domain': domain.upper() if domain else None,
+            'suggestions': [suggestion.to_dict() for suggestion in suggestions]
+        })
+    except Exception as e:
+        logger.error(f"Erreur suggestions de compétences: {str(e)}")
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
 @api_view(['GET'])
 def get_all_domains(request):
     """Récupère la liste des domaines avec un échantillon de compétences"""
@@ -1112,64 +866,11 @@ def get_all_domains(request):
 @api_view(['GET'])
 def dashboard_stats(request):
     """
-    Récupère les statistiques pour le tableau de bord admin - VERSION CORRIGÉE
+    Récupère les statistiques pour le tableau de bord admin
+    (agrégations groupées, mises en cache: voir dashboard_stats.py)
     """
     try:
-        from django.utils import timezone
-        
-        consultants_count = Consultant.objects.count()
-        appels_total = AppelOffre.objects.count()
-        
-        # CORRECTION: Le nouveau modèle AppelOffre n'a pas de champ 'statut'
-        # Utiliser les dates pour déterminer les offres actives
-        now = timezone.now().date()
-        
-        # Offres actives = celles dont la date limite n'est pas dépassée
-        offres_actives = AppelOffre.objects.filter(
-            date_limite__gte=now
-        ).count()
-        
-        # Offres expirées = celles dont la date limite est dépassée
-        offres_expirees = AppelOffre.objects.filter(
-            date_limite__lt=now
-        ).count()
-        
-        # Offres sans date limite = considérées comme actives
-        offres_sans_date = AppelOffre.objects.filter(
-            date_limite__isnull=True
-        ).count()
-        
-        # Ajouter les offres sans date aux actives
-        offres_actives += offres_sans_date
-
-        # Derniers consultants
-        derniers_consultants = Consultant.objects.order_by('-created_at')[:3]
-        
-        # Derniers appels d'offres (utiliser date_de_publication ou created_at)
-        derniers_appels = AppelOffre.objects.order_by('-date_de_publication', '-created_at')[:3]
-
-        data = {
-            "consultants_count": consultants_count,
-            "appels_total": appels_total,
-            "offres_actives": offres_actives,
-            "offres_expirees": offres_expirees,
-            "derniers_consultants": [
-                {
-                    "nom": f"{c.prenom or ''} {c.nom or ''}".strip(),
-                    "specialite": c.specialite or c.domaine_principal or "Non spécifié",
-                    "date": c.created_at.strftime('%d/%m/%Y') if c.created_at else "Non défini"
-                } for c in derniers_consultants
-            ],
-            "derniers_appels": [
-                {
-                    "title": a.titre or "Titre non défini",
-                    "client": a.client or "Client non spécifié", 
-                    "date": a.date_de_publication.strftime('%d/%m/%Y') if a.date_de_publication else a.created_at.strftime('%d/%m/%Y') if a.created_at else "Non défini"
-                } for a in derniers_appels
-            ]
-        }
-        
-        return Response(data)
+        return Response(get_dashboard_stats())
         
     except Exception as e:
         logger.error(f"Erreur dans dashboard_stats: {str(e)}")
@@ -1178,18 +879,143 @@ def dashboard_stats(request):
             "detail": str(e)
         }, status=500)
 
+# Liste paginée des appels d'offres: colonnes légères uniquement, les
+# textes complets (description, critères, documents) sont servis par le détail
+APPELS_OFFRES_PAGE_SIZE = 50
+APPELS_OFFRES_MAX_PAGE_SIZE = 200
+APPELS_OFFRES_LIST_FIELDS = [
+    'id', 'titre', 'date_de_publication', 'date_limite', 'client', 'type_d_appel_d_offre',
+    'lien_site', 'created_at', 'updated_at',
+]
+# Champs calculés par la base: {nom exposé: annotation}
+APPELS_OFFRES_COMPUTED_FIELDS = {
+    'is_expired': 'expire',
+    'days_remaining': 'delai_restant',
+    'has_description': 'avec_description',
+    'has_criteria': 'avec_criteres',
+}
+
+
+def _appels_offres_list_queryset():
+    """
+    Appels d'offres annotés des indicateurs d'échéance et d'enrichissement
+    calculés en SQL (au lieu des propriétés is_expired/days_remaining ligne par ligne)
+    """
+    today = now().date()
+    return AppelOffre.objects.annotate(
+        expire=Case(
+            When(date_limite__lt=today, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ),
+        delai_restant=ExpressionWrapper(
+            F('date_limite') - Value(today, output_field=DateField()),
+            output_field=DurationField()
+        ),
+        avec_description=Case(
+            When(GreaterThan(Length('description'), 50), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ),
+        avec_criteres=Case(
+            When(GreaterThan(Length('critere_evaluation'), 20), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ),
+    )
+
+
+def _appel_offre_list_row(row, fields):
+    """Ligne de la liste paginée à partir d'un dict values()"""
+    data = {}
+    for field in fields:
+        if field in APPELS_OFFRES_COMPUTED_FIELDS:
+            value = row[APPELS_OFFRES_COMPUTED_FIELDS[field]]
+            if field == 'days_remaining':
+                value = max(value.days, 0) if value is not None else None
+            else:
+                value = bool(value)
+        else:
+            value = row[field]
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+        data[field] = value
+    return data
+
+
+def _admin_appels_offres_page(request):
+    """
+    Page d'appels d'offres: ?page=1&page_size=50&fields=id,titre,is_expired
+    Filtres: client, type_d_appel_d_offre, expired (true/false), search (titre ou client)
+    """
+    allowed_fields = APPELS_OFFRES_LIST_FIELDS + list(APPELS_OFFRES_COMPUTED_FIELDS)
+    fields_param = request.query_params.get('fields')
+    if fields_param:
+        fields = [field.strip() for field in fields_param.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in allowed_fields]
+        if unknown:
+            return Response({
+                "success": False,
+                "error": f"Champs non disponibles dans la liste: {', '.join(unknown)}",
+                "allowed_fields": allowed_fields
+            }, status=400)
+    else:
+        fields = allowed_fields
+
+    try:
+        page = max(int(request.query_params.get('page', 1)), 1)
+        page_size = min(max(int(request.query_params.get('page_size', APPELS_OFFRES_PAGE_SIZE)), 1),
+                        APPELS_OFFRES_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({"success": False, "error": "Paramètres de pagination invalides"}, status=400)
+
+    appels = _appels_offres_list_queryset()
+    for field_name in ('client', 'type_d_appel_d_offre'):
+        value = request.query_params.get(field_name)
+        if value:
+            appels = appels.filter(**{field_name: value})
+    expired = request.query_params.get('expired')
+    if expired in ('true', '1'):
+        appels = appels.filter(expire=True)
+    elif expired in ('false', '0'):
+        appels = appels.filter(expire=False)
+    search = request.query_params.get('search')
+    if search:
+        appels = appels.filter(Q(titre__icontains=search) | Q(client__icontains=search))
+
+    # Seules les colonnes demandées sont lues (jamais les champs texte)
+    columns = [APPELS_OFFRES_COMPUTED_FIELDS.get(field, field) for field in fields]
+    total = appels.count()
+    offset = (page - 1) * page_size
+    rows = appels.order_by('-date_de_publication', '-created_at', '-id').values(*columns)[offset:offset + page_size]
+
+    return Response({
+        "success": True,
+        "data": [_appel_offre_list_row(row, fields) for row in rows],
+        "count": total,
+        "page": page,
+        "page_size": page_size,
+        "has_more": offset + page_size < total
+    })
+
+
 @api_view(['GET'])
 def admin_appels_offres(request):
     """
-    Liste tous les appels d'offres - VERSION CORRIGÉE
+    Liste des appels d'offres
+
+    Avec page, page_size ou fields: liste paginée et projetée (voir
+    _admin_appels_offres_page), sans les champs texte complets.
+    Sans paramètre: liste complète historique (écran AppelsOffres.tsx).
     """
     try:
+        if any(param in request.query_params for param in ('page', 'page_size', 'fields')):
+            return _admin_appels_offres_page(request)
+
         logger.info("Récupération des appels d'offres - DÉBUT")
         
-        # Récupérer tous les appels d'offres
-        appels = AppelOffre.objects.all().order_by('-date_de_publication', '-created_at')
-        
-        logger.info(f"Nombre d'appels trouvés: {appels.count()}")
+        # Récupérer tous les appels d'offres (échéances calculées par la base)
+        appels = _appels_offres_list_queryset().order_by('-date_de_publication', '-created_at')
         
         # Sérialiser avec gestion des erreurs
         appels_data = []
@@ -1209,8 +1035,8 @@ def admin_appels_offres(request):
                     'created_at': appel.created_at.isoformat() if appel.created_at else None,
                     'updated_at': appel.updated_at.isoformat() if appel.updated_at else None,
                     # Propriétés calculées
-                    'is_expired': appel.is_expired,
-                    'days_remaining': appel.days_remaining
+                    'is_expired': bool(appel.expire),
+                    'days_remaining': max(appel.delai_restant.days, 0) if appel.delai_restant is not None else None
                 }
                 appels_data.append(appel_data)
             except Exception as e:
@@ -1378,47 +1204,16 @@ def admin_appel_offre_detail(request, pk):
 
 def extract_and_save_competences_async(file_path, consultant):
     """
-    Fonction asynchrone pour extraire les compétences d'un CV et les sauvegarder
+    Dépose une tâche d'extraction des compétences du CV (traitée par les
+    workers run_cv_jobs, hors requête HTTP)
     """
     try:
-        logger.info(f"Début d'extraction des compétences pour {consultant.nom} depuis {file_path}")
-
-        # Extraction des compétences
-        competences, primary_domain = extract_competences_from_cv(file_path)
-        logger.info(f"Compétences trouvées pour {consultant.nom}: {competences}")
-        logger.info(f"Domaine principal détecté: {primary_domain}")
-
-        # Mettre à jour le domaine principal si détecté
-        if primary_domain:
-            consultant.domaine_principal = primary_domain
-            consultant.save()
-            logger.info(f"Domaine principal mis à jour pour {consultant.nom}: {primary_domain}")
-
-        # Enregistrement des compétences
-        added_names = set()
-        for nom in competences:
-            nom_clean = nom.strip().strip(":,.\u2022°").title()
-
-            if nom_clean.lower() in added_names:
-                continue
-
-            if not Competence.objects.filter(nom_competence__iexact=nom_clean, consultant=consultant).exists():
-                Competence.objects.create(
-                    consultant=consultant,
-                    nom_competence=nom_clean,
-                    niveau=1
-                )
-                added_names.add(nom_clean.lower())
-                logger.info(f"Compétence ajoutée pour {consultant.nom}: {nom_clean}")
-
-        # Mise à jour du niveau d'expertise
-        nb = Competence.objects.filter(consultant=consultant).count()
-        consultant.expertise = "Expert" if nb >= 10 else "Intermédiaire" if nb >= 5 else "Débutant"
-        consultant.save()
-
-        logger.info(f"Extraction terminée pour {consultant.nom} - {len(added_names)} compétences ajoutées")
+        job = enqueue_cv_extraction(consultant, file_path)
+        logger.info(f"Extraction des compétences de {consultant.nom} planifiée (tâche {job.id})")
+        return job
     except Exception as e:
-        logger.error(f"Erreur complète lors de l'extraction pour {consultant.nom}: {e}")
+        logger.error(f"Impossible de planifier l'extraction pour {consultant.nom}: {e}")
+        return None
 
 # views.py - CORRECTION pour l'erreur des champs startAvailability/endAvailability
 
@@ -1549,95 +1344,161 @@ def admin_pending_consultants_fixed(request):
 
 # Remplacement temporaire de la fonction actuelle
 
+ADMIN_CONSULTANTS_PAGE_SIZE = 50
+ADMIN_CONSULTANTS_MAX_PAGE_SIZE = 200
+
+
+def _admin_consultant_data(consultant, skills_list, existing_columns):
+    """Ligne de la grille admin des consultants"""
+    consultant_data = {
+        'id': consultant.id,
+        'nom': consultant.nom or '',
+        'prenom': consultant.prenom or '',
+        'email': consultant.email or '',
+        'telephone': consultant.telephone or '',
+        'pays': consultant.pays or '',
+        'ville': consultant.ville or '',
+        'domaine_principal': consultant.domaine_principal or 'DIGITAL',
+        'specialite': consultant.specialite or '',
+        'expertise': consultant.expertise or 'Débutant',
+        'statut': consultant.statut or 'En_attente',
+        'is_validated': consultant.is_validated,
+        
+        # Dates de base
+        'date_debut_dispo': consultant.date_debut_dispo.isoformat() if consultant.date_debut_dispo else None,
+        'date_fin_dispo': consultant.date_fin_dispo.isoformat() if consultant.date_fin_dispo else None,
+        
+        # Alias pour le frontend
+        'firstName': consultant.prenom or '',
+        'lastName': consultant.nom or '',
+        'phone': consultant.telephone or '',
+        'country': consultant.pays or '',
+        'city': consultant.ville or '',
+        'startAvailability': consultant.date_debut_dispo.isoformat() if consultant.date_debut_dispo else None,
+        'endAvailability': consultant.date_fin_dispo.isoformat() if consultant.date_fin_dispo else None,
+    }
+    
+    # Ajouter les autres champs conditionnellement
+    for field_name, default_value in [
+        ('annees_experience', 0),
+        ('formation_niveau', 'BAC+3'),
+        ('certifications_count', 0),
+        ('projets_realises', 0),
+        ('leadership_experience', False),
+        ('international_experience', False),
+        ('expertise_score', None),
+        ('cvFilename', None),
+        ('standardizedCvFilename', None),
+        ('profileImage', None),
+    ]:
+        if field_name in existing_columns:
+            consultant_data[field_name] = getattr(consultant, field_name, default_value)
+        else:
+            consultant_data[field_name] = default_value
+    
+    # Fichiers
+    try:
+        consultant_data['cv'] = consultant.cv.url if consultant.cv else None
+        consultant_data['photo'] = consultant.photo.url if consultant.photo else None
+    except Exception:
+        consultant_data['cv'] = None
+        consultant_data['photo'] = None
+    
+    # Compétences (agrégées en une requête pour toute la page)
+    consultant_data['skills'] = ', '.join(skills_list)
+    
+    consultant_data['created_at'] = consultant.created_at.isoformat() if consultant.created_at else None
+    consultant_data['updated_at'] = consultant.updated_at.isoformat() if consultant.updated_at else None
+    return consultant_data
+
+
+def _skills_by_consultant(consultant_ids):
+    """{consultant_id: [noms des compétences]} en une seule requête"""
+    skills = {consultant_id: [] for consultant_id in consultant_ids}
+    for consultant_id, nom_competence in Competence.objects.filter(
+        consultant_id__in=consultant_ids
+    ).order_by('id').values_list('consultant_id', 'nom_competence'):
+        skills[consultant_id].append(nom_competence)
+    return skills
+
+
+def _encode_consultant_cursor(consultant):
+    raw = f"{consultant.created_at.isoformat()}|{consultant.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_consultant_cursor(cursor):
+    """(created_at, id) du dernier consultant de la page précédente, ValueError si invalide"""
+    from django.utils.dateparse import parse_datetime
+
+    try:
+        created_at, consultant_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        consultant_id = int(consultant_id)
+    except (UnicodeError, binascii.Error) as e:
+        raise ValueError(str(e))
+    if created_at is None:
+        raise ValueError("date invalide")
+    return created_at, consultant_id
+
+
 @api_view(['GET'])
 def admin_consultants_corrected(request):
     """
     VERSION FINALE - Liste les consultants validés avec gestion des champs
+
+    Pagination par curseur (ordre created_at, id décroissants) dès que
+    limit ou cursor est fourni: ?limit=50&cursor=<next_cursor>
+    Filtres: domaine_principal, expertise, statut
     """
     try:
-        from django.db import connection
-        
-        # Vérifier quels champs existent réellement
-        with connection.cursor() as cursor:
-            cursor.execute("SHOW COLUMNS FROM consultants_consultant")
-            existing_columns = {row[0] for row in cursor.fetchall()}
+        # Champs réellement présents en base (structure lue une fois par processus)
+        existing_columns = get_table_columns(Consultant)
         
         consultants = Consultant.objects.filter(is_validated=True)
-        consultants_data = []
+        for field_name in ('domaine_principal', 'expertise', 'statut'):
+            value = request.query_params.get(field_name)
+            if value:
+                consultants = consultants.filter(**{field_name: value})
+        
+        paginated = 'limit' in request.query_params or 'cursor' in request.query_params
+        next_cursor = None
+        if paginated:
+            try:
+                limit = min(max(int(request.query_params.get('limit', ADMIN_CONSULTANTS_PAGE_SIZE)), 1),
+                            ADMIN_CONSULTANTS_MAX_PAGE_SIZE)
+                cursor = request.query_params.get('cursor')
+                if cursor:
+                    created_at, consultant_id = _decode_consultant_cursor(cursor)
+                    consultants = consultants.filter(
+                        Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=consultant_id)
+                    )
+            except ValueError:
+                return Response({"success": False, "error": "Paramètres de pagination invalides"}, status=400)
+            
+            page = list(consultants.order_by('-created_at', '-id')[:limit + 1])
+            if len(page) > limit:
+                page = page[:limit]
+                next_cursor = _encode_consultant_cursor(page[-1])
+        else:
+            page = list(consultants)
         
-        for consultant in consultants:
+        skills = _skills_by_consultant([consultant.id for consultant in page])
+        consultants_data = []
+        for consultant in page:
             try:
-                consultant_data = {
-                    'id': consultant.id,
-                    'nom': consultant.nom or '',
-                    'prenom': consultant.prenom or '',
-                    'email': consultant.email or '',
-                    'telephone': consultant.telephone or '',
-                    'pays': consultant.pays or '',
-                    'ville': consultant.ville or '',
-                    'domaine_principal': consultant.domaine_principal or 'DIGITAL',
-                    'specialite': consultant.specialite or '',
-                    'expertise': consultant.expertise or 'Débutant',
-                    'statut': consultant.statut or 'En_attente',
-                    'is_validated': consultant.is_validated,
-                    
-                    # Dates de base
-                    'date_debut_dispo': consultant.date_debut_dispo.isoformat() if consultant.date_debut_dispo else None,
-                    'date_fin_dispo': consultant.date_fin_dispo.isoformat() if consultant.date_fin_dispo else None,
-                    
-                    # Alias pour le frontend
-                    'firstName': consultant.prenom or '',
-                    'lastName': consultant.nom or '',
-                    'phone': consultant.telephone or '',
-                    'country': consultant.pays or '',
-                    'city': consultant.ville or '',
-                    'startAvailability': consultant.date_debut_dispo.isoformat() if consultant.date_debut_dispo else None,
-                    'endAvailability': consultant.date_fin_dispo.isoformat() if consultant.date_fin_dispo else None,
-                }
-                
-                # Ajouter les autres champs conditionnellement
-                for field_name, default_value in [
-                    ('annees_experience', 0),
-                    ('formation_niveau', 'BAC+3'),
-                    ('certifications_count', 0),
-                    ('projets_realises', 0),
-                    ('leadership_experience', False),
-                    ('international_experience', False),
-                    ('expertise_score', None),
-                    ('cvFilename', None),
-                    ('standardizedCvFilename', None),
-                    ('profileImage', None),
-                ]:
-                    if field_name in existing_columns:
-                        consultant_data[field_name] = getattr(consultant, field_name, default_value)
-                    else:
-                        consultant_data[field_name] = default_value
-                
-                # Fichiers
-                try:
-                    consultant_data['cv'] = consultant.cv.url if consultant.cv else None
-                    consultant_data['photo'] = consultant.photo.url if consultant.photo else None
-                except Exception:
-                    consultant_data['cv'] = None
-                    consultant_data['photo'] = None
-                
-                # Compétences
-                try:
-                    competences = Competence.objects.filter(consultant=consultant)
-                    skills_list = [comp.nom_competence for comp in competences]
-                    consultant_data['skills'] = ', '.join(skills_list)
-                except Exception:
-                    consultant_data['skills'] = ''
-                
-                consultant_data['created_at'] = consultant.created_at.isoformat() if consultant.created_at else None
-                consultant_data['updated_at'] = consultant.updated_at.isoformat() if consultant.updated_at else None
-                
-                consultants_data.append(consultant_data)
-                
+                consultants_data.append(_admin_consultant_data(consultant, skills[consultant.id], existing_columns))
             except Exception as e:
                 logger.error(f"Erreur traitement consultant {consultant.id}: {str(e)}")
                 continue
         
+        if paginated:
+            return Response({
+                "success": True,
+                "data": consultants_data,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            })
         return Response({"success": True, "data": consultants_data})
             
     except Exception as e:
@@ -1891,6 +1752,11 @@ def consultant_register_corrected(request):
                             )
                     logger.info(f"{len(competences)} compétences manuelles ajoutées")
 
+                # Extraction des compétences du CV en arrière-plan
+                cv_job = None
+                if consultant.cv:
+                    cv_job = extract_and_save_competences_async(consultant.cv.path, consultant)
+
                 # Envoi d'email de confirmation
                 try:
                     email_sent = send_registration_email(consultant)
@@ -1907,7 +1773,8 @@ def consultant_register_corrected(request):
                     "success": True,
                     "message": "Consultant créé avec succès. Votre compte est en attente de validation par un administrateur.",
                     "consultant_id": consultant.id,
-                    "is_validated": False
+                    "is_validated": False,
+                    "cv_job_id": cv_job.id if cv_job else None
                 }, status=201)
 
             # Erreur de validation
@@ -2018,368 +1885,40 @@ def consultant_login(request):
 from decimal import Decimal
 import logging
 import re
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from datetime import datetime, timedelta
+from .matching_engine import MatchingEngine, get_shared_engine, save_offer_scores, fetch_top_skills
+from .skill_index import analyze_description
+from .skill_similarity import competence_similarity
+from .skill_suggest import get_skill_suggest_index
+from .cv_jobs import enqueue_cv_extraction, job_to_dict, pending_warning, recover_job
+from .competence_import import import_competences
+from .cv_ocr import ocr_pdf
+from .cv_cache import extractor_version, file_sha256, get_cached_extraction, store_extraction
+from .model_registry import get_module, get_spacy_model, load_timings
+from .schema_registry import get_table_columns, has_field
+from .dashboard_stats import get_appels_offres_stats, get_dashboard_stats
+from .matching_analytics import get_matching_analytics, rebuild_validation_counters, record_validation
 
 # Configurer le logging
 logger = logging.getLogger(__name__)
 
-# Cache des scores calculés (en mémoire durant l'exécution)
-_score_cache = {}
-
-def get_cache_key(consultant_id, appel_offre_id):
-    """
-    Crée une clé de cache unique pour un consultant et un appel d'offre
-    """
-    return f"{consultant_id}_{appel_offre_id}"
-
-def calculate_date_match_score_updated(consultant, appel_offre):
-    """
-    Calcule un score basé sur la disponibilité du consultant par rapport aux dates du projet
-    ADAPTÉ pour le nouveau modèle AppelOffre scrapé
-    """
-    try:
-        cache_key = f"date_{get_cache_key(consultant.id, appel_offre.id)}"
-        if cache_key in _score_cache:
-            return _score_cache[cache_key]
-        
-        # Pour les appels d'offres scrapés, nous n'avons que date_limite
-        # Nous devons estimer une durée de projet
-        if not appel_offre.date_limite:
-            logger.warning(f"Pas de date limite pour l'appel d'offre {appel_offre.id}")
-            return 50  # Score neutre si pas de date
-        
-        if not consultant.date_debut_dispo or not consultant.date_fin_dispo:
-            logger.warning(f"Dates de disponibilité manquantes pour consultant {consultant.id}")
-            return 0
-        
-        # Estimer la date de début du projet (30 jours avant la date limite)
-        date_limite = appel_offre.date_limite
-        estimated_project_start = date_limite - timedelta(days=30)
-        estimated_project_end = date_limite + timedelta(days=60)  # Estimer 60 jours après la date limite
-        
-        consultant_start = consultant.date_debut_dispo
-        consultant_end = consultant.date_fin_dispo
-        
-        # Cas où il n'y a pas de chevauchement
-        if consultant_end < estimated_project_start or consultant_start > estimated_project_end:
-            # Vérifier la proximité des dates (flexibilité)
-            buffer_days = 15  # Jours de tolérance
-            
-            if consultant_end < estimated_project_start:
-                days_gap = (estimated_project_start - consultant_end).days
-                if days_gap <= buffer_days:
-                    score = max(0, 25 * (1 - days_gap / buffer_days))
-                    _score_cache[cache_key] = score
-                    return score
-            else:
-                days_gap = (consultant_start - estimated_project_end).days
-                if days_gap <= buffer_days:
-                    score = max(0, 25 * (1 - days_gap / buffer_days))
-                    _score_cache[cache_key] = score
-                    return score
-            
-            _score_cache[cache_key] = 0
-            return 0
-        
-        # Cas où la disponibilité du consultant couvre entièrement le projet estimé
-        if consultant_start <= estimated_project_start and consultant_end >= estimated_project_end:
-            score = 100
-            _score_cache[cache_key] = score
-            return score
-        
-        # Calcul du chevauchement partiel
-        total_project_days = (estimated_project_end - estimated_project_start).days + 1
-        if total_project_days <= 0:
-            _score_cache[cache_key] = 50
-            return 50
-        
-        overlap_start = max(consultant_start, estimated_project_start)
-        overlap_end = min(consultant_end, estimated_project_end)
-        overlap_days = (overlap_end - overlap_start).days + 1
-        
-        coverage_percentage = (overlap_days / total_project_days) * 100
-        
-        if coverage_percentage >= 80:
-            adjusted_score = 85 + (coverage_percentage - 80) / 2
-        else:
-            adjusted_score = coverage_percentage * 0.85
-        
-        score = min(100, adjusted_score)
-        _score_cache[cache_key] = score
-        return score
-        
-    except Exception as e:
-        logger.error(f"Erreur lors du calcul du score de date: {str(e)}")
-        return 0
-
-
-def detect_domain_from_description(description):
-    """
-    Détecte le domaine principal à partir de la description de l'appel d'offre
-    """
-    if not description:
-        return 'DIGITAL', 0
-    
-    description_lower = description.lower()
-    domain_scores = {
-        'DIGITAL': 0,
-        'FINANCE': 0,
-        'ENERGIE': 0,
-        'INDUSTRIE': 0
-    }
-    
-    # Compter les occurrences de compétences par domaine
-    for domain, skills_list in ALL_SKILLS.items():
-        for skill in skills_list:
-            skill_lower = skill.lower()
-            if skill_lower in description_lower:
-                domain_scores[domain] += 1
-    
-    # Ajouter des mots-clés spécifiques par domaine
-    domain_keywords = {
-        'DIGITAL': ['digital', 'numérique', 'informatique', 'web', 'mobile', 'logiciel', 'application', 'système', 'technologie', 'développement'],
-        'FINANCE': ['finance', 'financier', 'banque', 'bancaire', 'comptabilité', 'audit', 'budget', 'investissement', 'crédit'],
-        'ENERGIE': ['énergie', 'énergétique', 'électricité', 'solaire', 'éolien', 'pétrole', 'gaz', 'renouvelable', 'transition'],
-        'INDUSTRIE': ['industrie', 'industriel', 'usine', 'production', 'fabrication', 'manufacture', 'mécanique', 'mines']
-    }
-    
-    for domain, keywords in domain_keywords.items():
-        for keyword in keywords:
-            if keyword in description_lower:
-                domain_scores[domain] += 2  # Poids plus fort pour les mots-clés généraux
-    
-    # Retourner le domaine avec le score le plus élevé
-    best_domain = max(domain_scores.items(), key=lambda x: x[1])
-    return best_domain[0], best_domain[1]
-
-
-def calculate_skills_match_score_updated(consultant, appel_offre):
-    """
-    Calcule un score basé sur les compétences du consultant par rapport aux critères du projet
-    ADAPTÉ pour le nouveau modèle AppelOffre scrapé
-    """
-    try:
-        cache_key = get_cache_key(consultant.id, appel_offre.id)
-        if cache_key in _score_cache:
-            return _score_cache[cache_key]
-        
-        # Récupérer les compétences du consultant
-        consultant_skills = list(
-            Competence.objects.filter(consultant=consultant).values_list('nom_competence', 'niveau')
-        )
-        
-        skills_dict = {skill_name.lower(): niveau for skill_name, niveau in consultant_skills}
-        
-        if not consultant_skills:
-            logger.warning(f"Le consultant {consultant.id} n'a aucune compétence définie")
-            _score_cache[cache_key] = 10
-            return 10
-        
-        # --- 1. SCORE DE DOMAINE (15% max) ---
-        detected_domain, domain_confidence = detect_domain_from_description(appel_offre.description)
-        
-        domain_score = 0
-        if consultant.domaine_principal == detected_domain:
-            domain_score = 15  # Correspondance parfaite
-            logger.info(f"Correspondance parfaite de domaine: {detected_domain}")
-        elif domain_confidence > 0:
-            # Correspondance partielle basée sur la confiance
-            domain_score = min(12, 15 * (domain_confidence / 10))
-        else:
-            domain_score = 8  # Score de base pour domaines différents
-        
-        # --- 2. SCORE D'EXPERTISE (15% max) ---
-        expertise_score = 0
-        if consultant.expertise == "Expert" or consultant.expertise == "Senior":
-            expertise_score = 15
-        elif consultant.expertise == "Intermédiaire":
-            expertise_score = 10
-        else:  # Débutant
-            expertise_score = 5
-        
-        # --- 3. SCORE DE COMPÉTENCES (70% max) ---
-        skills_score = 0
-        
-        # Utiliser les critères structurés s'ils existent
-        from .models import CriteresEvaluation
-        project_criteria = CriteresEvaluation.objects.filter(appel_offre=appel_offre)
-        
-        if project_criteria.exists():
-            logger.info(f"Utilisation des critères structurés pour l'AO {appel_offre.id}")
-            
-            total_weight = float(sum(float(criteria.poids) for criteria in project_criteria))
-            weighted_score = 0
-            
-            if total_weight > 0:
-                for criteria in project_criteria:
-                    normalized_weight = float(float(criteria.poids) / total_weight) * 70.0
-                    keyword = criteria.nom_critere.lower()
-                    
-                    best_match_score = 0
-                    for skill_name, niveau in skills_dict.items():
-                        match_score = get_competence_similarity(keyword, skill_name)
-                        if match_score > 0:
-                            match_score *= (0.7 + 0.3 * (niveau / 5))
-                            best_match_score = max(best_match_score, match_score)
-                    
-                    weighted_score += normalized_weight * best_match_score
-                
-                skills_score = min(70, weighted_score)
-        else:
-            # Analyse basée sur la description de l'appel d'offre
-            logger.info(f"Analyse basée sur la description pour l'AO {appel_offre.id}")
-            
-            if appel_offre.description:
-                # Extraire des compétences de la description
-                mentioned_skills = extract_skills_from_description(appel_offre.description)
-                
-                if len(mentioned_skills) >= 3:
-                    try:
-                        # Utiliser une méthode de calcul de similarité simple
-                        skills_score = calculate_alternative_score_updated(mentioned_skills, skills_dict)
-                    except Exception as e:
-                        logger.error(f"Erreur calcul compétences: {str(e)}")
-                        skills_score = calculate_alternative_score_updated(mentioned_skills, skills_dict)
-                else:
-                    skills_score = calculate_alternative_score_updated(mentioned_skills, skills_dict)
-            else:
-                # Pas de description détaillée
-                skills_score = 25  # Score réduit sans description
-        
-        # --- 4. CALCUL DU SCORE FINAL ---
-        final_score = domain_score + expertise_score + skills_score
-        
-        # Bonus pour les matchings très pertinents
-        if final_score > 70:
-            final_score = final_score * 1.1
-            final_score = min(100, final_score)
-        
-        # Ajustement pour éviter les scores trop bas
-        if final_score < 15:
-            final_score = 15
-        
-        _score_cache[cache_key] = final_score
-        
-        logger.info(f"Score final pour consultant {consultant.id}: {final_score:.2f}%")
-        return final_score
-        
-    except Exception as e:
-        logger.error(f"Erreur lors du calcul du score de compétences: {str(e)}")
-        return 20
-
-
 def extract_skills_from_description(description):
     """
     Extrait les compétences techniques de la description d'un appel d'offre
+    (compétences du référentiel + termes métier, sans doublons)
     """
     if not description:
         return []
     
-    description_lower = description.lower()
-    found_skills = []
-    
-    # Rechercher toutes les compétences connues dans la description
-    for domain, skills_list in ALL_SKILLS.items():
-        for skill in skills_list:
-            skill_lower = skill.lower()
-            if skill_lower in description_lower:
-                found_skills.append(skill_lower)
-    
-    # Ajouter des mots techniques généraux
-    technical_terms = [
-        'gestion', 'analyse', 'conseil', 'audit', 'formation', 'expertise',
-        'développement', 'conception', 'mise en œuvre', 'optimisation',
-        'stratégie', 'planification', 'coordination', 'supervision'
-    ]
-    
-    for term in technical_terms:
-        if term in description_lower:
-            found_skills.append(term)
-    
-    return list(set(found_skills))  # Supprimer les doublons
-
-
-def calculate_alternative_score_updated(mentioned_skills, consultant_skills_dict):
-    """
-    Méthode alternative de calcul du score quand TF-IDF ne peut pas être utilisé
-    """
-    try:
-        if not mentioned_skills:
-            return 35  # Score neutre
-        
-        matched_count = 0
-        matched_skills = set()
-        
-        for keyword in mentioned_skills:
-            best_match_score = 0
-            
-            for skill_name, niveau in consultant_skills_dict.items():
-                if keyword == skill_name:
-                    match_score = 1.0
-                elif keyword in skill_name or skill_name in keyword:
-                    match_score = 0.8
-                else:
-                    match_score = get_competence_similarity(keyword, skill_name)
-                
-                if match_score > 0:
-                    match_score *= (0.6 + 0.4 * (niveau / 5))
-                    best_match_score = max(best_match_score, match_score)
-            
-            if best_match_score > 0:
-                matched_count += best_match_score
-                matched_skills.add(keyword)
-        
-        match_ratio = matched_count / len(mentioned_skills) if mentioned_skills else 0
-        skills_score = min(70, 70 * match_ratio)
-        
-        logger.info(f"Score par analyse alternative: {skills_score:.2f}%")
-        return skills_score
-        
-    except Exception as e:
-        logger.error(f"Erreur dans le calcul alternatif: {str(e)}")
-        return 35
+    return analyze_description(description).mentioned_skills
 
 
 def get_competence_similarity(comp1, comp2):
     """
     Calcule la similarité entre deux compétences
+    (formes normalisées mémorisées, voir skill_similarity)
     """
-    import re
-    
-    comp1 = comp1.lower()
-    comp2 = comp2.lower()
-    
-    if comp1 == comp2:
-        return 1.0
-    
-    if comp1 in comp2 or comp2 in comp1:
-        ratio = min(len(comp1), len(comp2)) / max(len(comp1), len(comp2))
-        return 0.8 * ratio
-    
-    # Pour les technos avec version
-    base_comp1 = re.sub(r'\s+\d+(\.\d+)*', '', comp1)
-    base_comp2 = re.sub(r'\s+\d+(\.\d+)*', '', comp2)
-    
-    if base_comp1 == base_comp2:
-        return 0.9
-    
-    # Tokens communs
-    tokens1 = set(re.findall(r'\b\w+\b', comp1))
-    tokens2 = set(re.findall(r'\b\w+\b', comp2))
-    
-    if not tokens1 or not tokens2:
-        return 0
-        
-    common_tokens = tokens1.intersection(tokens2)
-    
-    if common_tokens:
-        jaccard = len(common_tokens) / len(tokens1.union(tokens2))
-        return 0.6 * jaccard
-    
-    return 0
+    return competence_similarity(comp1, comp2)
 
 
 def get_top_skills_updated(consultant, limit=5):
@@ -2450,84 +1989,48 @@ def generate_matching_for_offer_updated(appel_offre_id):
 
         logger.info(f"Génération de matchings pour l'appel d'offre scrapé: {appel_offre.titre}")
         
-        # Récupérer les consultants validés et disponibles
-        consultants = Consultant.objects.filter(
-            is_validated=True,
-            statut='Actif'
-        ).exclude(
-            date_debut_dispo=None
-        ).exclude(
-            date_fin_dispo=None
-        )
+        # Charger une seule fois le vivier (consultants + compétences) en mémoire
+        engine = MatchingEngine.load()
         
-        if not consultants.exists():
+        if not engine.consultants:
             logger.warning(f"Aucun consultant disponible pour le matching")
             return {
                 'success': False,
                 'error': "Aucun consultant disponible pour le matching"
             }
         
-        # Vider les anciens matchings
-        MatchingResult.objects.filter(appel_offre=appel_offre).delete()
-        logger.info(f"Anciens matchings supprimés pour l'AO {appel_offre_id}")
+        # Scorer tout le vivier en une passe (30% date, 70% compétences)
+        offer_scores = engine.score_offer(appel_offre)
         
-        # Vider le cache
-        clear_score_cache()
+        # Récupérer les compétences principales en une seule requête puis
+        # enregistrer tous les scores (upsert en une transaction)
+        top_skills = fetch_top_skills(engine.consultant_ids.tolist())
+        saved_matches = save_offer_scores(appel_offre, offer_scores, top_skills)
+        logger.info(f"{len(saved_matches)} matchings enregistrés pour l'AO {appel_offre_id}")
         
         results = []
-        score_stats = {"min": 100, "max": 0, "total": 0}
-        
-        # Calculer les scores pour chaque consultant
-        for consultant in consultants:
-            try:
-                # Calculer les scores avec les nouvelles méthodes
-                date_score = calculate_date_match_score_updated(consultant, appel_offre)
-                skills_score = calculate_skills_match_score_updated(consultant, appel_offre)
-                
-                # Pondération: 30% date, 70% compétences (plus d'importance aux compétences)
-                final_score = (date_score * 0.3) + (skills_score * 0.7)
-                final_score = min(100, final_score)
-                
-                # Mettre à jour les statistiques
-                score_stats["min"] = min(score_stats["min"], final_score)
-                score_stats["max"] = max(score_stats["max"], final_score)
-                score_stats["total"] += final_score
-                
-                logger.info(f"Score final pour {consultant.nom}: {final_score:.2f}%")
-                
-                # Enregistrer le résultat
-                matching = MatchingResult.objects.create(
-                    consultant=consultant,
-                    appel_offre=appel_offre,
-                    score=Decimal(str(final_score)),
-                    is_validated=False
-                )
-                
-                # Ajouter à la liste de résultats
-                results.append({
-                    'id': matching.id,
-                    'consultant_id': consultant.id,
-                    'consultant_name': f"{consultant.prenom} {consultant.nom}",
-                    'consultant_expertise': consultant.expertise or "Débutant",
-                    'email': consultant.email,
-                    'domaine_principal': consultant.domaine_principal,
-                    'specialite': consultant.specialite or "",
-                    'top_skills': get_top_skills_updated(consultant),
-                    'date_match_score': float(date_score),
-                    'skills_match_score': float(skills_score),
-                    'score': float(final_score),
-                    'is_validated': False
-                })
-                
-            except Exception as e:
-                logger.error(f"Erreur lors du calcul pour le consultant {consultant.id}: {str(e)}")
-                continue
+        for row in offer_scores.ranking():
+            consultant = engine.consultants[row]
+            match_id, is_validated = saved_matches[consultant.id]
+            
+            results.append({
+                'id': match_id,
+                'consultant_id': consultant.id,
+                'consultant_name': f"{consultant.prenom} {consultant.nom}",
+                'consultant_expertise': consultant.expertise or "Débutant",
+                'email': consultant.email,
+                'domaine_principal': consultant.domaine_principal,
+                'specialite': consultant.specialite or "",
+                'top_skills': top_skills.get(consultant.id, []),
+                'date_match_score': float(offer_scores.date_scores[row]),
+                'skills_match_score': float(offer_scores.skills_scores[row]),
+                'score': float(offer_scores.scores[row]),
+                'is_validated': is_validated
+            })
         
         # Calculer les statistiques finales
+        score_stats = offer_scores.stats()
         if results:
-            score_stats["avg"] = score_stats["total"] / len(results)
-            score_stats["count"] = len(results)
-            
             logger.info(f"Matchings générés: {len(results)}, score moyen: {score_stats['avg']:.2f}%")
         
         # Trier les résultats par score décroissant
@@ -2591,43 +2094,34 @@ def matching_for_offer_updated(request, appel_offre_id):
                     'error': f"Appel d'offre avec ID {appel_offre_id} introuvable"
                 }, status=404)
 
-            # Récupérer tous les matchings pour cet appel d'offre
-            matches = MatchingResult.objects.filter(
-                appel_offre_id=appel_offre_id
-            ).order_by('-score')
+            # Lecture seule: scores et compétences principales stockés à la
+            # génération (la cohérence est vérifiée par reconcile_matching)
+            matches = list(
+                MatchingResult.objects.filter(
+                    appel_offre_id=appel_offre_id
+                ).select_related('consultant').only(
+                    'id', 'score', 'date_score', 'skills_score', 'top_skills', 'is_validated',
+                    'consultant__id', 'consultant__prenom', 'consultant__nom', 'consultant__email',
+                    'consultant__expertise', 'consultant__domaine_principal', 'consultant__specialite'
+                ).order_by('-score')
+            )
 
-            logger.info(f"{matches.count()} matchings trouvés pour l'AO scrapé {appel_offre_id}")
+            logger.info(f"{len(matches)} matchings trouvés pour l'AO scrapé {appel_offre_id}")
 
-            if not matches.exists():
+            if not matches:
                 return Response({
                     'success': True,
                     'matches': []
                 })
 
+            # Matchings antérieurs au stockage des compétences: une seule requête
+            missing_skills = [match.consultant_id for match in matches if not match.top_skills]
+            fallback_skills = fetch_top_skills(missing_skills) if missing_skills else {}
+
             result = []
             for match in matches:
                 consultant = match.consultant
-
-                try:
-                    # Recalculer les scores si nécessaire
-                    date_score = calculate_date_match_score_updated(consultant, match.appel_offre)
-                    skills_score = calculate_skills_match_score_updated(consultant, match.appel_offre)
-                    calculated_score = (date_score * 0.3) + (skills_score * 0.7)
-                    stored_score = float(match.score)
-                    
-                    # Vérifier la cohérence
-                    if abs(calculated_score - stored_score) > 5:
-                        match.score = Decimal(str(calculated_score))
-                        match.save(update_fields=['score'])
-                        stored_score = calculated_score
-                        
-                except Exception as e:
-                    logger.error(f"Erreur lors du recalcul des scores: {str(e)}")
-                    date_score = 0
-                    skills_score = 0
-                    stored_score = float(match.score)
-
-                stored_score = max(0, min(100, float(stored_score)))
+                stored_score = max(0, min(100, float(match.score)))
 
                 result.append({
                     'id': match.id,
@@ -2637,9 +2131,9 @@ def matching_for_offer_updated(request, appel_offre_id):
                     'email': consultant.email,
                     'domaine_principal': consultant.domaine_principal,
                     'specialite': consultant.specialite or "",
-                    'top_skills': get_top_skills_updated(consultant),
-                    'date_match_score': round(date_score, 1),
-                    'skills_match_score': round(skills_score, 1),
+                    'top_skills': match.top_skills or fallback_skills.get(consultant.id, []),
+                    'date_match_score': round(float(match.date_score or 0), 1),
+                    'skills_match_score': round(float(match.skills_score or 0), 1),
                     'score': stored_score,
                     'is_validated': match.is_validated
                 })
@@ -2662,8 +2156,6 @@ def matching_for_offer_updated(request, appel_offre_id):
         try:
             logger.info(f"Génération de nouveaux matchings pour l'AO scrapé {appel_offre_id}")
             
-            clear_score_cache()
-            
             result = generate_matching_for_offer_updated(appel_offre_id)
 
             if not isinstance(result, dict):
@@ -2702,6 +2194,76 @@ def matching_for_offer_updated(request, appel_offre_id):
             'error': f"Méthode {request.method} non supportée"
         }, status=405)
 
+@api_view(['GET'])
+def top_matching_for_offer(request, appel_offre_id):
+    """
+    Les k meilleurs consultants pour un appel d'offre (?k=N, 10 par défaut)
+    Calcul à la volée sans scorer tout le vivier, sans écriture en base
+    """
+    try:
+        k = int(request.query_params.get('k', 10))
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': "Paramètre k invalide"
+        }, status=400)
+    k = max(1, min(k, 100))
+
+    try:
+        try:
+            appel_offre = AppelOffre.objects.get(id=appel_offre_id)
+        except AppelOffre.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': f"Appel d'offre avec ID {appel_offre_id} introuvable"
+            }, status=404)
+
+        # Vivier partagé par les requêtes du processus (rechargé s'il a changé)
+        engine = get_shared_engine()
+        candidates = engine.top_candidates(appel_offre, k)
+
+        consultant_ids = [engine.consultants[row].id for row, _, _, _ in candidates]
+        top_skills = fetch_top_skills(consultant_ids)
+        stored_matches = {
+            consultant_id: (match_id, is_validated)
+            for consultant_id, match_id, is_validated in MatchingResult.objects.filter(
+                appel_offre=appel_offre, consultant_id__in=consultant_ids
+            ).values_list('consultant_id', 'id', 'is_validated')
+        }
+
+        results = []
+        for row, score, date_score, skills_score in candidates:
+            consultant = engine.consultants[row]
+            match_id, is_validated = stored_matches.get(consultant.id, (None, False))
+            results.append({
+                'id': match_id,
+                'consultant_id': consultant.id,
+                'consultant_name': f"{consultant.prenom} {consultant.nom}",
+                'consultant_expertise': consultant.expertise or "Débutant",
+                'email': consultant.email,
+                'domaine_principal': consultant.domaine_principal,
+                'specialite': consultant.specialite or "",
+                'top_skills': top_skills.get(consultant.id, []),
+                'date_match_score': round(date_score, 1),
+                'skills_match_score': round(skills_score, 1),
+                'score': score,
+                'is_validated': is_validated
+            })
+
+        return Response({
+            'success': True,
+            'k': k,
+            'total_consultants': len(engine.consultants),
+            'matches': results
+        })
+
+    except Exception as e:
+        logger.error(f"Erreur lors du calcul du top {k} pour l'AO {appel_offre_id}: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
 def create_notification_for_consultant(consultant, notification_type, title, content, appel_offre=None, match=None):
     """
     Fonction helper pour créer des notifications de manière sécurisée
@@ -2824,7 +2386,9 @@ def validate_match(request, match_id):
 
         # Inverser l'état de validation
         match.is_validated = not match.is_validated
-        match.save()
+        with transaction.atomic():
+            match.save()
+            record_validation(match, consultant, match.is_validated)
 
         notification_created = False
         mission_created = False
@@ -3191,71 +2755,10 @@ def bulk_enrich_appels_offres(request):
 def appels_offres_stats(request):
     """
     NOUVEAU: Statistiques sur les appels d'offres scrapés
+    (agrégations groupées, mises en cache: voir dashboard_stats.py)
     """
     try:
-        from django.db.models import Count, Q
-        from django.utils import timezone
-        
-        # Statistiques de base
-        total_appels = AppelOffre.objects.count()
-        
-        # Appels actifs (date limite non dépassée ou non définie)
-        now = timezone.now().date()
-        appels_actifs = AppelOffre.objects.filter(
-            Q(date_limite__gte=now) | Q(date_limite__isnull=True)
-        ).count()
-        
-        # Appels expirés
-        appels_expires = AppelOffre.objects.filter(date_limite__lt=now).count()
-        
-        # Appels enrichis (avec description et critères)
-        appels_enrichis = AppelOffre.objects.filter(
-            description__isnull=False,
-            critere_evaluation__isnull=False
-        ).exclude(description='').exclude(critere_evaluation='').count()
-        
-        # Appels avec critères structurés
-        appels_avec_criteres = AppelOffre.objects.annotate(
-            criteria_count=Count('criteres')
-        ).filter(criteria_count__gt=0).count()
-        
-        # Statistiques par type
-        stats_par_type = AppelOffre.objects.values('type_d_appel_d_offre').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        # Statistiques par client
-        stats_par_client = AppelOffre.objects.values('client').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]  # Top 10 clients
-        
-        # Appels récents (7 derniers jours)
-        week_ago = now - timedelta(days=7)
-        appels_recents = AppelOffre.objects.filter(created_at__gte=week_ago).count()
-        
-        response_data = {
-            'totals': {
-                'total_appels': total_appels,
-                'appels_actifs': appels_actifs,
-                'appels_expires': appels_expires,
-                'appels_enrichis': appels_enrichis,
-                'appels_avec_criteres': appels_avec_criteres,
-                'appels_recents': appels_recents
-            },
-            'percentages': {
-                'taux_enrichissement': (appels_enrichis / total_appels * 100) if total_appels > 0 else 0,
-                'taux_criteres_structures': (appels_avec_criteres / total_appels * 100) if total_appels > 0 else 0,
-                'taux_actifs': (appels_actifs / total_appels * 100) if total_appels > 0 else 0
-            },
-            'repartition_types': list(stats_par_type),
-            'top_clients': list(stats_par_client),
-            'periode_analyse': {
-                'date_analyse': now.isoformat(),
-                'periode_recente': f"{week_ago.isoformat()} - {now.isoformat()}"
-            }
-        }
-        
-        return Response(response_data)
+        return Response(get_appels_offres_stats())
         
     except Exception as e:
         logger.error(f"Erreur dans appels_offres_stats: {str(e)}")
@@ -3727,12 +3230,8 @@ def admin_consultants_fixed(request):
     """
     try:
         if request.method == 'GET':
-            from django.db import connection
-            
-            # Vérifier les champs existants
-            with connection.cursor() as cursor:
-                cursor.execute("DESCRIBE consultants_consultant")
-                existing_fields = {row[0] for row in cursor.fetchall()}
+            # Vérifier les champs existants (structure lue une fois par processus)
+            existing_fields = get_table_columns(Consultant)
             
             # Champs de base qui doivent exister
             base_fields = [
@@ -3812,16 +3311,7 @@ def admin_consultants_fixed(request):
 # SOLUTION TEMPORAIRE : Fonction utilitaire pour vérifier les champs existants
 def get_existing_fields():
     """Utilitaire pour vérifier quels champs existent dans la table consultant"""
-    from django.db import connection
-    
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("DESCRIBE consultants_consultant")
-            existing_fields = {row[0] for row in cursor.fetchall()}
-        return existing_fields
-    except Exception as e:
-        logger.error(f"Erreur vérification champs: {e}")
-        return set()
+    return set(get_table_columns(Consultant))
 @api_view(['PUT'])
 def admin_validate_consultant(request, pk):
     """
@@ -4368,6 +3858,12 @@ def debug_consultant_missions(request, consultant_id):
         return Response({"error": str(e)}, status=500)
 
 
+@api_view(['GET'])
+def debug_loaded_models(request):
+    """Dépendances lourdes chargées par ce processus et durée de chargement"""
+    return Response({'pid': os.getpid(), 'models': load_timings()})
+
+
 @api_view(['GET'])
 def debug_matching_status(request, consultant_id=None, appel_offre_id=None):
     """
@@ -4996,311 +4492,39 @@ def cleanup_missing_files(request):
         'recent_documents': recent_docs_data
     })
     
-# Ajoutez cette fonction de débogage
 def analyze_matching_performance():
     """
     Analyse la performance des algorithmes de matching
-    en comparant les prédictions avec les validations manuelles.
-    Cette fonction peut être exécutée périodiquement pour ajuster les paramètres.
+    en comparant les prédictions avec les validations manuelles
+    (compteurs matérialisés et requêtes groupées: voir matching_analytics.py)
     """
     try:
-        # Récupérer tous les matchings avec leurs statuts de validation
-        matchings = MatchingResult.objects.all()
-        
-        # Séparer les matchings validés et non validés
-        validated = matchings.filter(is_validated=True)
-        non_validated = matchings.filter(is_validated=False)
-        
-        # Si pas assez de données pour l'analyse, sortir
-        if validated.count() < 5:
-            logger.info("Pas assez de matchings validés pour analyser la performance")
-            return {
-                'success': False,
-                'message': "Données insuffisantes pour l'analyse"
-            }
-        
-        # Analyse des scores moyens
-        avg_validated_score = validated.aggregate(models.Avg('score'))['score__avg']
-        avg_non_validated_score = non_validated.aggregate(models.Avg('score'))['score__avg']
-        
-        # Récupérer les appels d'offre avec au moins un matching validé
-        appels_with_validated = AppelOffre.objects.filter(
-            matchings__is_validated=True
-        ).distinct()
-        
-        performance_by_domain = {}
-        performance_by_expertise = {}
-        
-        # Analyse par domaine
-        for domain, _ in Consultant.SPECIALITES_CHOICES:
-            domain_validated = validated.filter(consultant__domaine_principal=domain).count()
-            domain_total = matchings.filter(consultant__domaine_principal=domain).count()
-            
-            if domain_total > 0:
-                domain_ratio = domain_validated / domain_total
-                performance_by_domain[domain] = {
-                    'validated': domain_validated,
-                    'total': domain_total,
-                    'ratio': domain_ratio
-                }
-        
-        # Analyse par niveau d'expertise
-        expertise_levels = ['Débutant', 'Intermédiaire', 'Expert']
-        for level in expertise_levels:
-            level_validated = validated.filter(consultant__expertise=level).count()
-            level_total = matchings.filter(consultant__expertise=level).count()
-            
-            if level_total > 0:
-                level_ratio = level_validated / level_total
-                performance_by_expertise[level] = {
-                    'validated': level_validated,
-                    'total': level_total,
-                    'ratio': level_ratio
-                }
-        
-        # Analyse détaillée des matchings validés vs. non validés
-        detailed_analysis = []
-        
-        for appel in appels_with_validated:
-            appel_validated = validated.filter(appel_offre=appel)
-            appel_non_validated = non_validated.filter(appel_offre=appel)
-            
-            # Score moyen des validés pour cet appel
-            avg_score_validated = appel_validated.aggregate(models.Avg('score'))['score__avg'] or 0
-            
-            # Comparer les compétences des consultants validés vs. non validés
-            validated_consultants = Consultant.objects.filter(id__in=appel_validated.values_list('consultant_id', flat=True))
-            non_validated_consultants = Consultant.objects.filter(id__in=appel_non_validated.values_list('consultant_id', flat=True))
-            
-            # Compétences communes chez les validés
-            common_skills = {}
-            
-            for consultant in validated_consultants:
-                skills = Competence.objects.filter(consultant=consultant).values_list('nom_competence', flat=True)
-                for skill in skills:
-                    skill_lower = skill.lower()
-                    if skill_lower in common_skills:
-                        common_skills[skill_lower] += 1
-                    else:
-                        common_skills[skill_lower] = 1
-            
-            # Trouver les compétences les plus fréquentes chez les validés
-            top_skills = sorted(common_skills.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            detailed_analysis.append({
-                'appel_offre_id': appel.id,
-                'appel_offre_name': appel.nom_projet,
-                'validated_count': appel_validated.count(),
-                'non_validated_count': appel_non_validated.count(),
-                'avg_score_validated': avg_score_validated,
-                'top_skills': [skill for skill, count in top_skills]
-            })
-        
-        # Recommandations basées sur l'analyse
-        recommendations = []
-        
-        # Si l'écart entre les scores validés et non validés est faible
-        if avg_validated_score and avg_non_validated_score:
-            score_diff = avg_validated_score - avg_non_validated_score
-            
-            if score_diff < 10:
-                recommendations.append(
-                    "L'écart entre les scores des matchings validés et non validés est faible. "
-                    "Il est recommandé d'ajuster les pondérations de l'algorithme de matching."
-                )
-        
-        # Recommandations par domaine
-        for domain, perf in performance_by_domain.items():
-            if perf['ratio'] < 0.2 and perf['total'] > 10:
-                domain_name = dict(Consultant.SPECIALITES_CHOICES)[domain]
-                recommendations.append(
-                    f"Faible taux de validation pour le domaine {domain_name} ({perf['ratio']*100:.1f}%). "
-                    "Les critères spécifiques à ce domaine pourraient nécessiter une révision."
-                )
-        
-        # Recommandations par expertise
-        for level, perf in performance_by_expertise.items():
-            if perf['ratio'] < 0.2 and perf['total'] > 10:
-                recommendations.append(
-                    f"Faible taux de validation pour les consultants de niveau {level} ({perf['ratio']*100:.1f}%). "
-                    "Ajustez potentiellement l'impact du niveau d'expertise dans le calcul du score."
-                )
-        
-        result = {
-            'success': True,
-            'stats': {
-                'total_matchings': matchings.count(),
-                'validated_matchings': validated.count(),
-                'validation_rate': validated.count() / matchings.count() if matchings.count() > 0 else 0,
-                'avg_validated_score': avg_validated_score,
-                'avg_non_validated_score': avg_non_validated_score
-            },
-            'performance_by_domain': performance_by_domain,
-            'performance_by_expertise': performance_by_expertise,
-            'detailed_analysis': detailed_analysis,
-            'recommendations': recommendations
-        }
-        
-        logger.info(f"Analyse de performance du matching complétée: {len(recommendations)} recommandations générées")
-        return result
+        return get_matching_analytics()
     except Exception as e:
         logger.error(f"Erreur lors de l'analyse de performance: {str(e)}")
         return {
             'success': False,
             'error': str(e)
         }
-def analyze_matching_performance():
+
+
+@api_view(['GET'])
+def matching_analytics(request):
     """
-    Analyse la performance des algorithmes de matching
-    en comparant les prédictions avec les validations manuelles.
-    Cette fonction peut être exécutée périodiquement pour ajuster les paramètres.
+    Analyse du matching en cache
+    ?refresh=1: recalcul immédiat, ?rebuild=1: recalcul des compteurs de validation
     """
     try:
-        # Récupérer tous les matchings avec leurs statuts de validation
-        matchings = MatchingResult.objects.all()
-        
-        # Séparer les matchings validés et non validés
-        validated = matchings.filter(is_validated=True)
-        non_validated = matchings.filter(is_validated=False)
-        
-        # Si pas assez de données pour l'analyse, sortir
-        if validated.count() < 5:
-            logger.info("Pas assez de matchings validés pour analyser la performance")
-            return {
-                'success': False,
-                'message': "Données insuffisantes pour l'analyse"
-            }
-        
-        # Analyse des scores moyens
-        avg_validated_score = validated.aggregate(models.Avg('score'))['score__avg']
-        avg_non_validated_score = non_validated.aggregate(models.Avg('score'))['score__avg']
-        
-        # Récupérer les appels d'offre avec au moins un matching validé
-        appels_with_validated = AppelOffre.objects.filter(
-            matchings__is_validated=True
-        ).distinct()
-        
-        performance_by_domain = {}
-        performance_by_expertise = {}
-        
-        # Analyse par domaine
-        for domain, _ in Consultant.SPECIALITES_CHOICES:
-            domain_validated = validated.filter(consultant__domaine_principal=domain).count()
-            domain_total = matchings.filter(consultant__domaine_principal=domain).count()
-            
-            if domain_total > 0:
-                domain_ratio = domain_validated / domain_total
-                performance_by_domain[domain] = {
-                    'validated': domain_validated,
-                    'total': domain_total,
-                    'ratio': domain_ratio
-                }
-        
-        # Analyse par niveau d'expertise
-        expertise_levels = ['Débutant', 'Intermédiaire', 'Expert']
-        for level in expertise_levels:
-            level_validated = validated.filter(consultant__expertise=level).count()
-            level_total = matchings.filter(consultant__expertise=level).count()
-            
-            if level_total > 0:
-                level_ratio = level_validated / level_total
-                performance_by_expertise[level] = {
-                    'validated': level_validated,
-                    'total': level_total,
-                    'ratio': level_ratio
-                }
-        
-        # Analyse détaillée des matchings validés vs. non validés
-        detailed_analysis = []
-        
-        for appel in appels_with_validated:
-            appel_validated = validated.filter(appel_offre=appel)
-            appel_non_validated = non_validated.filter(appel_offre=appel)
-            
-            # Score moyen des validés pour cet appel
-            avg_score_validated = appel_validated.aggregate(models.Avg('score'))['score__avg'] or 0
-            
-            # Comparer les compétences des consultants validés vs. non validés
-            validated_consultants = Consultant.objects.filter(id__in=appel_validated.values_list('consultant_id', flat=True))
-            non_validated_consultants = Consultant.objects.filter(id__in=appel_non_validated.values_list('consultant_id', flat=True))
-            
-            # Compétences communes chez les validés
-            common_skills = {}
-            
-            for consultant in validated_consultants:
-                skills = Competence.objects.filter(consultant=consultant).values_list('nom_competence', flat=True)
-                for skill in skills:
-                    skill_lower = skill.lower()
-                    if skill_lower in common_skills:
-                        common_skills[skill_lower] += 1
-                    else:
-                        common_skills[skill_lower] = 1
-            
-            # Trouver les compétences les plus fréquentes chez les validés
-            top_skills = sorted(common_skills.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            detailed_analysis.append({
-                'appel_offre_id': appel.id,
-                'appel_offre_name': appel.nom_projet,
-                'validated_count': appel_validated.count(),
-                'non_validated_count': appel_non_validated.count(),
-                'avg_score_validated': avg_score_validated,
-                'top_skills': [skill for skill, count in top_skills]
-            })
-        
-        # Recommandations basées sur l'analyse
-        recommendations = []
-        
-        # Si l'écart entre les scores validés et non validés est faible
-        if avg_validated_score and avg_non_validated_score:
-            score_diff = avg_validated_score - avg_non_validated_score
-            
-            if score_diff < 10:
-                recommendations.append(
-                    "L'écart entre les scores des matchings validés et non validés est faible. "
-                    "Il est recommandé d'ajuster les pondérations de l'algorithme de matching."
-                )
-        
-        # Recommandations par domaine
-        for domain, perf in performance_by_domain.items():
-            if perf['ratio'] < 0.2 and perf['total'] > 10:
-                domain_name = dict(Consultant.SPECIALITES_CHOICES)[domain]
-                recommendations.append(
-                    f"Faible taux de validation pour le domaine {domain_name} ({perf['ratio']*100:.1f}%). "
-                    "Les critères spécifiques à ce domaine pourraient nécessiter une révision."
-                )
-        
-        # Recommandations par expertise
-        for level, perf in performance_by_expertise.items():
-            if perf['ratio'] < 0.2 and perf['total'] > 10:
-                recommendations.append(
-                    f"Faible taux de validation pour les consultants de niveau {level} ({perf['ratio']*100:.1f}%). "
-                    "Ajustez potentiellement l'impact du niveau d'expertise dans le calcul du score."
-                )
-        
-        result = {
-            'success': True,
-            'stats': {
-                'total_matchings': matchings.count(),
-                'validated_matchings': validated.count(),
-                'validation_rate': validated.count() / matchings.count() if matchings.count() > 0 else 0,
-                'avg_validated_score': avg_validated_score,
-                'avg_non_validated_score': avg_non_validated_score
-            },
-            'performance_by_domain': performance_by_domain,
-            'performance_by_expertise': performance_by_expertise,
-            'detailed_analysis': detailed_analysis,
-            'recommendations': recommendations
-        }
-        
-        logger.info(f"Analyse de performance du matching complétée: {len(recommendations)} recommandations générées")
-        return result
+        rebuild = request.query_params.get('rebuild') in ('1', 'true')
+        if rebuild:
+            rebuild_validation_counters()
+        analytics = get_matching_analytics(
+            refresh=rebuild or request.query_params.get('refresh') in ('1', 'true')
+        )
+        return Response(analytics)
     except Exception as e:
-        logger.error(f"Erreur lors de l'analyse de performance: {str(e)}")
-        return {
-            'success': False,
-            'error': str(e)
-        }
+        logger.error(f"Erreur dans matching_analytics: {str(e)}")
+        return Response({'success': False, 'error': str(e)}, status=500)
 @api_view(['GET'])
 def debug_skills_match(request, consultant_id, appel_offre_id):
     """
@@ -5381,11 +4605,9 @@ def calculate_semantic_skills_score(consultant, appel_offre):
     """
     Analyse sémantique améliorée pour les compétences
     """
-    # Importer spaCy pour l'analyse sémantique
-    try:
-        import spacy
-        nlp = spacy.load("fr_core_news_md")  # Modèle français moyen
-    except:
+    # Modèle français moyen, chargé une fois par processus
+    nlp = get_spacy_model("fr_core_news_md")
+    if nlp is None:
         # Fallback si spaCy n'est pas disponible
         return calculate_alternative_skills_score(consultant, appel_offre)
     
@@ -5516,6 +4738,11 @@ def update_consultant_profile(request, consultant_id):
                     except Exception as user_error:
                         logger.error(f"Erreur mise à jour utilisateur: {user_error}")
                 
+                # Nouveau CV: extraction des compétences en arrière-plan
+                cv_job = None
+                if 'cv' in updated_fields and updated_consultant.cv:
+                    cv_job = extract_and_save_competences_async(updated_consultant.cv.path, updated_consultant)
+
                 # Récupérer les compétences pour la réponse
                 competences = Competence.objects.filter(consultant=updated_consultant)
                 competences_list = [c.nom_competence for c in competences]
@@ -5543,7 +4770,8 @@ def update_consultant_profile(request, consultant_id):
                 return Response({
                     "success": True,
                     "message": "Profil mis à jour avec succès",
-                    "data": response_data
+                    "data": response_data,
+                    "cv_job_id": cv_job.id if cv_job else None
                 }, status=200)
                 
             except Exception as save_error:
@@ -6891,16 +6119,9 @@ def get_all_consultants(request):
         
 def check_field_exists(table_name, field_name):
     """
-    Vérifie si un champ existe dans une table
+    Vérifie si un champ existe dans une table (sans requête après la première lecture)
     """
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute(f"SHOW COLUMNS FROM {table_name}")
-            existing_fields = {row[0] for row in cursor.fetchall()}
-            return field_name in existing_fields
-    except Exception as e:
-        logger.error(f"Erreur lors de la vérification du champ {field_name}: {e}")
-        return False
+    return has_field(table_name, field_name)
 
 
 def safe_get_field_value(obj, field_name, fallback_field=None, default=None):
@@ -7041,12 +6262,14 @@ from rest_framework.response import Response
 
 from .models import Consultant, Competence
 from .competences_data import ALL_SKILLS
+from .skill_index import TechnicalContext, find_skill_occurrences, get_cv_skill_catalog
 
 logger = logging.getLogger(__name__)
 
 def extract_competences(text, domain_principale=None):
     """
     Version finale améliorée de l'extraction de compétences avec filtrage intelligent
+    (un seul parcours du texte par l'automate du référentiel, voir skill_index)
     """
     if not text or len(text.strip()) < 10:
         logger.warning("Texte vide ou trop court pour l'extraction")
@@ -7059,78 +6282,53 @@ def extract_competences(text, domain_principale=None):
     
     logger.info(f"Début extraction sur {len(text)} caractères de texte")
     
-    # Liste élargie des mots à ignorer (faux positifs fréquents)
-    mots_ignores = {
-        # Mots trop courts ou ambigus
-        'ar', 'or', 'ai', 'go', 'r', 'c', 's3', 'ux', 'ui', 'db', 'os', 'it', 'is', 'in', 'on', 
-        'at', 'to', 'of', 'as', 'by', 'an', 'be', 'we', 'he', 'me', 'my', 'so', 'up', 'if',
-        # Acronymes Mauritaniens ou contextuels non-techniques
-        'ets', 'eu ets', 'ges', 'gsm', 'cad', 'bp mauritanie', 'or mauritanie', 'bp', 'mr',
-        # Mots français courants
-        'et', 'ou', 'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'dans', 'sur', 'avec',
-        'pour', 'par', 'sans', 'sous', 'vers', 'chez', 'entre', 'depuis', 'pendant',
-        # Prépositions et conjonctions anglaises
-        'and', 'but', 'for', 'nor', 'yet', 'the', 'a', 'an', 'this', 'that', 'these', 'those'
-    }
+    # Toutes les occurrences des compétences et de leurs variantes en un parcours
+    # (mots ignorés et compétences courtes hors liste blanche déjà écartés)
+    skills_by_domain, _ = get_cv_skill_catalog()
+    occurrences = find_skill_occurrences(text_clean)
+    context = None
+    valid_contexts = {}
     
-    # Compétences techniques valides courtes (exceptions à garder)
-    competences_courtes_valides = {
-        'sql', 'php', 'css', 'xml', 'api', 'aws', 'gcp', 'iot', 'erp', 'crm', 'seo', 'sap',
-        'html', 'java', 'git', 'npm', 'vue', 'tdd', 'bdd', 'mvp', 'agile', 'scrum', 'ci/cd',
-        'rest', 'soap', 'json', 'ajax', 'cors', 'jwt', 'ssl', 'tls', 'ssh', 'ftp', 'http',
-        'tcp', 'udp', 'dns', 'dhcp', 'vpn', 'lan', 'wan', 'cdn', 'orm', 'mvc', 'spa'
-    }
+    def found_in_context(pattern):
+        nonlocal context
+        if pattern not in occurrences:
+            return False
+        if pattern not in valid_contexts:
+            # Index des mots-clés de contexte construit au premier besoin
+            if context is None:
+                context = TechnicalContext(text_clean)
+            valid_contexts[pattern] = context.is_valid(pattern, occurrences[pattern])
+        return valid_contexts[pattern]
     
     # Parcourir chaque domaine et ses compétences
-    for domain, skills_list in ALL_SKILLS.items():
+    for domain, (skills_count, catalog_skills) in skills_by_domain.items():
         domain_score = 0
         domain_competences = []
         
-        for skill in skills_list:
-            skill_lower = skill.lower().strip()
+        for catalog_skill in catalog_skills:
+            skill = catalog_skill.skill
             
-            # Ignorer les mots de la liste noire
-            if skill_lower in mots_ignores:
+            # Recherche exacte avec vérification de contexte
+            if found_in_context(catalog_skill.lower):
+                competences_trouvees.add(skill)
+                domain_competences.append(skill)
+                domain_score += 1
+                logger.debug(f"Compétence trouvée (exacte): {skill}")
                 continue
             
-            # Pour les compétences courtes, vérifier si c'est une exception valide
-            if len(skill_lower) <= 3:
-                if skill_lower not in competences_courtes_valides:
-                    continue
-            
-            # Recherche exacte avec vérification de contexte
-            if skill_lower in text_clean:
-                if is_valid_technical_context(text_clean, skill_lower):
+            # Recherche avec variations (compétences de plus de 3 caractères)
+            for variant in catalog_skill.variants:
+                if found_in_context(variant):
                     competences_trouvees.add(skill)
                     domain_competences.append(skill)
-                    domain_score += 1
-                    logger.debug(f"Compétence trouvée (exacte): {skill}")
-                    continue
-            
-            # Recherche avec variations pour les compétences de plus de 3 caractères
-            if len(skill_lower) > 3:
-                skill_variants = [
-                    skill_lower.replace(' ', ''),
-                    skill_lower.replace(' ', '-'),
-                    skill_lower.replace(' ', '.'),
-                    skill_lower.replace('-', ' '),
-                    skill_lower.replace('.', ' '),
-                    skill_lower.replace('_', ' '),
-                    skill_lower.replace('/', ' ')
-                ]
-                
-                for variant in skill_variants:
-                    if variant in text_clean and is_valid_technical_context(text_clean, variant):
-                        competences_trouvees.add(skill)
-                        domain_competences.append(skill)
-                        domain_score += 0.8
-                        logger.debug(f"Compétence trouvée (variante): {skill}")
-                        break
+                    domain_score += 0.8
+                    logger.debug(f"Compétence trouvée (variante): {skill}")
+                    break
         
         domain_scores[domain] = {
             'score': domain_score,
             'competences': domain_competences,
-            'pourcentage': (domain_score / len(skills_list)) * 100 if skills_list else 0
+            'pourcentage': (domain_score / skills_count) * 100 if skills_count else 0
         }
         
         logger.info(f"Domaine {domain}: {domain_score} compétences trouvées ({len(domain_competences)} uniques)")
@@ -7155,60 +6353,24 @@ def extract_competences(text, domain_principale=None):
     return competences_filtrees, domain_principal
 
 
-def is_valid_technical_context(text, skill):
+def is_valid_technical_context(text, skill, context=None):
     """
     Vérifie si une compétence est dans un contexte technique valide
-    Version améliorée avec plus de mots-clés de contexte
-    """
-    # Mots-clés qui indiquent un contexte technique valide
-    context_keywords = [
-        # Développement et programmation
-        'développement', 'programmation', 'langage', 'framework', 'technologie',
-        'compétence', 'skill', 'experience', 'projet', 'utilisation', 'maîtrise',
-        'connaissance', 'expertise', 'formation', 'certification', 'outils',
-        'logiciel', 'software', 'development', 'programming', 'language',
-        'stack', 'tech', 'tools', 'environment', 'platform', 'api', 'database',
-        
-        # Contexte professionnel
-        'projet', 'mission', 'travail', 'emploi', 'poste', 'responsabilité',
-        'réalisation', 'conception', 'développé', 'implémenté', 'utilisé',
-        'géré', 'administré', 'configuré', 'déployé', 'maintenu',
-        
-        # Formation et certifications
-        'formation', 'cours', 'apprentissage', 'certification', 'diplôme',
-        'étude', 'université', 'école', 'institut', 'académie', 'bootcamp',
-        
-        # Contexte technique spécifique
-        'web', 'mobile', 'cloud', 'data', 'analyse', 'système', 'réseau',
-        'sécurité', 'base', 'données', 'serveur', 'client', 'backend', 'frontend'
-    ]
-    
-    # Chercher le skill dans le texte avec un contexte de 100 caractères avant et après
-    import re
-    pattern = rf'.{{0,100}}{re.escape(skill)}.{{0,100}}'
-    matches = re.finditer(pattern, text, re.IGNORECASE)
-    
-    for match in matches:
-        context = match.group().lower()
-        # Si on trouve un mot-clé de contexte technique, c'est valide
-        if any(keyword in context for keyword in context_keywords):
-            return True
-    
-    # Pour les compétences très spécifiques (plus de 5 caractères), 
-    # on peut être moins strict sur le contexte
-    if len(skill) > 5:
-        return True
-    
-    # Pour les compétences courtes mais très techniques
-    technical_skills = {
-        'sql', 'php', 'css', 'html', 'java', 'python', 'react', 'angular', 'vue',
-        'git', 'docker', 'aws', 'azure', 'api', 'rest', 'json', 'xml'
-    }
+    (mot-clé de contexte à moins de 100 caractères sur la même ligne,
+    recherché dans l'index des positions, voir skill_index.TechnicalContext)
+    """
+    text = text.lower()
+    skill = skill.lower()
+    if context is None:
+        context = TechnicalContext(text)
     
-    if skill in technical_skills:
-        return True
+    starts = []
+    position = text.find(skill)
+    while position != -1:
+        starts.append(position)
+        position = text.find(skill, position + 1)
     
-    return False
+    return context.is_valid(skill, starts)
     """
     Version corrigée et intelligente de l'extraction de compétences
     """
@@ -7369,14 +6531,28 @@ def extract_competences_from_cv(file_path):
         return [], 'DIGITAL'
     
     try:
+        # CV déjà traité: recherche par empreinte SHA-256 du contenu
+        empreinte = file_sha256(file_path)
+        cached = get_cached_extraction(empreinte)
+        if cached is not None:
+            if cached.extracteur == extractor_version():
+                logger.info(f"CV déjà analysé ({empreinte[:12]}): {len(cached.competences)} compétences en cache")
+                return list(cached.competences), cached.domaine or 'DIGITAL'
+            # Référentiel modifié: compétences recalculées sur le texte en cache
+            competences, domain = extract_competences(cached.texte)
+            store_extraction(empreinte, cached.texte, cached.ocr, domain, competences)
+            return competences, domain
+
         # Vérifier l'extension du fichier
         file_ext = os.path.splitext(file_path)[1].lower()
         text = ""
+        used_ocr = False
+        ocr_failed = False
         
         if file_ext == '.pdf':
             # Extraction PDF avec PyMuPDF
             try:
-                import fitz  # PyMuPDF
+                fitz = get_module('fitz')  # PyMuPDF, chargé au premier usage
                 doc = fitz.open(file_path)
                 
                 for page_num in range(len(doc)):
@@ -7391,31 +6567,14 @@ def extract_competences_from_cv(file_path):
                 if len(text.strip()) < 50:
                     logger.info("PDF sans texte détecté, tentative OCR...")
                     try:
-                        import pytesseract
-                        from PIL import Image, ImageEnhance
-                        
-                        doc = fitz.open(file_path)
-                        text = ""
-                        for page_num in range(min(3, len(doc))):  # Max 3 pages pour OCR
-                            page = doc[page_num]
-                            # Améliorer la qualité pour OCR
-                            pix = page.get_pixmap(dpi=300)
-                            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                            
-                            # Amélioration d'image pour OCR
-                            img = img.convert("L")  # Convertir en niveaux de gris
-                            img = ImageEnhance.Contrast(img).enhance(2.0)
-                            img = ImageEnhance.Sharpness(img).enhance(1.5)
-                            
-                            # OCR multilingue
-                            page_text = pytesseract.image_to_string(img, lang='fra+eng')
-                            text += page_text + "\n"
-                        
-                        doc.close()
+                        # Pages rendues et reconnues en parallèle (cv_ocr, OCR multilingue)
+                        text = ocr_pdf(file_path)
+                        used_ocr = True
                         logger.info(f"Texte extrait par OCR: {len(text)} caractères")
                         
                     except Exception as ocr_error:
                         logger.error(f"Erreur OCR: {ocr_error}")
+                        ocr_failed = True
                         # Essayer une extraction basique
                         text = "PDF sans texte détecté"
                 
@@ -7461,6 +6620,10 @@ def extract_competences_from_cv(file_path):
         # Extraire les compétences du texte
         competences, domain = extract_competences(text)
         
+        # Un échec d'OCR n'est pas mis en cache (Tesseract indisponible, etc.)
+        if not ocr_failed:
+            store_extraction(empreinte, text, used_ocr, domain, competences)
+        
         logger.info(f"Extraction terminée: {len(competences)} compétences trouvées")
         return competences, domain
         
@@ -7579,11 +6742,35 @@ def extract_skills_from_filename(file_path):
             found_skills.append(skill.title())
     
     return found_skills
+
+
+def extract_competences_from_raw_content(file_path):
+    """
+    Extraction alternative quand l'analyse du CV ne trouve rien: recherche
+    directe des compétences de competences_data.py dans le contenu brut.
+    Retourne (compétences, contenu du fichier)
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    text_content = str(content, errors='ignore').lower()
+    
+    competences = {
+        skill
+        for skills_list in ALL_SKILLS.values()
+        for skill in skills_list
+        if skill.lower() in text_content
+    }
+    return list(competences), content
+
+
 @api_view(['POST'])
 def extract_consultant_competences(request, consultant_id):
     """
     VERSION CORRIGÉE FINALE de l'endpoint d'extraction de compétences
     Supprime la duplication et utilise l'intelligence des competences_data.py
+
+    Réponse 202 avec job_id et status_url (cv-jobs/<job_id>/) à interroger;
+    sync=1 pour une extraction dans la requête
     """
     try:
         consultant = get_object_or_404(Consultant, id=consultant_id)
@@ -7613,6 +6800,19 @@ def extract_consultant_competences(request, consultant_id):
             }, status=404)
         
         logger.info(f"Fichier CV trouvé: {cv_path}")
+
+        # Par défaut l'extraction (OCR compris) est déposée en tâche de fond:
+        # le client suit l'avancement via cv-jobs/<job_id>/. sync=1 conserve
+        # l'extraction dans la requête (scripts, diagnostic).
+        if str(request.data.get('sync') or request.query_params.get('sync', '')).lower() not in ('1', 'true'):
+            job = enqueue_cv_extraction(consultant, cv_path)
+            return Response({
+                'success': True,
+                'message': 'Extraction des compétences planifiée',
+                'job_id': job.id,
+                'status_url': reverse('cv-job-status', args=[job.id]),
+                'job': job_to_dict(job)
+            }, status=202)
         
         # Utiliser la fonction d'extraction corrigée
         competences, primary_domain = extract_competences_from_cv(cv_path)
@@ -7624,26 +6824,9 @@ def extract_consultant_competences(request, consultant_id):
             logger.info("Première extraction vide, tentative avec méthode alternative...")
             
             try:
-                # Lire le fichier directement et chercher des patterns
-                with open(cv_path, 'rb') as f:
-                    content = f.read()
-                
-                # Conversion en texte pour recherche
+                competences_alternatives, content = extract_competences_from_raw_content(cv_path)
                 text_content = str(content, errors='ignore').lower()
                 
-                # Recherche directe dans competences_data.py
-                competences_alternatives = []
-                
-                # Utiliser ALL_SKILLS pour une recherche exhaustive
-                for domain, skills_list in ALL_SKILLS.items():
-                    for skill in skills_list:
-                        skill_lower = skill.lower()
-                        if skill_lower in text_content:
-                            competences_alternatives.append(skill)
-                
-                # Supprimer les doublons
-                competences_alternatives = list(set(competences_alternatives))
-                
                 if competences_alternatives:
                     competences = competences_alternatives
                     logger.info(f"Extraction alternative réussie: {len(competences)} compétences")
@@ -7668,58 +6851,11 @@ def extract_consultant_competences(request, consultant_id):
                     'skills': []
                 }, status=500)
         
-        # Mettre à jour le domaine principal si détecté
-        if primary_domain and primary_domain != consultant.domaine_principal:
-            consultant.domaine_principal = primary_domain
-            consultant.save(update_fields=['domaine_principal'])
-            logger.info(f"Domaine principal mis à jour : {primary_domain}")
-        
-        # Sauvegarder les nouvelles compétences (éviter les doublons)
-        added_skills = []
-        existing_skills = set(
-            Competence.objects.filter(consultant=consultant)
-            .values_list('nom_competence', flat=True)
-        )
-        
-        logger.info(f"Compétences existantes: {len(existing_skills)}")
-        
-        for competence_name in competences:
-            competence_clean = competence_name.strip().title()
-            
-            # Éviter les doublons (insensible à la casse)
-            if competence_clean.lower() not in [skill.lower() for skill in existing_skills]:
-                try:
-                    Competence.objects.create(
-                        consultant=consultant,
-                        nom_competence=competence_clean,
-                        niveau=2  # Niveau par défaut pour les compétences extraites
-                    )
-                    added_skills.append(competence_clean)
-                    existing_skills.add(competence_clean)
-                    logger.debug(f"Compétence ajoutée: {competence_clean}")
-                except Exception as comp_error:
-                    logger.error(f"Erreur lors de l'ajout de la compétence {competence_clean}: {comp_error}")
-        
-        # Mettre à jour le niveau d'expertise du consultant
-        total_competences = Competence.objects.filter(consultant=consultant).count()
-        
-        # Calcul de l'expertise basé sur le nombre de compétences
-        if total_competences >= 15:
-            consultant.expertise = "Expert"
-        elif total_competences >= 8:
-            consultant.expertise = "Intermédiaire"
-        elif total_competences >= 3:
-            consultant.expertise = "Junior"
-        else:
-            consultant.expertise = "Débutant"
-        
-        consultant.save(update_fields=['expertise'])
-        
-        # Mettre à jour le champ skills pour l'affichage dans ConsultantWelcome
-        all_skills = list(existing_skills)
-        if hasattr(consultant, 'skills'):
-            consultant.skills = ', '.join(all_skills)
-            consultant.save(update_fields=['skills'])
+        # Enregistrement groupé des nouvelles compétences (doublons ignorés),
+        # domaine principal et niveau d'expertise en une sauvegarde
+        resultat = import_competences(consultant, competences, primary_domain=primary_domain)
+        added_skills = resultat['new_skills']
+        all_skills = resultat['skills']
         
         logger.info(f"✓ Extraction terminée avec succès")
         logger.info(f"✓ {len(added_skills)} nouvelles compétences ajoutées")
@@ -7740,7 +6876,7 @@ def extract_consultant_competences(request, consultant_id):
             'extraction_details': {
                 'extracted_count': len(competences),
                 'new_count': len(added_skills),
-                'existing_count': len(existing_skills) - len(added_skills),
+                'existing_count': len(all_skills) - len(added_skills),
                 'domain_detected': primary_domain
             }
         })
@@ -7753,6 +6889,35 @@ def extract_consultant_competences(request, consultant_id):
             'skills': []
         }, status=500)
 
+@api_view(['GET'])
+def cv_job_status(request, job_id):
+    """Statut d'une tâche d'extraction de CV (polling du client)"""
+    try:
+        job = recover_job(CVExtractionJob.objects.get(id=job_id))
+        response = {'success': True, 'job': job_to_dict(job)}
+        warning = pending_warning(job)
+        if warning:
+            response['warning'] = warning
+        return Response(response)
+    except CVExtractionJob.DoesNotExist:
+        return Response({'success': False, 'error': 'Tâche introuvable'}, status=404)
+    except Exception as e:
+        logger.error(f"Erreur statut de la tâche d'extraction {job_id}: {str(e)}")
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+def consultant_cv_jobs(request, consultant_id):
+    """Dernières tâches d'extraction de CV d'un consultant"""
+    try:
+        if not Consultant.objects.filter(id=consultant_id).exists():
+            return Response({'success': False, 'error': 'Consultant introuvable'}, status=404)
+        jobs = CVExtractionJob.objects.filter(consultant_id=consultant_id).order_by('-created_at', '-id')[:20]
+        return Response({'success': True, 'jobs': [job_to_dict(job) for job in jobs]})
+    except Exception as e:
+        logger.error(f"Erreur tâches d'extraction du consultant {consultant_id}: {str(e)}")
+        return Response({'success': False, 'error': str(e)}, status=500)
+
 # Endpoint manquant pour l'analyse d'expertise
 @api_view(['GET'])
 def get_consultant_expertise_analysis(request, consultant_id):
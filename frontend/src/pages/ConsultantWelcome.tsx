@@ -383,6 +383,30 @@ const ConsultantWelcome = () => {
     }
   };
 
+  // L'extraction est exécutée en tâche de fond: suivi via /api/cv-jobs/<id>/
+  const waitForCvJob = async (jobId: number) => {
+    let lastWarning = '';
+    for (let attempt = 0; attempt < 150; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const response = await fetch(`http://127.0.0.1:8000/api/cv-jobs/${jobId}/`);
+      const data = await response.json();
+      if (!data.success) {
+        throw new Error(data.error || 'Tâche d\'extraction introuvable');
+      }
+      if (data.warning) {
+        console.warn(data.warning);
+        lastWarning = data.warning;
+      }
+      if (data.job.status === 'TERMINE') {
+        return data.job.result;
+      }
+      if (data.job.status === 'ECHEC') {
+        throw new Error(data.job.error || 'Erreur lors de l\'extraction');
+      }
+    }
+    throw new Error(lastWarning || 'L\'extraction prend plus de temps que prévu, réessayez plus tard');
+  };
+
   const extractSkillsFromCV = async () => {
     const consultantId = localStorage.getItem("consultantId");
     if (!consultantId) return;
@@ -399,15 +423,16 @@ const ConsultantWelcome = () => {
       const data = await response.json();
       
       if (data.success) {
-        setExtractedSkills(data.new_skills || []);
-        showMessage('success', `${data.new_skills?.length || 0} nouvelles compétences extraites`);
+        const result = data.job_id ? await waitForCvJob(data.job_id) : data;
+        setExtractedSkills(result.new_skills || []);
+        showMessage('success', `${result.new_skills?.length || 0} nouvelles compétences extraites`);
         
         // Mettre à jour les données du consultant
         if (consultantData) {
           setConsultantData({
             ...consultantData,
-            skills: data.skills?.join(', ') || consultantData.skills,
-            expertise: data.expertise_level || consultantData.expertise
+            skills: result.skills?.join(', ') || consultantData.skills,
+            expertise: result.expertise_level || consultantData.expertise
           });
         }
       } else {
@@ -415,7 +440,7 @@ const ConsultantWelcome = () => {
       }
     } catch (error) {
       console.error("Erreur lors de l'extraction des compétences:", error);
-      showMessage('error', 'Erreur lors de l\'extraction des compétences');
+      showMessage('error', error instanceof Error ? error.message : 'Erreur lors de l\'extraction des compétences');
     } finally {
       setIsExtractingSkills(false);
     }